@@ -1,51 +1,60 @@
+import time
+STARTUP_TIME = time.perf_counter()  # Time-to-first-preview is measured from here
+
+from src.core.menu_model import MenuModel
 from src.core.settings import SettingsManager
+from src.core.startup import StartupOrchestrator
 from src.ui.gui import GUI
 from src.ui.controls import MenuController
 from src.hardware.buttons import Buttons
 from src.hardware.camera import get_camera
+from src.hardware.capabilities import CapabilityCache, build_choices
 import sys
 
-def populate_menu_options(menus, camera):
+def populate_menu_options(menus, camera, cache=None):
     """
     Dynamically populates menu options based on camera capabilities.
+    With a CapabilityCache, options discovered on an earlier boot are reused.
     """
-    for menu in menus["menus"]:
-        if "options" in menu:
-            for option in menu["options"]:
-                if option["type"] == "list":
-                    key = option["name"]
-                    supported_options = camera.get_supported_options(key)
-                    
-                    if supported_options:
-                        print(f"Discovered options for {key}: {len(supported_options)} items")
-                        new_options = []
-                        for opt_val in supported_options:
-                            # Create display name (Capitalize first letter)
-                            display_name = str(opt_val).replace('_', ' ').title()
-                            
-                            # Handle special cases if needed
-                            if display_name.lower() == "off": display_name = "Off"
-                            
-                            new_options.append({
-                                "value": opt_val,
-                                "displayname": display_name
-                            })
-                        
-                        # Update the option list
-                        option["options"] = new_options
-                        
-                        # Ensure current value is valid
-                        if option["value"] not in supported_options:
-                            if supported_options:
-                                option["value"] = supported_options[0]
+    list_options = [option for menu in menus["menus"] for option in menu.get("options", [])
+                    if option["type"] == "list"]
+    names = [option["name"] for option in list_options]
+    if cache is not None:
+        discovered = cache.choices(camera, names)
+    else:
+        discovered = {}
+        for key in names:
+            supported_options = camera.get_supported_options(key)
+            if supported_options:
+                print(f"Discovered options for {key}: {len(supported_options)} items")
+                discovered[key] = build_choices(supported_options)
+
+    for option in list_options:
+        choices = discovered.get(option["name"])
+        if choices:
+            # Update the option list
+            option["options"] = [dict(choice) for choice in choices]
+
+            # Ensure current value is valid
+            supported_options = [choice["value"] for choice in choices]
+            if option["value"] not in supported_options:
+                option["value"] = supported_options[0]
+
+    # The option lists were replaced in place; keep the name index in step
+    if isinstance(menus, MenuModel):
+        menus.rebuild()
 
 def apply_settings_to_camera(menus, camera):
     """
     Applies all settings from the menu structure to the camera.
+    Settings that already match what the camera reports are skipped; values
+    are compared typed (see CameraBase.normalize_setting), as the layout and
+    database hold strings like "1920,1080".
     """
     directory = camera.directory()
     print("Applying initial settings to camera...")
-    
+
+    values = {}
     for menu in menus["menus"]:
         if "options" in menu:
             for option in menu["options"]:
@@ -53,29 +62,44 @@ def apply_settings_to_camera(menus, camera):
                 value = option.get("value")
                 
                 if key and value is not None and key in directory:
-                    try:
-                        # print(f"  Setting {key} -> {value}")
-                        directory[key](value=value)
-                    except Exception as e:
-                        print(f"  Failed to set {key}: {e}")
+                    values[key] = value
+
+    # Queued on the camera's command worker, so the preview doesn't wait for them
+    applied = camera.apply_settings(values)
+    print(f"  {len(applied)} settings applied, {len(values) - len(applied)} already at camera defaults")
 
 if __name__ == '__main__':
-    # Initialize settings manager
+    startup = StartupOrchestrator(STARTUP_TIME)
+
+    # Settings file and window first, so the splash is on screen while the rest starts up
     settings_manager = SettingsManager()
-    settings, menus = settings_manager.load()
+    with startup.measure("settings"):
+        settings = settings_manager.load_settings()
+    menus = settings_manager.menus  # Filled in place by the layout and database steps
+    with startup.measure("splash"):
+        gui = GUI(settings, menus, init_layout=False)
+        gui.started_at = STARTUP_TIME
+        gui.show_splash()
 
+    startup.add("layout", settings_manager.load_layout)
+    startup.add("database", settings_manager.load_database)
+    startup.add("menus", settings_manager.apply_saved_values, requires=("layout", "database"))
     # Initialize camera (Real or Mock based on availability)
-    camera = get_camera(menus, settings)
-    
-    # Auto-discover options
-    populate_menu_options(menus, camera)
-    
-    # Apply loaded settings to camera
-    apply_settings_to_camera(menus, camera)
-    
-    # Initialize GUI
-    gui = GUI(settings, menus, camera)
-    
+    startup.add("camera", lambda: gui.attach_camera(get_camera(menus, settings)))
+    # Auto-discover options (cached per camera), then apply loaded settings to camera
+    startup.add("options", lambda: populate_menu_options(menus, gui.camera, CapabilityCache.for_settings(settings)),
+                requires=("camera", "menus"))
+    startup.add("apply", lambda: apply_settings_to_camera(menus, gui.camera), requires=("options",))
+    startup.add("preview", gui.start_preview, requires=("apply",))
+    # Warm-ups the main loop doesn't wait for
+    startup.add("icons", lambda: gui.warm_icons(settings_manager.layout_parser), requires=("layout",), critical=False)
+    startup.add("gallery", gui.gallery.warm_up, critical=False)
+
+    # Hand off to the main loop as soon as the critical steps are done
+    startup.wait(poll=gui.pump_splash)
+    gui.init_layout()
+    startup.handoff()
+
     # Define callbacks
     callbacks = {
         "reset": lambda: settings_manager.reset(),
@@ -86,6 +110,8 @@ if __name__ == '__main__':
     # Wrap handle_event to include callbacks and settings
     def controls_handler(pygame_mod, event, menu_pos, menus, camera=None, menu_active=True, quick_menu_pos=None, action=None):
         MenuController.handle_event(pygame_mod, event, menu_pos, menus, camera, menu_active, quick_menu_pos, callbacks, action, settings, settings_manager, gui.layout)
+        # Persist changed values within a second or so, not only on a clean exit
+        settings_manager.sync()
     
     try:
         print("Starting GUI...")
@@ -103,5 +129,6 @@ if __name__ == '__main__':
         print("Saving settings...")
         # Save settings and menus on exit
         settings_manager.save()
+        settings_manager.close()
         print("Exiting application.")
         # sys.exit() # Removed to prevent masking exit codes or errors
@@ -1,12 +1,15 @@
 import sqlite3
 import os
-from typing import Any, Optional, Dict, List
+import threading
+from typing import Any, Iterable, Optional, Dict, List, Tuple
 
 class DatabaseManager:
     def __init__(self, db_path: str = 'home/config/settings.db'):
         self.db_path = db_path
         self._ensure_dir()
         self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        # The connection is shared with the settings flusher thread; one transaction at a time
+        self._lock = threading.RLock()
         self._init_db()
 
     def __del__(self):
@@ -15,8 +18,9 @@ class DatabaseManager:
 
     def close(self):
         if self.conn:
-            self.conn.close()
-            self.conn = None
+            with self._lock:
+                self.conn.close()
+                self.conn = None
 
     def _ensure_dir(self):
         directory = os.path.dirname(self.db_path)
@@ -29,6 +33,10 @@ class DatabaseManager:
     def _init_db(self):
         try:
             cursor = self.conn.cursor()
+            # Write-ahead log: a commit appends to the log instead of rewriting pages,
+            # and a crash never leaves a half-written database
+            cursor.execute('PRAGMA journal_mode=WAL')
+            cursor.execute('PRAGMA synchronous=NORMAL')
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS menu_settings (
                     key TEXT PRIMARY KEY,
@@ -58,18 +66,43 @@ class DatabaseManager:
             print(f"Error getting setting {key}: {e}")
             return None
 
+    def get_all_settings(self) -> Dict[str, str]:
+        """All menu settings in one query."""
+        try:
+            with self._lock:
+                cursor = self.conn.cursor()
+                cursor.execute('SELECT key, value FROM menu_settings')
+                return {row[0]: row[1] for row in cursor.fetchall()}
+        except Exception as e:
+            print(f"Error getting all settings: {e}")
+            return {}
+
     def set_setting(self, key: str, value: Any, commit: bool = True):
         try:
-            cursor = self.conn.cursor()
-            cursor.execute('''
-                INSERT OR REPLACE INTO menu_settings (key, value)
-                VALUES (?, ?)
-            ''', (key, str(value)))
-            if commit:
-                self.conn.commit()
+            with self._lock:
+                cursor = self.conn.cursor()
+                cursor.execute('''
+                    INSERT OR REPLACE INTO menu_settings (key, value)
+                    VALUES (?, ?)
+                ''', (key, str(value)))
+                if commit:
+                    self.conn.commit()
         except Exception as e:
             print(f"Error setting setting {key}: {e}")
 
+    def set_settings(self, items: Iterable[Tuple[str, Any]]) -> bool:
+        """Write several menu settings in a single transaction. Returns False if nothing was written."""
+        try:
+            with self._lock, self.conn:
+                self.conn.executemany('''
+                    INSERT OR REPLACE INTO menu_settings (key, value)
+                    VALUES (?, ?)
+                ''', [(key, str(value)) for key, value in items])
+            return True
+        except Exception as e:
+            print(f"Error saving settings: {e}")
+            return False
+
     def get_mode_setting(self, mode: str, key: str) -> Optional[str]:
         """Get a setting value for a specific camera mode."""
         try:
@@ -84,13 +117,14 @@ class DatabaseManager:
     def set_mode_setting(self, mode: str, key: str, value: Any, commit: bool = True):
         """Set a setting value for a specific camera mode."""
         try:
-            cursor = self.conn.cursor()
-            cursor.execute('''
-                INSERT OR REPLACE INTO mode_settings (mode, key, value)
-                VALUES (?, ?, ?)
-            ''', (mode, key, str(value)))
-            if commit:
-                self.conn.commit()
+            with self._lock:
+                cursor = self.conn.cursor()
+                cursor.execute('''
+                    INSERT OR REPLACE INTO mode_settings (mode, key, value)
+                    VALUES (?, ?, ?)
+                ''', (mode, key, str(value)))
+                if commit:
+                    self.conn.commit()
         except Exception as e:
             print(f"Error setting mode setting {mode}.{key}: {e}")
 
@@ -105,16 +139,31 @@ class DatabaseManager:
             print(f"Error getting all mode settings for {mode}: {e}")
             return {}
 
+    def get_mode_presets(self) -> Dict[str, Dict[str, str]]:
+        """Settings of every camera mode in one query: {mode: {key: value}}."""
+        try:
+            with self._lock:
+                cursor = self.conn.cursor()
+                cursor.execute('SELECT mode, key, value FROM mode_settings')
+                presets: Dict[str, Dict[str, str]] = {}
+                for mode, key, value in cursor.fetchall():
+                    presets.setdefault(mode, {})[key] = value
+                return presets
+        except Exception as e:
+            print(f"Error getting mode settings: {e}")
+            return {}
+
     def save_mode_settings(self, mode: str, settings: Dict[str, Any]):
         """Save multiple settings for a mode at once."""
         try:
-            cursor = self.conn.cursor()
-            for key, value in settings.items():
-                cursor.execute('''
-                    INSERT OR REPLACE INTO mode_settings (mode, key, value)
-                    VALUES (?, ?, ?)
-                ''', (mode, key, str(value)))
-            self.conn.commit()
+            with self._lock:
+                cursor = self.conn.cursor()
+                for key, value in settings.items():
+                    cursor.execute('''
+                        INSERT OR REPLACE INTO mode_settings (mode, key, value)
+                        VALUES (?, ?, ?)
+                    ''', (mode, key, str(value)))
+                self.conn.commit()
         except Exception as e:
             print(f"Error saving mode settings for {mode}: {e}")
 
@@ -122,16 +171,18 @@ class DatabaseManager:
         """Manually commit changes to the database."""
         if self.conn:
             try:
-                self.conn.commit()
+                with self._lock:
+                    self.conn.commit()
             except Exception as e:
                 print(f"Error committing changes: {e}")
 
     def reset_settings(self):
         try:
-            cursor = self.conn.cursor()
-            cursor.execute('DELETE FROM menu_settings')
-            cursor.execute('DELETE FROM mode_settings')
-            self.conn.commit()
+            with self._lock:
+                cursor = self.conn.cursor()
+                cursor.execute('DELETE FROM menu_settings')
+                cursor.execute('DELETE FROM mode_settings')
+                self.conn.commit()
             print("Settings reset to defaults.")
         except Exception as e:
             print(f"Error resetting settings: {e}")
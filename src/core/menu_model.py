@@ -0,0 +1,127 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+Path = Tuple[int, ...]
+
+
+class MenuModel(dict):
+    """The menus dict (``{"menus": [...]}``) with an index of options by name.
+
+    It is still a plain dict to everything that walks the menus by position.
+    ``find(name)`` and ``path_of(name)`` are dictionary lookups instead of a
+    search through every page and group. Assigning a new ``"menus"`` list
+    (also through update(), setdefault() and the other dict mutators)
+    re-indexes; code that changes the nested structure in place calls
+    ``rebuild()`` afterwards.
+    """
+
+    def __init__(self, menus: Optional[List[Dict[str, Any]]] = None):
+        super().__init__()
+        self._index: Dict[str, Dict[str, Any]] = {}
+        self._paths: Dict[str, Path] = {}
+        self["menus"] = menus if menus is not None else []
+
+    @classmethod
+    def wrap(cls, menus: Dict[str, Any]) -> "MenuModel":
+        """``menus`` itself if it is a MenuModel, else a model sharing its pages."""
+        if isinstance(menus, cls):
+            return menus
+        model = cls(menus.get("menus"))
+        for key, value in menus.items():
+            if key != "menus":
+                dict.__setitem__(model, key, value)
+        return model
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        if key == "menus":
+            self.rebuild()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.rebuild()
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.rebuild()
+
+    def setdefault(self, key, default=None):
+        value = super().setdefault(key, default)
+        self.rebuild()
+        return value
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self.rebuild()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self.rebuild()
+        return item
+
+    def clear(self):
+        super().clear()
+        self.rebuild()
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def rebuild(self):
+        """Re-index every option by name (the first one wins, like a search from the top)."""
+        index: Dict[str, Dict[str, Any]] = {}
+        paths: Dict[str, Path] = {}
+
+        def walk(options: List[Any], path: Path):
+            for i, option in enumerate(options):
+                if not isinstance(option, dict):
+                    continue
+                name = option.get("name")
+                if name and name not in index:
+                    index[name] = option
+                    paths[name] = path + (i,)
+                nested = option.get("options")
+                # A group's options are named items; a list option's are plain choices
+                if isinstance(nested, list) and nested and isinstance(nested[0], dict) and "name" in nested[0]:
+                    walk(nested, path + (i,))
+
+        for page_index, page in enumerate(self.get("menus", [])):
+            walk(page.get("options", []), (page_index,))
+        self._index = index
+        self._paths = paths
+
+    def find(self, name: str) -> Optional[Dict[str, Any]]:
+        """The option called ``name`` (in any page or group), or None."""
+        return self._index.get(name)
+
+    def path_of(self, name: str) -> Optional[Path]:
+        """Position of an option: (page index, option index[, nested option index...])."""
+        return self._paths.get(name)
+
+    def names(self) -> List[str]:
+        return list(self._index)
+
+
+def find_option(menus: Dict[str, Any], name: str) -> Optional[Dict[str, Any]]:
+    """Find an option by name: an index lookup in a MenuModel, a search that stops at the first match otherwise."""
+    if isinstance(menus, MenuModel):
+        return menus.find(name)
+
+    def search(options: List[Any]) -> Optional[Dict[str, Any]]:
+        for option in options:
+            if not isinstance(option, dict):
+                continue
+            if option.get("name") == name:
+                return option
+            nested = option.get("options")
+            if isinstance(nested, list) and nested and isinstance(nested[0], dict) and "name" in nested[0]:
+                found = search(nested)
+                if found is not None:
+                    return found
+        return None
+
+    for page in menus.get("menus", []):
+        found = search(page.get("options", []))
+        if found is not None:
+            return found
+    return None
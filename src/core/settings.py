@@ -1,8 +1,11 @@
 import json
+import time
 from os import path, makedirs
-from typing import Dict, Any, Tuple, List
+from typing import Dict, Any, Optional, Tuple
 from src.core.database import DatabaseManager
-from src.ui.layout_parser import LayoutParser
+from src.core.menu_model import MenuModel, find_option
+from src.core.settings_store import SettingsStore
+from src.ui.layout_registry import get_layout_registry
 
 class SettingsManager:
     # Camera settings that should be reset to "auto" when switching to auto mode
@@ -25,76 +28,130 @@ class SettingsManager:
         "imageeffect"
     ]
 
-    def __init__(self, settings_file: str = 'home/config/camerasettings.json'):
+    def __init__(self, settings_file: str = 'home/config/camerasettings.json', db_path: Optional[str] = None):
         self.settings_file = settings_file
         self.settings: Dict[str, Any] = {}
-        self.menus: Dict[str, Any] = {}
-        self.db = DatabaseManager()
-        self.layout_parser = None
+        self.menus: MenuModel = MenuModel()
+        self.db = DatabaseManager(db_path) if db_path else DatabaseManager()
+        self.store = SettingsStore(self.db)  # Menu values, loaded in one query and saved write-behind
+        self.mode_presets: Dict[str, Dict[str, Any]] = {"auto": self.AUTO_MODE_DEFAULTS.copy()}  # {mode: {setting: typed value}}
+        self.mode_switch_stats = {"switches": 0, "last_ms": 0.0, "max_ms": 0.0, "applied": 0, "skipped": 0}
+        self.layouts = None  # Shared LayoutRegistry, set by load()
 
     def load(self) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        self.load_settings()
+        self.load_layout()
+        self.load_database()
+        self.apply_saved_values()
+        return self.settings, self.menus
+
+    # load() in steps, so startup can run the independent ones concurrently:
+    # load_settings first, then load_layout and load_database in any order, then apply_saved_values.
+
+    def load_settings(self) -> Dict[str, Any]:
+        """Read the settings file (display, files and theme configuration)."""
         self.settings = self._open_settings(self.settings_file)
-        
-        # Load menus from XML via layout parser
-        self.layout_parser = LayoutParser(theme_config=self.settings)
-        self.menus = {"menus": self.layout_parser.get_menus_list()}
-        
-        # Overlay DB values onto menus
-        self._apply_db_values()
-        
         self._ensure_dcim_folder(self.settings)
-        return self.settings, self.menus
+        return self.settings
+
+    def load_layout(self):
+        """Parse the layout and fill the menus with its defaults (in place, so holders of ``menus`` see them)."""
+        # Load menus from XML via the shared layout (the GUI reuses the same parse).
+        # The parse is cached on disk until main.xml or the theme changes.
+        cache_dir = self.settings.get("files", {}).get("cache_path", path.join("home", "cache"))
+        self.layouts = get_layout_registry(self.settings, cache_file=path.join(cache_dir, "layout.cache"))
+        self.menus["menus"] = self.layouts.menus()
+        return self.layouts.parser
+
+    def load_database(self):
+        """Read the saved menu values and mode presets."""
+        self.store.flush_delay = self.settings.get("files", {}).get("settings_flush_delay", self.store.flush_delay)
+        self.store.load()
+        self._load_mode_presets()
+
+    def apply_saved_values(self):
+        """Overlay the saved values onto the layout's default menus."""
+        self._apply_db_values()
+
+    @property
+    def layout_parser(self):
+        return self.layouts.parser if self.layouts is not None else None
 
     def save(self):
         self._save_settings(self.settings_file, self.settings)
         # Save menu changes to DB instead of JSON
         self._save_menus_to_db()
 
+    def sync(self):
+        """Queue menu values changed since the last call; the store writes them in the background."""
+        if 'menus' not in self.menus:
+            return 0
+        return self.store.update(
+            (option['name'], option['value'])
+            for page in self.menus['menus']
+            for option in page.get('options', ())
+            if option.get('name') and option.get('value') is not None
+        )
+
+    def close(self):
+        """Write pending changes and stop the background flusher."""
+        self.sync()
+        self.store.close()
+
     def reset(self):
         """Reset all menu settings to defaults (clears DB)"""
-        self.db.reset_settings()
-        # Reload defaults from XML layout
-        self.layout_parser = LayoutParser(theme_config=self.settings)
-        self.menus = {"menus": self.layout_parser.get_menus_list()}
+        self.store.reset()
+        self._load_mode_presets()
+        # Fresh copy of the XML defaults, no re-parse needed. Replaced in place
+        # so the GUI and controls holding this model see the defaults too.
+        self.menus["menus"] = self.layouts.menus()
         return self.menus
 
+    def _load_mode_presets(self):
+        """Read every mode's settings once and keep them typed in memory."""
+        self.mode_presets = {mode: self._convert_db_settings(values)
+                             for mode, values in self.db.get_mode_presets().items()}
+        self.mode_presets["auto"] = self.AUTO_MODE_DEFAULTS.copy()
+
     def save_mode_settings(self, mode: str, menus: Dict[str, Any]):
-        """Save current mode-specific camera settings to the database."""
-        settings_to_save = {}
+        """Save current mode-specific camera settings; only values that changed are written."""
+        preset = self.mode_presets.setdefault(mode, {})
+        changed = {}
         
         for setting_name in self.MODE_SPECIFIC_SETTINGS:
             option = self._find_option_in_menus(menus, setting_name)
-            if option and 'value' in option:
-                settings_to_save[setting_name] = option['value']
+            if option and 'value' in option and preset.get(setting_name) != option['value']:
+                changed[setting_name] = option['value']
         
-        if settings_to_save:
-            self.db.save_mode_settings(mode, settings_to_save)
-            print(f"Saved settings for mode '{mode}': {settings_to_save}")
+        if changed:
+            preset.update(changed)
+            self.db.save_mode_settings(mode, changed)
+            print(f"Saved settings for mode '{mode}': {changed}")
 
     def load_mode_settings(self, mode: str, menus: Dict[str, Any], camera: Any = None):
-        """Load mode-specific settings from the database and apply to menus and camera."""
-        if mode == "auto":
-            # Auto mode uses predefined defaults
-            settings_to_apply = self.AUTO_MODE_DEFAULTS.copy()
-            print(f"Loading AUTO mode defaults: {settings_to_apply}")
-        else:
-            # Load from DB for other modes
-            settings_to_apply = self.db.get_all_mode_settings(mode)
-            # Convert types back from strings
-            settings_to_apply = self._convert_db_settings(settings_to_apply)
-            print(f"Loaded settings for mode '{mode}': {settings_to_apply}")
+        """Apply a mode's preset to the menus and send the camera only the settings that differ."""
+        start = time.perf_counter()
+        preset = self.mode_presets.get(mode, {})
         
         # Apply to menus
-        for setting_name, value in settings_to_apply.items():
+        to_apply = {}
+        for setting_name, value in preset.items():
             option = self._find_option_in_menus(menus, setting_name)
             if option:
                 option['value'] = value
-                # Apply to camera
-                if camera:
-                    directory = camera.directory()
-                    if setting_name in directory:
-                        print(f"Applying {setting_name} = {value}")
-                        directory[setting_name](value=value)
+                to_apply[setting_name] = value
+        
+        applied = camera.apply_settings(to_apply) if camera else {}
+        
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        stats = self.mode_switch_stats
+        stats["switches"] += 1
+        stats["last_ms"] = elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+        stats["applied"] += len(applied)
+        stats["skipped"] += len(to_apply) - len(applied)
+        print(f"Mode '{mode}': {len(applied)} of {len(to_apply)} settings changed on the camera "
+              f"({elapsed_ms:.1f} ms)")
     
     def _convert_db_settings(self, settings: Dict[str, str]) -> Dict[str, Any]:
         """Convert string values from DB to appropriate types."""
@@ -117,30 +174,8 @@ class SettingsManager:
         return converted
     
     def _find_option_in_menus(self, menus: Dict[str, Any], setting_name: str) -> Dict[str, Any]:
-        """Find an option by name in the menus structure (searches nested groups)."""
-        if 'menus' not in menus:
-            return None
-            
-        def search_options(options: List[Dict]) -> Dict[str, Any]:
-            for option in options:
-                if option.get('name') == setting_name:
-                    return option
-                # Search in nested options (groups)
-                if 'options' in option and isinstance(option['options'], list):
-                    # Check if it's a group (options is a list of dicts with 'name')
-                    if option['options'] and isinstance(option['options'][0], dict) and 'name' in option['options'][0]:
-                        found = search_options(option['options'])
-                        if found:
-                            return found
-            return None
-        
-        for page in menus['menus']:
-            if 'options' in page:
-                found = search_options(page['options'])
-                if found:
-                    return found
-        
-        return None
+        """Find an option by name in the menus structure (including nested groups)."""
+        return find_option(menus, setting_name)
 
     def _apply_db_values(self):
         if 'menus' not in self.menus:
@@ -155,7 +190,7 @@ class SettingsManager:
         key = option.get('name')
         if not key: return
         
-        db_value = self.db.get_setting(key)
+        db_value = self.store.get(key)
         if db_value is not None:
             # Convert type based on current value or option type
             current_value = option.get('value')
@@ -178,17 +213,8 @@ class SettingsManager:
                 option['value'] = db_value
 
     def _save_menus_to_db(self):
-        if 'menus' not in self.menus:
-            return
-            
-        for page in self.menus['menus']:
-            if 'options' in page:
-                for option in page['options']:
-                    key = option.get('name')
-                    value = option.get('value')
-                    # Only save if key exists and value is not None
-                    if key and value is not None:
-                        self.db.set_setting(key, value)
+        self.sync()
+        self.store.flush()
 
     def _save_settings(self, file_path: str, data: Dict[str, Any]):
         try:
@@ -0,0 +1,133 @@
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from src.core.database import DatabaseManager
+
+
+class SettingsStore:
+    """In-memory copy of the menu settings table with write-behind persistence.
+
+    ``load()`` reads every row in one query; reads are served from memory.
+    ``set()`` only marks a key dirty when its value really changed. A flusher
+    thread writes the dirty keys in one transaction once nothing has changed
+    for ``flush_delay`` seconds, or at the latest ``max_delay`` seconds after
+    the first unsaved change, so a crash loses at most those last seconds.
+    """
+
+    def __init__(self, db: DatabaseManager, flush_delay: float = 1.0, max_delay: float = 5.0):
+        self.db = db
+        self.flush_delay = flush_delay
+        self.max_delay = max_delay
+        self._values: Dict[str, str] = {}  # As stored in the database
+        self._dirty: Dict[str, str] = {}  # Changed since the last flush
+        self._first_change = 0.0
+        self._last_change = 0.0
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()  # Keeps flushes in order
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self.stats = {"loads": 0, "flushes": 0, "rows": 0, "last_flush_ms": 0.0}
+
+    def load(self) -> int:
+        """Read all settings from the database, dropping unsaved changes. Returns the number of rows."""
+        values = self.db.get_all_settings()
+        with self._cond:
+            self._values = dict(values)
+            self._dirty.clear()
+            self.stats["loads"] += 1
+        return len(values)
+
+    def get(self, key: str) -> Optional[str]:
+        return self._values.get(key)
+
+    def set(self, key: str, value: Any) -> bool:
+        """Store a value (as text, like the database). Returns True if it changed."""
+        return self.update([(key, value)]) > 0
+
+    def update(self, items: Iterable[Tuple[str, Any]]) -> int:
+        """Store several values; returns how many changed and were queued for the flusher."""
+        changed = 0
+        with self._cond:
+            for key, value in items:
+                text = str(value)
+                if self._values.get(key) == text:
+                    continue
+                self._values[key] = text
+                self._dirty[key] = text
+                changed += 1
+            if changed:
+                now = time.monotonic()
+                if not self._first_change:
+                    self._first_change = now
+                self._last_change = now
+                self._start_flusher()
+                self._cond.notify()
+        return changed
+
+    @property
+    def dirty(self) -> int:
+        return len(self._dirty)
+
+    def flush(self) -> int:
+        """Write all dirty keys now, in one transaction. Returns the number of rows written."""
+        with self._flush_lock:
+            with self._cond:
+                batch, self._dirty = self._dirty, {}
+                self._first_change = 0.0
+            if not batch:
+                return 0
+            start = time.perf_counter()
+            if not self.db.set_settings(batch.items()):
+                with self._cond:
+                    # Keep them for the next attempt, unless they changed again meanwhile
+                    for key, value in batch.items():
+                        self._dirty.setdefault(key, value)
+                    # Retry after another flush_delay
+                    self._first_change = self._last_change = time.monotonic()
+                return 0
+            self.stats["flushes"] += 1
+            self.stats["rows"] += len(batch)
+            self.stats["last_flush_ms"] = (time.perf_counter() - start) * 1000
+            return len(batch)
+
+    def reset(self):
+        """Forget every setting, in memory and in the database."""
+        with self._flush_lock, self._cond:
+            self._values.clear()
+            self._dirty.clear()
+            self._first_change = 0.0
+            self.db.reset_settings()
+
+    def close(self):
+        """Stop the flusher and write what is still dirty."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(5.0)
+            self._thread = None
+        self.flush()
+
+    def _start_flusher(self):
+        if self._thread is None and not self._closed:
+            self._thread = threading.Thread(target=self._run, name="settings-flusher", daemon=True)
+            self._thread.start()
+
+    def _seconds_until_due(self) -> Optional[float]:
+        if not self._dirty:
+            return None
+        due = min(self._last_change + self.flush_delay, self._first_change + self.max_delay)
+        return max(0.0, due - time.monotonic())
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._closed:
+                    wait = self._seconds_until_due()
+                    if wait == 0.0:
+                        break
+                    self._cond.wait(wait)
+                if self._closed:
+                    return
+            self.flush()
@@ -0,0 +1,186 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+class StartupStep:
+    """One initialisation step and what happened to it."""
+
+    def __init__(self, name: str, func: Callable[[], Any], requires: Iterable[str] = (), critical: bool = True):
+        self.name = name
+        self.func = func
+        self.requires = tuple(requires)
+        self.critical = critical  # The main loop waits for it
+        self.state = "waiting"  # waiting, running, done, failed, skipped
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.start: Optional[float] = None
+        self.end: Optional[float] = None
+        self.thread = ""
+
+    @property
+    def finished(self) -> bool:
+        return self.state in ("done", "failed", "skipped")
+
+
+class StartupOrchestrator:
+    """Runs startup steps on worker threads as soon as the steps they require are done.
+
+    ``wait()`` returns once every critical step finished, so the main loop
+    can start while non-critical steps (cache warm-ups) keep running. A step
+    whose requirement failed is skipped; a failed critical step is raised
+    from ``wait()``. Work done on the calling thread can be recorded with
+    ``measure()``. The timeline is printed once every step has finished.
+    """
+
+    def __init__(self, started_at: Optional[float] = None):
+        self.started_at = started_at if started_at is not None else time.perf_counter()
+        self.steps: Dict[str, StartupStep] = {}
+        self.handoff_ms: Optional[float] = None
+        self._cond = threading.Condition()
+        self._started = False
+        self._printed = False
+
+    def add(self, name: str, func: Callable[[], Any], requires: Iterable[str] = (), critical: bool = True):
+        if name in self.steps:
+            raise ValueError(f"Startup step '{name}' added twice")
+        step = StartupStep(name, func, requires, critical)
+        missing = [r for r in step.requires if r not in self.steps]
+        if missing:
+            raise ValueError(f"Startup step '{name}' requires unknown steps: {', '.join(missing)}")
+        with self._cond:
+            self.steps[name] = step
+            if self._started:
+                self._launch_ready()
+
+    @contextmanager
+    def measure(self, name: str):
+        """Record a step that runs on the calling thread."""
+        step = StartupStep(name, None)
+        step.state = "running"
+        step.start = time.perf_counter()
+        step.thread = threading.current_thread().name
+        with self._cond:
+            self.steps[name] = step
+        try:
+            yield step
+            step.state = "done"
+        except BaseException as e:
+            step.state = "failed"
+            step.error = e
+            raise
+        finally:
+            step.end = time.perf_counter()
+
+    def start(self):
+        with self._cond:
+            self._started = True
+            self._launch_ready()
+
+    def wait(self, names: Optional[Iterable[str]] = None, poll: Optional[Callable[[], None]] = None,
+             interval: float = 0.05, timeout: Optional[float] = None) -> bool:
+        """Block until ``names`` (default: the critical steps) have finished.
+
+        ``poll`` is called on the waiting thread every ``interval`` seconds,
+        e.g. to keep the splash window responsive. Returns False on timeout.
+        """
+        if not self._started:
+            self.start()
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        with self._cond:
+            wanted = [self.steps[n] for n in names] if names is not None else \
+                [s for s in self.steps.values() if s.critical]
+            while not all(step.finished for step in wanted):
+                remaining = None if deadline is None else deadline - time.perf_counter()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(interval if remaining is None else min(interval, remaining))
+                if poll is not None:
+                    self._cond.release()
+                    try:
+                        poll()
+                    finally:
+                        self._cond.acquire()
+        for step in wanted:
+            if step.state == "failed" and step.critical:
+                raise step.error
+        return True
+
+    def result(self, name: str) -> Any:
+        return self.steps[name].result
+
+    def handoff(self):
+        """Mark the moment the main loop takes over; prints the timeline if nothing is left running."""
+        with self._cond:
+            self.handoff_ms = self._ms(time.perf_counter())
+        self._print_when_finished()
+
+    def timeline(self) -> List[Dict[str, Any]]:
+        """Per step: start and end in ms since ``started_at``, thread and state, in start order."""
+        rows = [{"name": s.name, "start_ms": self._ms(s.start), "end_ms": self._ms(s.end),
+                 "thread": s.thread, "state": s.state, "critical": s.critical}
+                for s in self.steps.values() if s.start is not None]
+        rows.sort(key=lambda row: row["start_ms"])
+        rows += [{"name": s.name, "start_ms": None, "end_ms": None, "thread": "", "state": s.state,
+                  "critical": s.critical} for s in self.steps.values() if s.start is None]
+        return rows
+
+    def format_timeline(self) -> str:
+        lines = [f"Startup timeline (main loop at {self.handoff_ms:.0f} ms):" if self.handoff_ms is not None
+                 else "Startup timeline:"]
+        for row in self.timeline():
+            if row["start_ms"] is None:
+                lines.append(f"  {row['name']:<10} {row['state']}")
+                continue
+            end = f"{row['end_ms']:6.0f}" if row["end_ms"] is not None else "     ?"
+            duration = f"{row['end_ms'] - row['start_ms']:6.0f} ms" if row["end_ms"] is not None else " running"
+            flags = "" if row["critical"] else " (background)"
+            state = "" if row["state"] == "done" else f" [{row['state']}]"
+            lines.append(f"  {row['name']:<10} {row['start_ms']:6.0f} - {end} ms {duration}  "
+                         f"{row['thread']}{flags}{state}")
+        return "\n".join(lines)
+
+    def _ms(self, t: Optional[float]) -> Optional[float]:
+        return None if t is None else (t - self.started_at) * 1000
+
+    def _launch_ready(self):
+        """Start every waiting step whose requirements are met (called with the lock held)."""
+        for step in self.steps.values():
+            if step.state != "waiting":
+                continue
+            required = [self.steps[r] for r in step.requires]
+            if any(r.state in ("failed", "skipped") for r in required):
+                step.state = "skipped"
+                print(f"Startup: skipping {step.name}, a step it requires failed")
+                self._cond.notify_all()
+                self._launch_ready()  # Its dependents are skipped too
+                return
+            if all(r.state == "done" for r in required):
+                step.state = "running"
+                thread = threading.Thread(target=self._run, args=(step,), name=f"startup-{step.name}", daemon=True)
+                step.thread = thread.name
+                thread.start()
+
+    def _run(self, step: StartupStep):
+        step.start = time.perf_counter()
+        try:
+            step.result = step.func()
+            state = "done"
+        except Exception as e:
+            step.error = e
+            state = "failed"
+            print(f"Startup step {step.name} failed: {e}")
+        step.end = time.perf_counter()
+        with self._cond:
+            step.state = state
+            self._launch_ready()
+            self._cond.notify_all()
+        self._print_when_finished()
+
+    def _print_when_finished(self):
+        with self._cond:
+            if self._printed or self.handoff_ms is None or not all(s.finished for s in self.steps.values()):
+                return
+            self._printed = True
+        print(self.format_timeline())
@@ -0,0 +1,261 @@
+import os
+import io
+import struct
+import shutil
+import tempfile
+import threading
+from typing import List, Optional, Tuple
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+AVIF_HASINDEX = 0x10
+AVIIF_KEYFRAME = 0x10
+# idx1 offsets are 32-bit, so a plain AVI 1.0 file must stay below 4 GB
+MAX_AVI_BYTES = 0xFFFFFFFF - (16 * 1024 * 1024)
+
+
+class MjpegAviWriter:
+    """Stream already-encoded JPEG frames into a Motion-JPEG AVI file.
+
+    Frames are written as they arrive and the idx1 index is spooled to a
+    temporary file, so memory use does not depend on the number of frames.
+    The file is written to ``path + ".part"`` and renamed on close().
+    """
+
+    def __init__(self, path: str, width: int, height: int, fps: float = 24.0):
+        self.path = path
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.frame_count = 0
+        self._max_frame = 0
+        self._tmp_path = path + ".part"
+        self._file = open(self._tmp_path, "wb")
+        self._index = tempfile.TemporaryFile()
+        self._write_headers()
+
+    def _write_headers(self):
+        f = self._file
+        rate, scale = int(round(self.fps * 1000)), 1000
+
+        f.write(b"RIFF")
+        self._riff_size_pos = f.tell()
+        f.write(struct.pack("<I", 0))
+        f.write(b"AVI ")
+
+        # hdrl LIST: avih (56) + strl LIST (4 + strh 8+56 + strf 8+40)
+        strl_size = 4 + (8 + 56) + (8 + 40)
+        hdrl_size = 4 + (8 + 56) + (8 + strl_size)
+        f.write(b"LIST" + struct.pack("<I", hdrl_size) + b"hdrl")
+
+        f.write(b"avih" + struct.pack("<I", 56))
+        f.write(struct.pack("<IIII", int(1000000 * scale / rate), 0, 0, AVIF_HASINDEX))
+        self._avih_frames_pos = f.tell()
+        f.write(struct.pack("<III", 0, 0, 1))  # total frames, initial frames, streams
+        self._avih_buffer_pos = f.tell()
+        f.write(struct.pack("<III", 0, self.width, self.height))
+        f.write(b"\x00" * 16)
+
+        f.write(b"LIST" + struct.pack("<I", strl_size) + b"strl")
+        f.write(b"strh" + struct.pack("<I", 56))
+        f.write(b"vidsMJPG")
+        f.write(struct.pack("<IHHIII", 0, 0, 0, 0, scale, rate))
+        self._strh_length_pos = f.tell()
+        f.write(struct.pack("<II", 0, 0))  # start, length
+        self._strh_buffer_pos = f.tell()
+        f.write(struct.pack("<IiI", 0, -1, 0))  # suggested buffer, quality, sample size
+        f.write(struct.pack("<hhhh", 0, 0, self.width, self.height))
+
+        f.write(b"strf" + struct.pack("<I", 40))
+        f.write(struct.pack("<IiiHH", 40, self.width, self.height, 1, 24))
+        f.write(b"MJPG")
+        f.write(struct.pack("<IiiII", self.width * self.height * 3, 0, 0, 0, 0))
+
+        f.write(b"LIST")
+        self._movi_size_pos = f.tell()
+        f.write(struct.pack("<I", 0))
+        self._movi_start = f.tell()
+        f.write(b"movi")
+
+    def add_frame(self, jpeg: bytes):
+        if self._file.tell() + len(jpeg) + 8 > MAX_AVI_BYTES:
+            raise ValueError("AVI file would exceed 4 GB")
+
+        offset = self._file.tell() - self._movi_start
+        self._file.write(b"00dc" + struct.pack("<I", len(jpeg)))
+        self._file.write(jpeg)
+        if len(jpeg) % 2:
+            self._file.write(b"\x00")  # Chunks are word aligned
+
+        self._index.write(b"00dc" + struct.pack("<III", AVIIF_KEYFRAME, offset, len(jpeg)))
+        self.frame_count += 1
+        self._max_frame = max(self._max_frame, len(jpeg))
+
+    def close(self):
+        """Write the index, patch the header sizes and move the file into place."""
+        if self._file is None:
+            return
+        f = self._file
+        movi_end = f.tell()
+
+        self._index.seek(0)
+        f.write(b"idx1" + struct.pack("<I", self.frame_count * 16))
+        shutil.copyfileobj(self._index, f)
+        end = f.tell()
+
+        for pos, value in (
+            (self._riff_size_pos, end - 8),
+            (self._movi_size_pos, movi_end - self._movi_start),
+            (self._avih_frames_pos, self.frame_count),
+            (self._avih_buffer_pos, self._max_frame + 8),
+            (self._strh_length_pos + 4, self.frame_count),
+            (self._strh_buffer_pos, self._max_frame + 8),
+        ):
+            f.seek(pos)
+            f.write(struct.pack("<I", value))
+
+        f.close()
+        self._index.close()
+        self._file = None
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self):
+        """Discard a partially written file."""
+        if self._file is None:
+            return
+        self._file.close()
+        self._index.close()
+        self._file = None
+        try:
+            os.remove(self._tmp_path)
+        except OSError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def _lower_thread_priority():
+    """Drop the calling thread's scheduling priority where the OS allows it."""
+    try:
+        # On Linux the nice value is per thread
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+    except (AttributeError, OSError):
+        pass
+
+
+class TimelapseAssembler:
+    """Background job turning a folder of JPEG frames into an MJPEG AVI.
+
+    The main video copies each frame's JPEG bytes unchanged. When
+    ``proxy_path`` is set a small preview video is written in the same pass
+    from draft (DCT-scaled) decodes of each frame.
+    """
+
+    def __init__(self, frames: List[str], output_path: str, fps: float = 24.0,
+                 proxy_path: Optional[str] = None, proxy_size: Tuple[int, int] = (640, 480),
+                 proxy_quality: int = 75):
+        self.frames = frames
+        self.output_path = output_path
+        self.fps = fps
+        self.proxy_path = proxy_path
+        self.proxy_size = proxy_size
+        self.proxy_quality = proxy_quality
+
+        self.state = "idle"  # idle, running, done, error, cancelled
+        self.error: Optional[str] = None
+        self.frames_done = 0
+        self._cancel = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def progress(self) -> float:
+        if not self.frames:
+            return 1.0
+        return self.frames_done / len(self.frames)
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self.state = "running"
+        self._thread = threading.Thread(target=self._run_in_background, daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def _run_in_background(self):
+        _lower_thread_priority()
+        self.run()
+
+    def run(self):
+        """Assemble the video in the calling thread."""
+        self.state = "running"
+        self.frames_done = 0
+        if not self.frames:
+            self.state = "error"
+            self.error = "No frames"
+            return
+
+        writer = None
+        proxy = None
+        try:
+            with Image.open(self.frames[0]) as first:
+                width, height = first.size
+            writer = MjpegAviWriter(self.output_path, width, height, self.fps)
+
+            for frame_path in self.frames:
+                if self._cancel.is_set():
+                    writer.abort()
+                    if proxy:
+                        proxy.abort()
+                    self.state = "cancelled"
+                    return
+
+                with open(frame_path, "rb") as f:
+                    data = f.read()
+                writer.add_frame(data)
+
+                if self.proxy_path:
+                    small = self._make_proxy_frame(data)
+                    if proxy is None:
+                        with Image.open(io.BytesIO(small)) as img:
+                            proxy = MjpegAviWriter(self.proxy_path, img.width, img.height, self.fps)
+                    proxy.add_frame(small)
+
+                self.frames_done += 1
+
+            writer.close()
+            if proxy:
+                proxy.close()
+            self.state = "done"
+            print(f"Timelapse video written: {self.output_path} ({writer.frame_count} frames)")
+        except Exception as e:
+            print(f"Timelapse video error: {e}")
+            if writer:
+                writer.abort()
+            if proxy:
+                proxy.abort()
+            self.error = str(e)
+            self.state = "error"
+
+    def _make_proxy_frame(self, data: bytes) -> bytes:
+        with Image.open(io.BytesIO(data)) as img:
+            # draft() lets libjpeg decode at 1/2, 1/4 or 1/8 scale
+            img.draft("RGB", self.proxy_size)
+            small = img.convert("RGB")
+        small.thumbnail(self.proxy_size)
+        # Even dimensions keep every proxy frame the same size for most decoders
+        small = small.resize((small.width - small.width % 2, small.height - small.height % 2))
+        buf = io.BytesIO()
+        small.save(buf, format="JPEG", quality=self.proxy_quality)
+        return buf.getvalue()
@@ -10,11 +10,16 @@ except ImportError:
     pass
 
 import os
+import sys
+import zlib
 from os import path
 from datetime import datetime
-from typing import Dict, Any, Optional, Tuple, Callable
+from typing import Dict, Any, List, Optional, Tuple, Callable
 from abc import ABC, abstractmethod
 from src.core.config import config
+from src.hardware.frame_grabber import FrameGrabber
+from src.hardware.camera_commands import CameraCommandQueue
+from src.hardware.camera_state import CameraState
 import pygame
 import shutil
 import threading
@@ -330,10 +335,54 @@ class ResumableQueue:
             print(f"Error processing disk job {job_file_path}: {e}")
             # If corrupt, maybe delete?
 
+def parse_resolution(value) -> Tuple[int, int]:
+    """(width, height) from "w,h" (menu and database values) or a pair."""
+    if isinstance(value, str):
+        value = value.split(',')
+    width, height = value
+    return (int(width), int(height))
+
+
+def _parse_scalar(value):
+    """Numbers and booleans stored as strings (database values) as their type."""
+    if not isinstance(value, str):
+        return value
+    if value.lower() in ('true', 'false'):
+        return value.lower() == 'true'
+    for convert in (int, float):
+        try:
+            return convert(value)
+        except ValueError:
+            pass
+    return value
+
+
 class CameraBase(ABC):
+    # How a setting's value is typed in self.state; others go through _parse_scalar
+    SETTING_TYPES: Dict[str, Callable[[Any], Any]] = {
+        "resolution": parse_resolution,
+    }
+    # Setting a key can change what other getters return
+    STATE_DEPENDENCIES: Dict[str, Tuple[str, ...]] = {
+        "resolution": ("filesize", "remaining"),
+        "imageformat": ("filesize", "remaining"),
+        "quality": ("filesize", "remaining"),
+        "denoise": ("imagedenoise",),
+        "imagedenoise": ("denoise",),
+        "timer": ("timelapse_interval",),
+        "timelapse_interval": ("timer",),
+    }
+    # Values that change without a setter (free disk space) and are re-read periodically
+    VOLATILE_STATE: Tuple[str, ...] = ("remaining",)
+
     def __init__(self, menus: Dict[str, Any], settings: Dict[str, Any]):
         self.menus = menus
         self.settings = settings
+        self.state = CameraState()
+        self.commands = CameraCommandQueue(self._apply_batch)  # Setter calls off the UI thread
+        self._directory: Optional[Dict[str, Callable]] = None
+        self._raw_accessors: Dict[str, Callable] = {}
+        self._state_loaded = False
         self.resolution: Tuple[int, int] = (4000, 3000)
         self.has_hardware_overlay: bool = False
         self.image_format: str = "jpeg"
@@ -354,7 +403,7 @@ class CameraBase(ABC):
         
         # Resumable Queue
         # Stores raw captures to disk to survive power loss
-        queue_path = os.path.join("home", "cache")
+        queue_path = self.settings.get("files", {}).get("cache_path", os.path.join("home", "cache"))
         self.queue_manager = ResumableQueue(queue_path)
 
     @abstractmethod
@@ -376,14 +425,135 @@ class CameraBase(ABC):
     def controls(self, pygame_mod, key): pass
 
     @abstractmethod
-    def directory(self) -> Dict[str, Callable]: pass
+    def _accessors(self) -> Dict[str, Callable]:
+        """Getter/setter per setting name: ``f()`` reads, ``f(value=...)`` sets."""
+
+    def directory(self) -> Dict[str, Callable]:
+        """The accessors, wrapped so every read and set is recorded in ``self.state``."""
+        if self._directory is None:
+            self._raw_accessors = self._accessors()
+            self._directory = {key: self._tracked(key, accessor) for key, accessor in self._raw_accessors.items()}
+        return self._directory
+
+    def apply_settings(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue several settings at once, skipping those the camera already has.
+
+        The current values come from ``self.state``, so unchanged settings cost
+        no camera access at all. Both sides are compared after
+        ``normalize_setting``, as menu and database values are often strings. Returns the settings that were queued; see
+        ``submit_settings``.
+        """
+        directory = self.directory()
+        current = self.state_snapshot()[1]
+        changed = {key: value for key, value in values.items()
+                   if key in directory and (key not in current or
+                                            self.normalize_setting(key, current[key]) !=
+                                            self.normalize_setting(key, value))}
+        self.submit_settings(changed)
+        return changed
+
+    @classmethod
+    def normalize_setting(cls, key: str, value: Any) -> Any:
+        """``value`` typed like the camera reports it, so "1920,1080" equals (1920, 1080)."""
+        try:
+            return cls.SETTING_TYPES.get(key, _parse_scalar)(value)
+        except (TypeError, ValueError):
+            return value
+
+    def submit_settings(self, values: Dict[str, Any]):
+        """Set settings on the command worker instead of the calling thread.
+
+        ``self.state`` shows the new values straight away; the setters'
+        results replace them once applied. A setting that is written again
+        before the worker got to it is only applied once, with the latest value.
+        """
+        directory = self.directory()
+        values = {key: value for key, value in values.items() if key in directory}
+        for key, value in values.items():
+            self.state.set(key, value)
+        self.commands.submit_many(values)
+
+    def wait_for_settings(self, timeout: Optional[float] = 2.0) -> bool:
+        """Block until queued settings have reached the camera (e.g. before a capture)."""
+        return self.commands.wait(timeout)
+
+    def _apply_batch(self, values: Dict[str, Any]) -> Dict[str, Exception]:
+        """Run the setters for a batch of settings (on the command worker).
+
+        Settings that depend on the changed ones are re-read once at the end
+        rather than after every setter. Returns the settings whose setter
+        failed, with the error; the command queue counts them.
+        """
+        dependents = set()
+        failed: Dict[str, Exception] = {}
+        for key, value in values.items():
+            try:
+                result = self._raw_accessors[key](value=value)
+                # A newer value is already queued (and shown); don't flash the older one
+                if not self.commands.is_pending(key):
+                    self.state.set(key, result)
+            except Exception as e:
+                failed[key] = e
+            dependents.update(self.STATE_DEPENDENCIES.get(key, ()))
+        # Includes changed keys a later setter may have overridden (timer vs. timelapse_interval).
+        # A failed setter's key is re-read too, so the shown value is the camera's again.
+        self.refresh_state(dependents | set(failed))
+        return failed
+
+    def _tracked(self, key: str, accessor: Callable) -> Callable:
+        def tracked(value=None):
+            if value is None:
+                self.state.count_read()
+                result = accessor()
+                self.state.set(key, result)
+                return result
+            result = accessor(value=value)
+            self.state.set(key, result)
+            self.refresh_state(self.STATE_DEPENDENCIES.get(key, ()))
+            return result
+        tracked.__name__ = getattr(accessor, "__name__", key)
+        return tracked
+
+    def refresh_state(self, keys=None):
+        """Read the given settings (all when None) from the camera into ``self.state``."""
+        directory = self.directory()
+        if keys is None:
+            self._state_loaded = True
+        for key in (directory if keys is None else keys):
+            if key in directory:
+                try:
+                    directory[key]()
+                except Exception as e:
+                    print(f"Failed to read {key}: {e}")
+
+    def state_snapshot(self):
+        """(version, values) of the cached settings, reading everything once on first use."""
+        if not self._state_loaded:
+            self.refresh_state()
+        return self.state.snapshot()
     
     @abstractmethod
-    def render(self, overlay_surface: pygame.Surface, display_surface: pygame.Surface): pass
+    def render(self, overlay_surface: pygame.Surface, display_surface: pygame.Surface,
+               dirty_rects: Optional[List] = None) -> Optional[List]:
+        """Composite the UI overlay. ``dirty_rects`` lists the overlay areas that
+        changed (None = everything); returns the display rects that need to be
+        pushed, or None for the whole screen."""
 
     @abstractmethod
     def get_supported_options(self, key: str) -> Optional[list]: pass
 
+    def capability_key(self) -> Tuple[str, str, str]:
+        """(backend, camera model, library version): what get_supported_options depends on."""
+        return (type(self).__name__, "unknown", "unknown")
+
+    def preview_needs_redraw(self) -> bool:
+        """True while the render loop has to keep drawing the preview every frame."""
+        return False
+
+    def preview_stats(self) -> Dict[str, Any]:
+        """Capture-side preview counters (fps, frames, dropped), if the camera keeps any."""
+        return {}
+
     def get_disk_space(self) -> str:
         try:
             path_to_check = self.settings["files"]["path"]
@@ -560,6 +730,13 @@ class CameraBase(ABC):
 
 
 class RealCamera(CameraBase):
+    # Surface channel masks (R, G, B, A) -> picamera overlay format of the raw pixel bytes
+    # on a little-endian CPU, so the surface buffer can be handed over without conversion
+    OVERLAY_FORMATS = {
+        (0xFF0000, 0xFF00, 0xFF, 0xFF000000): 'bgra',
+        (0xFF, 0xFF00, 0xFF0000, 0xFF000000): 'rgba',
+    }
+
     def __init__(self, menus: Dict[str, Any], settings: Dict[str, Any]):
         super().__init__(menus, settings)
         if picamera is None:
@@ -567,6 +744,8 @@ class RealCamera(CameraBase):
         self.camera = picamera.PiCamera()
         self.has_hardware_overlay = True
         self.overlay = None
+        self._overlay_crc: Optional[int] = None  # Checksum of the last full-frame upload
+        self.overlay_stats = {"uploads": 0, "skipped": 0, "bytes": 0}
         
         # Capture Queue for sequential hardware access
         self.capture_queue = queue.Queue()
@@ -591,6 +770,18 @@ class RealCamera(CameraBase):
             pass
         return None
 
+    def capability_key(self) -> Tuple[str, str, str]:
+        try:
+            from importlib.metadata import version
+            library = version("picamera")
+        except Exception:
+            library = getattr(picamera, "__version__", "unknown")
+        try:
+            model = str(self.camera.revision)
+        except Exception:
+            model = "unknown"
+        return (type(self).__name__, model, library)
+
     def _auto_mode(self):
         self.camera.exposure_mode = 'auto'
         self.camera.shutter_speed = 0
@@ -599,18 +790,34 @@ class RealCamera(CameraBase):
     def getCamera(self):
         return self.camera
 
-    def render(self, overlay_surface: pygame.Surface, display_surface: pygame.Surface):
-        # Hardware Overlay Handling
-        # Convert Pygame surface to raw bytes
-        pygames_screen_raw = pygame.image.tostring(overlay_surface, 'RGBA')
+    def render(self, overlay_surface: pygame.Surface, display_surface: pygame.Surface,
+               dirty_rects: Optional[List] = None) -> Optional[List]:
+        # The preview and overlay are composited in hardware; the pygame display stays untouched.
+        # Nothing changed on the layer: the hardware keeps showing the last upload.
+        if dirty_rects is not None and not dirty_rects and self.overlay is not None:
+            self.overlay_stats["skipped"] += 1
+            return []
+
+        source, fmt = self._overlay_source(overlay_surface)
         width, height = overlay_surface.get_size()
+
+        # Full-frame requests carry no damage info, so compare a checksum of the pixels instead
+        if dirty_rects is None:
+            checksum = zlib.crc32(source)
+            if self.overlay is not None and checksum == self._overlay_crc:
+                self.overlay_stats["skipped"] += 1
+                return []
+            self._overlay_crc = checksum
+        else:
+            self._overlay_crc = None
         
         if self.overlay is None:
             # Create overlay
             try:
                 self.overlay = self.camera.add_overlay(
-                    pygames_screen_raw,
+                    source,
                     size=(width, height),
+                    format=fmt,
                     layer=3,
                     alpha=255,
                     fullscreen=False,
@@ -618,12 +825,28 @@ class RealCamera(CameraBase):
                 )
             except Exception as e:
                 print(f"Error creating overlay: {e}")
+                self._overlay_crc = None
+                return []
         else:
             # Update overlay
             try:
-                self.overlay.update(pygames_screen_raw)
+                self.overlay.update(source)
             except Exception as e:
                 print(f"Error updating overlay: {e}")
+                self._overlay_crc = None
+                return []
+        self.overlay_stats["uploads"] += 1
+        self.overlay_stats["bytes"] += width * height * 4
+        return []
+
+    def _overlay_source(self, surface: pygame.Surface) -> Tuple[Any, str]:
+        """A view of the surface's pixels and its overlay format, copying only when
+        the layout in memory isn't one picamera can take directly."""
+        width, _ = surface.get_size()
+        fmt = self.OVERLAY_FORMATS.get(tuple(surface.get_masks()))
+        if fmt and sys.byteorder == 'little' and surface.get_pitch() == width * 4:
+            return surface.get_buffer(), fmt
+        return pygame.image.tostring(surface, 'RGBA'), 'rgba'
 
     def startPreview(self):
         self.camera.start_preview(
@@ -634,6 +857,7 @@ class RealCamera(CameraBase):
         self.camera.stop_preview()
 
     def closeCamera(self):
+        self.commands.close()
         self.camera.close()
 
     def exposure(self, value=None):
@@ -769,6 +993,7 @@ class RealCamera(CameraBase):
             print(e)
 
     def captureImage(self):
+        self.wait_for_settings()  # Capture with the settings the user sees
         self.camera.resolution = self.resolution
 
         try:
@@ -797,7 +1022,7 @@ class RealCamera(CameraBase):
         if key == pygame_mod.K_RETURN:
             self.captureImage()
 
-    def directory(self) -> Dict[str, Callable]:
+    def _accessors(self) -> Dict[str, Callable]:
         return {
             "mode": self.shooting_mode,
             "burst_count": self.burst_count,
@@ -831,6 +1056,19 @@ class MockCamera(CameraBase):
         self.has_hardware_overlay = False
         self.webcam = None
         self.is_previewing = False
+
+        # Webcam frames are captured on a background thread; the UI draws the newest one
+        self.grabber: Optional[FrameGrabber] = None
+        self._preview_seq = 0  # Sequence of the frame currently scaled for display
+        self._preview_frame = None  # Scaled copy of that frame, reused while the geometry holds
+        self._preview_rect = None  # Where it sits on the display
+        self._preview_geometry = None  # (frame size, display size) the above were computed for
+        # "nearest" is cheapest; "smooth" filters but costs more per frame
+        self.preview_scaling = settings.get("display", {}).get("preview_scaling", "nearest")
+
+        # The preview streams at a display-sized mode; self.resolution is only used for captures
+        self.preview_resolution = self._default_preview_resolution()
+        self.webcam_device = None
         
         # Mock state
         self._exposure_mode = 'auto'
@@ -845,14 +1083,29 @@ class MockCamera(CameraBase):
         self._saturation = 0
         self._brightness = 50
         self._exposure_comp = 0
-        
-        # Resolution change debouncing
-        self._pending_resolution = None
-        self._resolution_change_time = 0
+
+    def _default_preview_resolution(self) -> Tuple[int, int]:
+        """display.preview_resolution ("w,h" or [w, h]) or else the display size."""
+        display = self.settings.get("display", {})
+        value = display.get("preview_resolution")
+        if isinstance(value, str):
+            return tuple(map(int, value.split(',')))
+        if value:
+            return tuple(value)
+        return (display.get("width", 640), display.get("height", 480))
 
     def getCamera(self):
         return None
 
+    def preview_needs_redraw(self) -> bool:
+        # The webcam feed is drawn by render() whenever the grabber has a new frame
+        return self.is_previewing and self.grabber is not None
+
+    def preview_stats(self) -> Dict[str, Any]:
+        if self.grabber is None:
+            return {}
+        return dict(self.grabber.stats)
+
     def startPreview(self):
         print("MockCamera: startPreview")
         self.is_previewing = True
@@ -860,62 +1113,132 @@ class MockCamera(CameraBase):
             cameras = pygame.camera.list_cameras()
             if cameras:
                 self.webcam_device = cameras[0]
-                print(f"MockCamera: Requesting resolution {self.resolution}")
-                self.webcam = pygame.camera.Camera(self.webcam_device, self.resolution)
-                self.webcam.start()
-                print(f"MockCamera: Webcam started on {self.webcam_device} at {self.webcam.get_size()}")
+                self._open_preview_stream()
             else:
                 print("MockCamera: No webcam found")
         except Exception as e:
             print(f"MockCamera: Error starting webcam: {e}")
 
-    def stopPreview(self):
-        print("MockCamera: stopPreview")
-        self.is_previewing = False
+    def _open_preview_stream(self):
+        print(f"MockCamera: Requesting preview resolution {self.preview_resolution}")
+        self.webcam = pygame.camera.Camera(self.webcam_device, self.preview_resolution)
+        self.webcam.start()
+        print(f"MockCamera: Webcam started on {self.webcam_device} at {self.webcam.get_size()}")
+        self.grabber = FrameGrabber(self.webcam)
+        self.grabber.start()
+
+    def _close_preview_stream(self):
+        if self.grabber:
+            self.grabber.stop()
+            self.grabber = None
         if self.webcam:
             self.webcam.stop()
             self.webcam = None
 
+    def _capture_still(self):
+        """One frame at the capture resolution.
+
+        If the preview already streams at that size its newest frame is used;
+        otherwise the device is briefly switched to the capture mode and back.
+        """
+        if self.webcam is None:
+            return None
+        if tuple(self.webcam.get_size()) == tuple(self.resolution):
+            surf = self.grabber.latest()[1] if self.grabber else None
+            return surf if surf is not None else self.webcam.get_image()
+
+        self._close_preview_stream()
+        still = None
+        try:
+            still = pygame.camera.Camera(self.webcam_device, self.resolution)
+            still.start()
+            return still.get_image()
+        finally:
+            if still is not None:
+                still.stop()
+            if self.is_previewing:
+                self._open_preview_stream()
+
+    def stopPreview(self):
+        print("MockCamera: stopPreview")
+        self.is_previewing = False
+        self._close_preview_stream()
+        self._preview_seq = 0
+        self._preview_frame = None
+        self._preview_rect = None
+        self._preview_geometry = None
+
     def closeCamera(self):
         print("MockCamera: closeCamera")
+        self.commands.close()
         self.stopPreview()
 
-    def render(self, overlay_surface: pygame.Surface, display_surface: pygame.Surface):
-        # Render Webcam Feed
-        if self.is_previewing and self.webcam:
-            try:
-                frame = self.webcam.get_image()
-                if frame:
-                    # Calculate aspect ratio scaling
-                    frame_rect = frame.get_rect()
-                    display_rect = display_surface.get_rect()
-                    
-                    # Calculate scale factor to fit within display while maintaining aspect ratio
-                    scale_w = display_rect.width / frame_rect.width
-                    scale_h = display_rect.height / frame_rect.height
-                    scale = min(scale_w, scale_h)
-                    
-                    new_width = int(frame_rect.width * scale)
-                    new_height = int(frame_rect.height * scale)
-                    
-                    scaled_frame = pygame.transform.scale(frame, (new_width, new_height))
-                    
-                    # Center the frame
-                    dest_rect = scaled_frame.get_rect(center=display_rect.center)
-                    
-                    # Clear background (black bars)
-                    display_surface.fill((0, 0, 0))
-                    
-                    # Blit scaled frame
-                    display_surface.blit(scaled_frame, dest_rect)
-            except Exception:
-                pass
-        
-        # Apply any pending resolution changes (debounced)
-        self.apply_pending_resolution()
+    def render(self, overlay_surface: pygame.Surface, display_surface: pygame.Surface,
+               dirty_rects: Optional[List] = None) -> Optional[List]:
+        new_frame = False
+        geometry_changed = False
+
+        # Pick up the newest webcam frame without waiting for the device;
+        # it is only scaled again when the grabber has published a new one
+        if self.is_previewing and self.grabber:
+            seq, frame = self.grabber.latest()
+            if frame is not None and seq != self._preview_seq:
+                try:
+                    geometry_changed = self._scale_preview(frame, display_surface.get_size())
+                    self._preview_seq = seq
+                    new_frame = True
+                except Exception:
+                    pass
         
-        # Render Menu Layer on top
-        display_surface.blit(overlay_surface, (0, 0))
+        # Render Menu Layer on top; the letterbox bars are only cleared in full
+        # when the preview geometry changes (or a full redraw is asked for)
+        if geometry_changed or dirty_rects is None:
+            display_surface.fill((0, 0, 0))
+            if self._preview_frame is not None:
+                display_surface.blit(self._preview_frame, self._preview_rect)
+            display_surface.blit(overlay_surface, (0, 0))
+            return None
+
+        rects = list(dirty_rects)
+        if new_frame:
+            # Same geometry: the bars still hold black + the unchanged overlay
+            display_surface.blit(self._preview_frame, self._preview_rect)
+            display_surface.blit(overlay_surface, self._preview_rect, self._preview_rect)
+            rects.append(self._preview_rect)
+
+        # Repaint what changed in the overlay
+        for rect in dirty_rects:
+            display_surface.set_clip(rect)
+            display_surface.fill((0, 0, 0))
+            if self._preview_frame is not None:
+                display_surface.blit(self._preview_frame, self._preview_rect)
+            display_surface.blit(overlay_surface, rect, rect)
+        display_surface.set_clip(None)
+        return rects
+
+    def _scale_preview(self, frame, display_size: Tuple[int, int]) -> bool:
+        """Scale a webcam frame into the reused preview surface, aspect-fit and centered.
+
+        The fit geometry and destination surface are only recomputed when the
+        frame or display size changes; returns True when that happened.
+        """
+        key = (frame.get_size(), tuple(display_size))
+        changed = key != self._preview_geometry
+        if changed:
+            (frame_w, frame_h), (display_w, display_h) = key
+            scale = min(display_w / frame_w, display_h / frame_h)
+            size = (int(frame_w * scale), int(frame_h * scale))
+            self._preview_rect = ((display_w - size[0]) // 2, (display_h - size[1]) // 2) + size
+            # Same pixel format as the frame, so it can be the scaler's dest_surface
+            self._preview_frame = pygame.Surface(size, 0, frame)
+            self._preview_geometry = key
+
+        size = self._preview_rect[2:]
+        if self.preview_scaling == "smooth" and frame.get_bitsize() in (24, 32):
+            pygame.transform.smoothscale(frame, size, self._preview_frame)
+        else:
+            pygame.transform.scale(frame, size, self._preview_frame)
+        return changed
 
     def exposure(self, value=None):
         if value is not None:
@@ -997,35 +1320,13 @@ class MockCamera(CameraBase):
             if self.resolution == str_to_tuple:
                 return self.resolution
                 
+            # Only captures use this; the preview stream keeps its own resolution
             self.resolution = str_to_tuple
-            print(f"MockCamera: Set resolution to {self.resolution}")
-            
-            # Debounce: only restart preview if enough time has passed
-            # This prevents rapid stop/start cycles when scrolling through options
-            current_time = time.time()
-            if self.is_previewing:
-                if current_time - self._resolution_change_time > 0.3:  # 300ms debounce
-                    self.stopPreview()
-                    self.startPreview()
-                    self._resolution_change_time = current_time
-                else:
-                    # Queue the resolution change, will be applied on next frame
-                    self._pending_resolution = str_to_tuple
+            print(f"MockCamera: Set capture resolution to {self.resolution}")
         return self.resolution
-    
-    def apply_pending_resolution(self):
-        """Apply pending resolution change if debounce period has passed."""
-        if self._pending_resolution is not None:
-            current_time = time.time()
-            if current_time - self._resolution_change_time > 0.3:
-                if self.is_previewing and self.resolution != self._pending_resolution:
-                    self.resolution = self._pending_resolution
-                    self.stopPreview()
-                    self.startPreview()
-                    self._resolution_change_time = current_time
-                self._pending_resolution = None
 
     def captureImage(self):
+        self.wait_for_settings()  # Capture with the settings the user sees
         print(f"MockCamera: *CLICK* Image captured at {self.resolution} in {self.image_format}")
         
         # Determine filename
@@ -1045,7 +1346,7 @@ class MockCamera(CameraBase):
 
         if self.webcam:
             try:
-                surf = self.webcam.get_image()
+                surf = self._capture_still()
                 data = pygame.image.tostring(surf, 'RGB')
                 capture_res = surf.get_size()
             except Exception as e:
@@ -1072,7 +1373,7 @@ class MockCamera(CameraBase):
         if key == pygame_mod.K_RETURN:
             self.captureImage()
 
-    def directory(self) -> Dict[str, Callable]:
+    def _accessors(self) -> Dict[str, Callable]:
         return {
             "mode": self.shooting_mode,
             "burst_count": self.burst_count,
@@ -1110,6 +1411,10 @@ class MockCamera(CameraBase):
             return ["off", "low", "medium", "high"]
         return None
 
+    def capability_key(self) -> Tuple[str, str, str]:
+        # The option lists above are fixed; the key still changes with the pygame build
+        return (type(self).__name__, "mock", pygame.version.ver)
+
 
 def get_camera(menus: Dict[str, Any], settings: Dict[str, Any]) -> CameraBase:
     if config.USE_MOCK_CAMERA:
@@ -0,0 +1,103 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+# Applies a batch; returns the settings that failed (with their error), or None when all were applied
+BatchApplier = Callable[[Dict[str, Any]], Optional[Dict[str, Exception]]]
+
+
+class CameraCommandQueue:
+    """Applies camera setting writes on a worker thread, latest value per setting.
+
+    ``submit()`` returns immediately. Writes to a setting that is still
+    waiting replace the waiting value (counted as coalesced), so holding a
+    key sends the camera the final value instead of every step. Pending
+    writes are handed to ``apply_batch`` in the order their settings were
+    first queued.
+    """
+
+    def __init__(self, apply_batch: BatchApplier, name: str = "camera-commands"):
+        self.apply_batch = apply_batch
+        self.name = name
+        self._pending: Dict[str, Any] = {}
+        self._busy = False  # A batch is being applied
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self.stats = {"submitted": 0, "applied": 0, "coalesced": 0, "batches": 0, "errors": 0,
+                      "last_batch_ms": 0.0, "max_batch_ms": 0.0}
+
+    def submit(self, key: str, value: Any):
+        self.submit_many({key: value})
+
+    def submit_many(self, values: Dict[str, Any]):
+        if not values:
+            return
+        with self._cond:
+            for key, value in values.items():
+                self.stats["submitted"] += 1
+                if key in self._pending:
+                    self.stats["coalesced"] += 1
+                self._pending[key] = value
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def is_pending(self, key: str) -> bool:
+        """True while a newer value for ``key`` is waiting to be applied."""
+        return key in self._pending
+
+    @property
+    def idle(self) -> bool:
+        return not self._pending and not self._busy
+
+    def wait(self, timeout: Optional[float] = 2.0) -> bool:
+        """Block until every queued write has been applied. Returns False on timeout."""
+        with self._cond:
+            if self._thread is None and self._pending:
+                # Closed: apply on the caller's thread
+                batch, self._pending = self._pending, {}
+                self._apply(batch)
+            return self._cond.wait_for(lambda: self.idle, timeout)
+
+    def close(self, timeout: float = 2.0):
+        """Apply what is still queued and stop the worker."""
+        self.wait(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _apply(self, batch: Dict[str, Any]):
+        start = time.perf_counter()
+        try:
+            failed = self.apply_batch(batch) or {}
+            self.stats["applied"] += len(batch) - len(failed)
+            self.stats["errors"] += len(failed)
+            for key, error in failed.items():
+                print(f"Camera command error: {key}: {error}")
+        except Exception as e:
+            self.stats["errors"] += 1
+            print(f"Camera command error: {e}")
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.stats["batches"] += 1
+        self.stats["last_batch_ms"] = elapsed_ms
+        self.stats["max_batch_ms"] = max(self.stats["max_batch_ms"], elapsed_ms)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closed)
+                if self._closed and not self._pending:
+                    return
+                batch, self._pending = self._pending, {}
+                self._busy = True
+            try:
+                self._apply(batch)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
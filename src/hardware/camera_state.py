@@ -0,0 +1,78 @@
+import threading
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Tuple
+
+Listener = Callable[[str, Any, Any], None]
+
+
+class CameraState:
+    """Last known value of every camera setting, with change notifications.
+
+    Camera setters push their result here, so the render loop can read a
+    snapshot instead of calling the getters (picamera property reads on the
+    real camera) every frame. Listeners are called as ``listener(key, old, new)``
+    on the thread that made the change.
+    """
+
+    def __init__(self):
+        self._values: Dict[str, Any] = {}
+        self._version = 0
+        self._snapshot: Tuple[int, Mapping[str, Any]] = (0, MappingProxyType({}))
+        self._listeners: List[Listener] = []
+        self._lock = threading.Lock()
+        self.stats = {"reads": 0, "sets": 0, "changes": 0, "snapshots": 0}
+
+    @property
+    def version(self) -> int:
+        """Incremented on every change."""
+        return self._version
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._values.get(key, default)
+
+    def set(self, key: str, value: Any) -> bool:
+        """Store a value; returns True (and notifies) if it changed."""
+        with self._lock:
+            self.stats["sets"] += 1
+            missing = key not in self._values
+            old = self._values.get(key)
+            if not missing and old == value:
+                return False
+            self._values[key] = value
+            self._version += 1
+            self.stats["changes"] += 1
+            listeners = list(self._listeners)
+
+        for listener in listeners:
+            try:
+                listener(key, old, value)
+            except Exception as e:
+                print(f"CameraState: listener error for {key}: {e}")
+        return True
+
+    def count_read(self, n: int = 1):
+        """Record getter calls that went to the camera."""
+        with self._lock:
+            self.stats["reads"] += n
+
+    def snapshot(self) -> Tuple[int, Mapping[str, Any]]:
+        """(version, read-only values). Rebuilt only after a change."""
+        with self._lock:
+            self.stats["snapshots"] += 1
+            if self._snapshot[0] != self._version:
+                self._snapshot = (self._version, MappingProxyType(dict(self._values)))
+            return self._snapshot
+
+    def subscribe(self, listener: Listener) -> Callable[[], None]:
+        """Register a change listener; returns a function that removes it."""
+        with self._lock:
+            self._listeners.append(listener)
+
+        def unsubscribe():
+            with self._lock:
+                if listener in self._listeners:
+                    self._listeners.remove(listener)
+        return unsubscribe
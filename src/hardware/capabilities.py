@@ -0,0 +1,92 @@
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Bump when the cached choice lists change shape so old cache files are ignored
+CAPABILITY_CACHE_VERSION = 1
+
+Choices = List[Dict[str, Any]]
+
+
+def build_choices(supported: list) -> Choices:
+    """Menu choices (value + display name) for the values a camera supports."""
+    choices = []
+    for value in supported:
+        display_name = str(value).replace('_', ' ').title()
+        if display_name.lower() == "off":
+            display_name = "Off"
+        choices.append({"value": value, "displayname": display_name})
+    return choices
+
+
+class CapabilityCache:
+    """Discovered camera options, stored on disk per (backend, camera model, library version).
+
+    ``choices()`` answers from the file when the camera matches an entry and
+    only asks the camera about options the entry doesn't cover yet. An
+    option the camera has no list for is stored as None, so it isn't asked
+    again on the next boot either.
+    """
+
+    def __init__(self, cache_file: str):
+        self.cache_file = cache_file
+        self._entries: Optional[Dict[str, Dict[str, Optional[Choices]]]] = None
+        self.stats = {"hits": 0, "discovered": 0}
+
+    @classmethod
+    def for_settings(cls, settings: Dict[str, Any]) -> "CapabilityCache":
+        cache_path = settings.get("files", {}).get("cache_path", os.path.join("home", "cache"))
+        # Not in cache_path itself: the capture queue takes every .json there for a pending job
+        return cls(os.path.join(cache_path, "camera", "capabilities.json"))
+
+    @staticmethod
+    def entry_key(key: Tuple[str, ...]) -> str:
+        return "|".join(str(part) for part in key)
+
+    def choices(self, camera, names: Iterable[str]) -> Dict[str, Optional[Choices]]:
+        """Choices per option name, discovering and storing the ones not cached yet."""
+        names = list(names)
+        entry = self._load().setdefault(self.entry_key(camera.capability_key()), {})
+        missing = [name for name in names if name not in entry]
+        for name in missing:
+            supported = camera.get_supported_options(name)
+            entry[name] = build_choices(supported) if supported else None
+            if supported:
+                print(f"Discovered options for {name}: {len(supported)} items")
+        self.stats["hits"] += len(names) - len(missing)
+        if missing:
+            self.stats["discovered"] += len(missing)
+            self._write()
+        return {name: entry.get(name) for name in names}
+
+    def clear(self):
+        self._entries = {}
+        if os.path.exists(self.cache_file):
+            os.remove(self.cache_file)
+
+    def _load(self) -> Dict[str, Dict[str, Optional[Choices]]]:
+        if self._entries is not None:
+            return self._entries
+        self._entries = {}
+        try:
+            with open(self.cache_file) as f:
+                cached = json.load(f)
+            if cached.get("version") == CAPABILITY_CACHE_VERSION:
+                self._entries = cached.get("entries", {})
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Ignoring capability cache {self.cache_file}: {e}")
+        return self._entries
+
+    def _write(self):
+        tmp_path = f"{self.cache_file}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.cache_file) or ".", exist_ok=True)
+            with open(tmp_path, "w") as f:
+                json.dump({"version": CAPABILITY_CACHE_VERSION, "entries": self._entries}, f)
+            os.replace(tmp_path, self.cache_file)  # Readers never see a partly written file
+        except Exception as e:
+            print(f"Could not write capability cache {self.cache_file}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
@@ -0,0 +1,106 @@
+import threading
+import time
+from typing import Any, List, Optional, Tuple
+
+
+class FrameGrabber:
+    """Capture preview frames on a background thread into a triple buffer.
+
+    The capture thread reads from ``source.get_image(surface)`` as fast as the
+    device delivers and publishes each frame with an increasing sequence
+    number. ``latest()`` never blocks: it hands the UI the newest frame, which
+    the capture thread will not write into again until the UI asks for a newer
+    one. Frames the UI never picked up are counted as dropped.
+    """
+
+    SLOTS = 3
+    ERROR_BACKOFF = 0.05  # Seconds to wait after a failed or empty read
+
+    def __init__(self, source: Any, name: str = "preview-grabber"):
+        self.source = source
+        self.name = name
+        self._slots: List[Any] = [None] * self.SLOTS
+        self._lock = threading.Lock()
+        self._latest = -1  # Slot holding the newest published frame
+        self._reading = -1  # Slot the UI is currently using
+        self._seq = 0
+        self._read_seq = 0
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"frames": 0, "dropped": 0, "errors": 0, "fps": 0.0}
+        self._fps_start = time.perf_counter()
+        self._fps_frames = 0
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    @property
+    def seq(self) -> int:
+        """Sequence number of the newest captured frame (0 = none yet)."""
+        return self._seq
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        """Stop capturing. Call before stopping the source device."""
+        self._running = False
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def latest(self) -> Tuple[int, Any]:
+        """(sequence, frame) of the newest frame, or (0, None) before the first one."""
+        with self._lock:
+            if self._latest < 0:
+                return 0, None
+            self._read_seq = self._seq
+            self._reading = self._latest
+            return self._seq, self._slots[self._latest]
+
+    def _next_slot(self) -> int:
+        with self._lock:
+            for i in range(self.SLOTS):
+                if i != self._latest and i != self._reading:
+                    return i
+        return 0
+
+    def _run(self):
+        while self._running:
+            index = self._next_slot()
+            try:
+                frame = self.source.get_image(self._slots[index]) if self._slots[index] is not None \
+                    else self.source.get_image()
+            except Exception as e:
+                if not self.stats["errors"]:
+                    print(f"FrameGrabber: capture error: {e}")
+                self.stats["errors"] += 1
+                time.sleep(self.ERROR_BACKOFF)
+                continue
+            if frame is None:
+                # No frame yet (e.g. the webcam is still starting): don't spin on the source
+                time.sleep(self.ERROR_BACKOFF)
+                continue
+            self._publish(index, frame)
+
+    def _publish(self, index: int, frame: Any):
+        with self._lock:
+            if self._seq != self._read_seq and self._seq > 0:
+                self.stats["dropped"] += 1
+            self._slots[index] = frame
+            self._latest = index
+            self._seq += 1
+        self.stats["frames"] += 1
+
+        self._fps_frames += 1
+        now = time.perf_counter()
+        elapsed = now - self._fps_start
+        if elapsed >= 1.0:
+            self.stats["fps"] = self._fps_frames / elapsed
+            self._fps_start = now
+            self._fps_frames = 0
@@ -2,6 +2,8 @@ import pygame
 import time
 from typing import Dict, Any, List, Optional
 
+from src.core.menu_model import MenuModel, find_option
+
 class MenuController:
     # Debounce state for quick stats value changes
     _pending_quick_change: Dict[str, Any] = {}  # {option_name: {option, value, timestamp}}
@@ -269,13 +271,32 @@ class MenuController:
 
     @staticmethod
     def _find_menu_item(menus: Dict[str, Any], name: str) -> Optional[Dict[str, Any]]:
-        for menu in menus["menus"]:
-            if "options" not in menu:
-                continue
-            for option in menu["options"]:
-                if option.get("name") == name:
-                    return option
-        return None
+        if isinstance(menus, MenuModel):
+            return menus.find(name)
+        return find_option(menus, name)
+
+    @staticmethod
+    def focus_option(menu_pos: List[int], menus: Dict[str, Any], name: str) -> bool:
+        """Move the menu selection onto option ``name`` (its value column is entered with Right).
+
+        Options inside groups can't be reached by the positional menu; False then.
+        """
+        path = MenuModel.wrap(menus).path_of(name)
+        if path is None or len(path) != 2:
+            return False
+        menu_pos[0], menu_pos[1] = path
+        menu_pos[2] = 0
+        menu_pos[3] = 1
+        return True
+
+    @staticmethod
+    def focus_quick_stat(quick_menu_pos: List[int], menu_pos: List[int], menus: Dict[str, Any], camera: Any,
+                         settings: Optional[Dict[str, Any]] = None, layout: Any = None) -> bool:
+        """Point the menu at the option of the selected quick stat, for opening the menu from the stats bar."""
+        stat_names = MenuController._get_quick_stats(menu_pos, menus, settings, camera, layout)
+        if not 0 <= quick_menu_pos[0] < len(stat_names):
+            return False
+        return MenuController.focus_option(menu_pos, menus, stat_names[quick_menu_pos[0]])
 
     @staticmethod
     def _handle_quick_value_change(direction: int, stat_index: int, menus: Dict[str, Any], camera: Any, settings: Optional[Dict[str, Any]] = None, settings_manager: Any = None, layout: Any = None):
@@ -439,7 +460,5 @@ class MenuController:
             return
 
         if camera:
-            directory = camera.directory()
-            if name in directory:
-                print(f"Applying setting: {name} = {value}")
-                directory[name](value=value)
+            # Applied on the camera's command worker; the UI keeps showing the new value meanwhile
+            camera.submit_settings({name: value})
@@ -0,0 +1,142 @@
+import pygame
+from typing import Dict, List, Optional, Set, Tuple
+
+Rect = Tuple[int, int, int, int]
+
+TRANSPARENT = (0, 0, 0, 0)
+
+
+def _intersects(a: Rect, b: Rect) -> bool:
+    return a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and a[1] < b[1] + b[3] and b[1] < a[1] + a[3]
+
+
+class DamageTracker:
+    """Keep track of which parts of the retained UI layer have to be redrawn.
+
+    The layer keeps its pixels between frames. What is drawn on it is split
+    into named regions (menu columns, stats strip), drawn in order. Code that
+    changes what a region shows calls mark(), and the drawing code asks
+    begin_region() whether the region has to be drawn this frame; clean
+    regions are skipped and keep their pixels. A region that is drawn is
+    cleared first, at its old and new place, which also makes the regions
+    drawn after it that overlap the cleared area dirty. The cleared areas are
+    the damage that is composited and pushed to the display. Anything drawn
+    straight onto the screen (overlays, profiler) is reported with add() and
+    repainted from the layer on the next frame. invalidate() redraws everything.
+    """
+
+    def __init__(self, size: Tuple[int, int]):
+        self.width, self.height = size
+        self.background = TRANSPARENT
+        self._regions: Dict[str, Rect] = {}  # Where each region was last drawn
+        self._marked: Set[str] = set()
+        self._damage: List[Rect] = []  # Layer areas cleared (and redrawn) this frame
+        self._cleared_all = False
+        self._screen_rects: List[Rect] = []  # Drawn directly on the screen this frame
+        self._prev_screen_rects: List[Rect] = []
+        self._full = True
+        self.stats = {"frames": 0, "full_frames": 0, "pixels": 0, "last_percent": 100.0}
+
+    def invalidate(self):
+        """Force the next frame to be redrawn and presented in full."""
+        self._full = True
+
+    @property
+    def full(self) -> bool:
+        return self._full
+
+    def mark(self, *names: str):
+        """Redraw these regions on the next frame (safe to call from other threads)."""
+        for name in names:
+            self._marked.add(name)
+
+    def begin_frame(self, background=TRANSPARENT):
+        """Start collecting damage; ``background`` is what cleared areas are filled with."""
+        self.background = background
+        self._damage = []
+        self._cleared_all = False
+        self._screen_rects = []
+
+    def begin_region(self, layer, name: str, rect) -> bool:
+        """True when region ``name`` has to be drawn at ``rect`` this frame.
+
+        Its old and new areas are cleared on the layer before returning True.
+        """
+        self._clear_all(layer)
+        rect = tuple(int(v) for v in rect)
+        old = self._regions.get(name)
+        if old == rect and name not in self._marked and not any(_intersects(rect, d) for d in self._damage):
+            return False
+        self._marked.discard(name)
+        self._regions[name] = rect
+        for area in (old, rect):
+            self._clear(layer, area)
+        return True
+
+    def place(self, layer, rects: Dict[str, Optional[Rect]]):
+        """Set where regions are drawn this frame (None = not drawn) before drawing any of them.
+
+        The areas they leave are cleared now, so a moved region can't erase
+        one that was already drawn this frame.
+        """
+        self._clear_all(layer)
+        for name, rect in rects.items():
+            rect = tuple(int(v) for v in rect) if rect else None
+            old = self._regions.get(name)
+            if old is not None and old != rect:
+                self._clear(layer, old)
+                del self._regions[name]  # Drawn as a new region by begin_region()
+
+    def _clear(self, layer, area: Optional[Rect]):
+        if self._full or not area or area[2] <= 0 or area[3] <= 0 or area in self._damage:
+            return
+        layer.fill(self.background, area)
+        self._damage.append(area)
+
+    def _clear_all(self, layer):
+        """On a full frame, clear the whole layer once and forget where regions were."""
+        if self._full and not self._cleared_all:
+            layer.fill(self.background)
+            self._regions = {}
+            self._cleared_all = True
+
+    def add(self, rect):
+        """Record an area drawn directly onto the screen this frame."""
+        rect = tuple(int(v) for v in rect)
+        if rect[2] > 0 and rect[3] > 0:
+            self._screen_rects.append(rect)
+
+    def end_frame(self, layer) -> Optional[List[Rect]]:
+        """Rects of the layer to composite (including areas last covered by
+        screen overlays), or None when everything must be redrawn."""
+        self._clear_all(layer)
+        if self._full:
+            self._full = False
+            return None
+        return self._damage + self._prev_screen_rects
+
+    def present(self, rects: Optional[List[Rect]]):
+        """Push the frame to the display: everything if rects is None."""
+        screen_rects = self._screen_rects
+        self._prev_screen_rects = screen_rects
+        total = self.width * self.height
+
+        if rects is None:
+            pygame.display.flip()
+            pushed = total
+            self.stats["full_frames"] += 1
+        else:
+            rects = list(rects) + screen_rects
+            if rects:
+                pygame.display.update(rects)
+            pushed = min(total, sum(r[2] * r[3] for r in rects))
+
+        self.stats["frames"] += 1
+        self.stats["pixels"] += pushed
+        self.stats["last_percent"] = 100.0 * pushed / total
+
+    def average_percent(self) -> float:
+        frames = self.stats["frames"]
+        if not frames:
+            return 0.0
+        return 100.0 * self.stats["pixels"] / (frames * self.width * self.height)
@@ -0,0 +1,105 @@
+from typing import Any, Callable, Dict, Mapping, Optional
+
+Formatter = Callable[[Any], str]
+
+# Formats the stats bar uses when the layout doesn't define one for the key
+DEFAULT_FORMATTERS = {
+    "shutter": {"type": "shutter_speed"},
+    "resolution": {"type": "resolution", "separator": "×"},
+    "exposurecomp": {"type": "signed_number"},
+}
+
+# Formatted strings remembered per key; stats cycle through few distinct values
+MEMO_SIZE = 64
+
+
+def format_shutter_speed(value: Any) -> str:
+    """Microseconds to '2.0s', '1/250', '12ms' or '500µs'."""
+    if isinstance(value, (int, float)) and value > 0:
+        if value >= 1000000:
+            return f"{value / 1000000:.1f}s"
+        elif value >= 1000:
+            fraction = 1000000 / value
+            if fraction >= 1:
+                return f"1/{int(fraction)}"
+            return f"{value / 1000:.0f}ms"
+        else:
+            return f"{value}µs"
+    return str(value)
+
+
+def format_signed_number(value: Any) -> str:
+    if isinstance(value, (int, float)):
+        sign = '+' if value > 0 else ''
+        return f"{sign}{value}"
+    return str(value)
+
+
+def compile_formatter(spec: Mapping[str, Any]) -> Formatter:
+    """Turn a <format> definition into a function of the value, resolving its type once."""
+    fmt_type = spec.get('type', 'string')
+
+    if fmt_type == 'shutter_speed':
+        return format_shutter_speed
+
+    if fmt_type == 'signed_number':
+        return format_signed_number
+
+    if fmt_type == 'resolution':
+        sep = spec.get('separator', '×')
+
+        def format_resolution(value: Any) -> str:
+            if isinstance(value, str) and ',' in value:
+                parts = value.split(',')
+                return f"{parts[0]}{sep}{parts[1]}"
+            elif isinstance(value, tuple):
+                return f"{value[0]}{sep}{value[1]}"
+            return str(value)
+        return format_resolution
+
+    prefix = spec.get('prefix', '')
+    suffix = spec.get('suffix', '')
+    if not prefix and not suffix:
+        return str
+    return lambda value: f"{prefix}{value}{suffix}"
+
+
+class ValueFormatters:
+    """Compiled formatters by key, each with a memo of value -> formatted string.
+
+    Keys without a formatter are shown with ``str()``.
+    """
+
+    def __init__(self, specs: Mapping[str, Mapping[str, Any]], defaults: Optional[Mapping[str, Mapping[str, Any]]] = None):
+        merged = dict(defaults or {})
+        merged.update(specs)
+        self._formatters: Dict[str, Formatter] = {key: compile_formatter(spec) for key, spec in merged.items()}
+        self._memo: Dict[str, Dict[Any, str]] = {key: {} for key in self._formatters}
+        self.stats = {"calls": 0, "hits": 0}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._formatters
+
+    def get(self, key: str) -> Optional[Formatter]:
+        return self._formatters.get(key)
+
+    def format(self, key: str, value: Any) -> str:
+        self.stats["calls"] += 1
+        formatter = self._formatters.get(key)
+        if formatter is None:
+            return str(value)
+        memo = self._memo[key]
+        # The type is part of the key: 1, 1.0 and True are equal but format differently
+        memo_key = (value.__class__, value)
+        try:
+            text = memo.get(memo_key)
+        except TypeError:  # Unhashable value, e.g. a list
+            return formatter(value)
+        if text is not None:
+            self.stats["hits"] += 1
+            return text
+        text = formatter(value)
+        if len(memo) >= MEMO_SIZE:
+            memo.clear()
+        memo[memo_key] = text
+        return text
@@ -1,29 +1,73 @@
 import pygame
 import os
+import re
 import math
 import threading
-from typing import List, Optional, Set
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
 from PIL import Image, ExifTags
 
+from src.core.video import TimelapseAssembler
+from src.ui.text_cache import FontRegistry, TextCache
+from src.ui.thumbnails import ThumbnailStore
+from src.ui.tiles import TileCache, TilePyramid, prune_tile_cache
+
+# Stored in the preview cache for frames that could not be decoded
+PREVIEW_FAILED = object()
+
+def _natural_key(name: str):
+    """Sort key treating digit runs as numbers, so frame 10 follows frame 9."""
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r"(\d+)", name)]
+
 class Gallery:
     # Buffer size: keep ±25 images loaded around current position
     BUFFER_SIZE = 25
+
+    # Grid view: thumbnail cell size, spacing and rows kept decoded off-screen
+    GRID_THUMB_SIZE = (160, 120)
+    GRID_THUMB_FILES = 2000  # Grid thumbnails kept on disk
+    GRID_GAP = 8
+    GRID_HEADER_HEIGHT = 40
+    GRID_MARGIN_ROWS = 1
+    GRID_SCROLL_EASE = 0.35  # Fraction of remaining scroll distance covered per frame
+
+    # Zoom: display pixels per source pixel for each step beyond fit-to-screen
+    ZOOM_STEPS = (0.25, 0.5, 1.0, 2.0)
+    ZOOM_PAN_FRACTION = 0.25  # Pan distance per key press, as a fraction of the screen
+    PINCH_SENSITIVITY = 4.0
+    TILE_CACHE_SIZE = 96  # Decoded tiles kept in RAM across all images
+    TILE_CACHE_IMAGES = 8  # Image pyramids kept on disk
+    TILE_PERSIST_BATCH = 4  # Tiles written to disk between two checks for a new request
+
+    # Timelapse sessions: folders shown as one entry, frames listed only when opened
+    TIMELAPSE_PREFIX = "timelapse_"
+    SCRUB_PREVIEW_SIZE = (320, 240)
+    SCRUB_PREVIEW_CACHE = 64  # Scaled previews kept while scrubbing a session
+    SCRUB_PREVIEW_FILES = 500  # Scrub previews kept on disk
+
+    # Startup: newest photos whose grid thumbnails are made before the gallery is first opened
+    WARMUP_THUMBNAILS = 24
+    SCRUB_SETTLE_MS = 250  # Full-resolution loading resumes after scrubbing pauses
     
-    def __init__(self, settings):
+    def __init__(self, settings, fonts: Optional[FontRegistry] = None, text_cache: Optional[TextCache] = None):
         self.settings = settings
+        self.fonts = fonts if fonts is not None else FontRegistry(pygame.font.Font)
+        self.text_cache = text_cache if text_cache is not None else TextCache()
         # Ensure path exists
         if "files" in settings and "path" in settings["files"]:
             self.path = settings["files"]["path"]
         else:
             self.path = "home/dcim"
+        self._root_path = self.path
             
-        self.files: List[str] = []
+        self._files: List[str] = []
+        self._file_index: Dict[str, int] = {}  # Name -> position in files, kept by the files setter
         self.current_index = 0
         self.image_cache = {}
         self._cache_lock = threading.Lock()
         self._loading_indices: Set[int] = set()  # Track which indices are being loaded
-        self.font = pygame.font.Font("freesansbold.ttf", 20)
-        self.meta_font = pygame.font.Font("freesansbold.ttf", 16)
+        self.font = self.fonts.get(20)
+        self.meta_font = self.fonts.get(16)
         self.active = False
         
         # Display dimensions for scaling (set on first render)
@@ -39,8 +83,56 @@ class Gallery:
         # Metadata State
         self.show_metadata = False
 
+        # Grid (contact sheet) View State
+        self.view_mode = "single"  # single, grid
+        self.grid_index = 0
+        cache_path = settings.get("files", {}).get("cache_path", os.path.join("home", "cache"))
+        self.thumbnails = ThumbnailStore(cache_dir=os.path.join(cache_path, "thumbs"), size=self.GRID_THUMB_SIZE)
+        self.thumb_cache: Dict[str, Any] = {}  # filename -> surface (None on failure)
+        self._grid_columns = 1
+        self._grid_scroll = 0.0  # Current scroll offset in pixels
+        self._grid_snap = True  # Jump straight to the selection on the next frame
+        self._thumb_window = None  # (start, end) file index range kept decoded
+        self._thumb_wanted: Set[str] = set()
+        self._thumb_pending: List[str] = []
+        self._thumb_cond = threading.Condition()
+        self._thumb_worker: Optional[threading.Thread] = None
+
+        # Zoom State (zoom_scale None = fit to screen)
+        self.zoom_scale: Optional[float] = None
+        self.zoom_center = (0.0, 0.0)  # View centre in source pixel coordinates
+        self._pyramid: Optional[TilePyramid] = None
+        self.tile_cache = TileCache(self.TILE_CACHE_SIZE)
+        self.tile_cache_dir = os.path.join(cache_path, "tiles")
+        self._scaled_tiles: Dict[Tuple, Any] = {}  # Tiles on screen, scaled for the current zoom
+        self._tile_request = None  # Latest (pyramid, reduce, tiles) for the worker
+        self._tile_request_key = None  # What was last requested; guarded by _tile_cond like the request
+        self._failed_tiles: frozenset = frozenset()  # Tile keys that could not be loaded, not requested again
+        self._tile_cond = threading.Condition()
+        self._tile_worker: Optional[threading.Thread] = None
+
+        # Timelapse Session State
+        self.session: Optional[str] = None  # Open session folder, None at top level
+        self.sessions: Set[str] = set()  # Session folders among self.files
+        self._session_info: Dict[str, Dict[str, Any]] = {}  # folder -> {"count", "cover"}
+        self._session_badges: Dict[str, Any] = {}  # folder -> badge background, reused every frame
+        self._session_return_index = 0
+        self.scrub_previews = ThumbnailStore(cache_dir=os.path.join(cache_path, "previews"),
+                                             size=self.SCRUB_PREVIEW_SIZE)
+        self.preview_cache = TileCache(self.SCRUB_PREVIEW_CACHE)
+        self._scrub_time: Optional[int] = None  # Ticks of the last scrub step
+        self._preview_request: List[str] = []
+        self._preview_cond = threading.Condition()
+        self._preview_worker: Optional[threading.Thread] = None
+
+        # Timelapse video exports keep running after the gallery is closed
+        self.video_jobs: Dict[str, TimelapseAssembler] = {}
+
     def enter(self):
         self.active = True
+        self.view_mode = "single"
+        self.session = None
+        self.path = self._root_path
         self.refresh_files()
         if self.files:
             self.current_index = len(self.files) - 1 # Start at newest
@@ -52,28 +144,217 @@ class Gallery:
     def exit(self):
         self.active = False
         # Clear cache to free RAM
-        with self._cache_lock:
-            self.image_cache.clear()
-        self._loading_indices.clear()
+        self._reset_listing()
+        with self._thumb_cond:
+            self._thumb_cond.notify_all()
+        with self._preview_cond:
+            self._preview_request = []
+            self._preview_cond.notify_all()
+
+    @property
+    def files(self) -> List[str]:
+        return self._files
+
+    @files.setter
+    def files(self, files: List[str]):
+        self._files = files
+        self._file_index = {name: i for i, name in enumerate(files)}
+
+    def index_of(self, name: str) -> int:
+        """Position of ``name`` in the listing, -1 if it isn't there."""
+        return self._file_index.get(name, -1)
 
     def refresh_files(self):
+        self.sessions = set()
+        self._session_info = {}
+        self._session_badges = {}
         if not os.path.exists(self.path):
             self.files = []
             return
         
         valid_exts = [".jpg", ".jpeg", ".png", ".bmp"]
         try:
-            self.files = sorted([
-                f for f in os.listdir(self.path) 
-                if os.path.splitext(f)[1].lower() in valid_exts
-            ])
+            if self.session is not None:
+                # Timelapse frame counters are not zero padded
+                self.files = sorted([
+                    f for f in os.listdir(self.path)
+                    if os.path.splitext(f)[1].lower() in valid_exts
+                ], key=_natural_key)
+                return
+
+            files = []
+            for f in os.listdir(self.path):
+                if os.path.splitext(f)[1].lower() in valid_exts:
+                    files.append(f)
+                elif f.startswith(self.TIMELAPSE_PREFIX) and os.path.isdir(os.path.join(self.path, f)):
+                    # Frames are only counted when the entry is first shown
+                    self.sessions.add(f)
+                    files.append(f)
+            self.files = sorted(files)
         except OSError:
             self.files = []
 
+    def warm_up(self, count: Optional[int] = None) -> int:
+        """Read the photo folder and prepare the newest grid thumbnails on disk.
+
+        Meant for a startup thread: it leaves the gallery's own listing alone
+        and only touches the folder and the thumbnail cache. Returns the number
+        of thumbnails ready.
+        """
+        count = self.WARMUP_THUMBNAILS if count is None else count
+        valid_exts = [".jpg", ".jpeg", ".png", ".bmp"]
+        try:
+            with os.scandir(self._root_path) as entries:
+                names = sorted(e.name for e in entries
+                               if e.is_file() and os.path.splitext(e.name)[1].lower() in valid_exts)
+        except OSError:
+            return 0
+        ready = 0
+        for name in names[-count:] if count > 0 else []:
+            if self.thumbnails.get(os.path.join(self._root_path, name)) is not None:
+                ready += 1
+        return ready
+
+    def is_session(self, name: str) -> bool:
+        return self.session is None and name in self.sessions
+
+    def get_session_info(self, name: str) -> Dict[str, Any]:
+        """Frame count, cover (first) and last frame of a session folder, listed once per refresh."""
+        info = self._session_info.get(name)
+        if info is not None:
+            return info
+
+        info = {"count": 0, "cover": None, "last": None}
+        valid_exts = [".jpg", ".jpeg", ".png", ".bmp"]
+        try:
+            with os.scandir(os.path.join(self.path, name)) as entries:
+                frames = [e.name for e in entries if os.path.splitext(e.name)[1].lower() in valid_exts]
+            info["count"] = len(frames)
+            if frames:
+                info["cover"] = min(frames, key=_natural_key)
+                info["last"] = max(frames, key=_natural_key)
+        except OSError as e:
+            print(f"Error reading timelapse session {name}: {e}")
+        self._session_info[name] = info
+        return info
+
+    def _entry_image_path(self, name: str) -> Optional[str]:
+        """Image file shown for an entry: the file itself, or a session's cover frame."""
+        if self.is_session(name):
+            cover = self.get_session_info(name)["cover"]
+            return os.path.join(self.path, name, cover) if cover else None
+        return os.path.join(self.path, name)
+
+    def list_session_frames(self, name: str) -> List[str]:
+        """Full paths of a session's frames in capture order."""
+        folder = os.path.join(self._root_path, name)
+        valid_exts = [".jpg", ".jpeg"]
+        try:
+            frames = [f for f in os.listdir(folder) if os.path.splitext(f)[1].lower() in valid_exts]
+        except OSError:
+            return []
+        return [os.path.join(folder, f) for f in sorted(frames, key=_natural_key)]
+
+    def export_session_video(self, name: str) -> Optional[TimelapseAssembler]:
+        """Start assembling a session into ``<session>/<session>.avi`` in the background."""
+        job = self.video_jobs.get(name)
+        if job is not None and job.state == "running":
+            return job
+
+        video_settings = self.settings.get("timelapse_video", {})
+        folder = os.path.join(self._root_path, name)
+        proxy_path = os.path.join(folder, f"{name}_proxy.avi") if video_settings.get("proxy", False) else None
+        job = TimelapseAssembler(
+            self.list_session_frames(name),
+            os.path.join(folder, f"{name}.avi"),
+            fps=video_settings.get("fps", 24),
+            proxy_path=proxy_path,
+            proxy_size=tuple(video_settings.get("proxy_size", (640, 480))),
+        )
+        self.video_jobs[name] = job
+        job.start()
+        return job
+
+    def open_session(self, name: str):
+        """Replace the listing with the frames of a timelapse session."""
+        if not self.is_session(name):
+            return
+        self._session_return_index = self.index_of(name)
+        self._reset_listing()
+        self.session = name
+        self.path = os.path.join(self._root_path, name)
+        self.refresh_files()
+        self.current_index = 0
+        self.target_index = 0
+        if self.files:
+            self._update_buffer()
+
+    def close_session(self):
+        """Go back to the top-level listing with the session entry selected."""
+        if self.session is None:
+            return
+        name = self.session
+        self._reset_listing()
+        self.session = None
+        self.path = self._root_path
+        self.refresh_files()
+        if self.index_of(name) >= 0:
+            self.current_index = self.index_of(name)
+        else:
+            self.current_index = min(self._session_return_index, max(0, len(self.files) - 1))
+        self.target_index = self.current_index
+        if self.files:
+            self._update_buffer()
+
+    def _reset_listing(self):
+        """Drop everything tied to the current listing before switching folders."""
+        with self._cache_lock:
+            self.image_cache.clear()
+            self.thumb_cache.clear()
+        self._loading_indices.clear()
+        self.view_mode = "single"
+        self.show_metadata = False
+        self.animating = False
+        self.reset_zoom()
+        self._pyramid = None
+        self.tile_cache.clear()
+        self.preview_cache.clear()
+        self._scrub_time = None
+        self._thumb_window = None
+        with self._thumb_cond:
+            self._thumb_wanted = set()
+            self._thumb_pending = []
+
     def handle_event(self, event, action=None, auto_collapse=False):
         if not self.active: return
 
-        if action == "left":
+        if self.view_mode == "grid":
+            self._handle_grid_event(action)
+            return
+
+        if event is not None and getattr(event, "type", None) == pygame.MULTIGESTURE:
+            if getattr(event, "pinched", False) and self.files and not self.animating:
+                current = self.zoom_scale or self._get_fit_scale()
+                if current:
+                    self.set_zoom(current * (1 + event.d_dist * self.PINCH_SENSITIVITY))
+            return
+
+        if self.zoom_scale is not None:
+            self._handle_zoom_event(action)
+            return
+
+        if self.session is not None and action in ("left", "right"):
+            if self.files:
+                self.scrub(-1 if action == "left" else 1)
+            return
+
+        if action == "shutter":
+            if self.files and not self.animating:
+                if self.is_session(self.files[self.current_index]):
+                    self.export_session_video(self.files[self.current_index])
+                else:
+                    self.zoom_in()
+        elif action == "left":
             if self.files and not self.animating:
                 # Auto-collapse: exit when at first image
                 if auto_collapse and self.current_index == 0:
@@ -106,9 +387,185 @@ class Gallery:
         elif action == "up":
             self.show_metadata = True
         elif action == "down":
-            self.show_metadata = False
+            if self.show_metadata:
+                self.show_metadata = False
+            elif self.files and not self.animating:
+                self.open_grid()
+        elif action == "enter" and self.files and self.is_session(self.files[self.current_index]):
+            if not self.animating:
+                self.open_session(self.files[self.current_index])
         elif action == "back" or action == "enter":
-            self.exit()
+            if self.session is not None:
+                self.close_session()
+            else:
+                self.exit()
+
+    def scrub(self, delta: int):
+        """Step through session frames showing low-resolution previews.
+
+        Full-resolution loading is deferred until scrubbing pauses for
+        SCRUB_SETTLE_MS so holding an arrow is not limited by JPEG decodes.
+        """
+        total = len(self.files)
+        self.current_index = max(0, min(total - 1, self.current_index + delta))
+        self.target_index = self.current_index
+        self.animating = False
+        self._scrub_time = pygame.time.get_ticks()
+
+        # Current frame first, then the next frames in the scrub direction
+        step = 1 if delta >= 0 else -1
+        indices = [self.current_index + step * i for i in range(3)]
+        self._request_previews([self.files[i] for i in indices if 0 <= i < total])
+
+    def _handle_zoom_event(self, action):
+        """Arrows pan, shutter zooms further, enter/back return to fit-to-screen."""
+        if action in ("left", "right", "up", "down"):
+            dx = {"left": -1, "right": 1}.get(action, 0)
+            dy = {"up": -1, "down": 1}.get(action, 0)
+            self.pan(dx, dy)
+        elif action == "shutter":
+            self.zoom_in()
+        elif action in ("back", "enter"):
+            self.reset_zoom()
+
+    def _get_fit_scale(self) -> Optional[float]:
+        pyramid = self._open_pyramid()
+        if pyramid is None:
+            return None
+        sw, sh = self._display_size or (480, 320)
+        iw, ih = pyramid.size
+        return min(sw / iw, sh / ih)
+
+    def _open_pyramid(self) -> Optional[TilePyramid]:
+        """Return the tile pyramid for the current image, creating it on first zoom."""
+        if not self.files:
+            return None
+        filepath = self._entry_image_path(self.files[self.current_index])
+        if filepath is None:
+            return None
+        if self._pyramid is not None and self._pyramid.filepath == filepath:
+            return self._pyramid
+        try:
+            prune_tile_cache(self.tile_cache_dir, keep=self.TILE_CACHE_IMAGES)
+            self._pyramid = TilePyramid(filepath, cache_dir=self.tile_cache_dir)
+        except Exception as e:
+            print(f"Cannot zoom {filepath}: {e}")
+            self._pyramid = None
+        return self._pyramid
+
+    def zoom_in(self):
+        """Step to the next zoom level above the current one, wrapping back to fit."""
+        fit = self._get_fit_scale()
+        if fit is None:
+            return
+        current = self.zoom_scale or fit
+        for step in self.ZOOM_STEPS:
+            if step > current * 1.01 and step > fit * 1.01:
+                self.set_zoom(step)
+                return
+        self.reset_zoom()
+
+    def set_zoom(self, scale: float):
+        """Zoom to ``scale`` display pixels per source pixel, keeping the view centre."""
+        fit = self._get_fit_scale()
+        if fit is None:
+            return
+        scale = min(scale, self.ZOOM_STEPS[-1])
+        if scale <= fit * 1.01:
+            self.reset_zoom()
+            return
+        if self.zoom_scale is None:
+            iw, ih = self._pyramid.size
+            self.zoom_center = (iw / 2, ih / 2)
+        self.zoom_scale = scale
+        self._clamp_zoom_center()
+
+    def reset_zoom(self):
+        self.zoom_scale = None
+        self._scaled_tiles = {}
+        with self._tile_cond:
+            self._tile_request = None
+            self._tile_request_key = None
+            self._failed_tiles = frozenset()
+
+    def pan(self, dx: int, dy: int):
+        """Move the zoomed view by a fraction of the screen in each direction."""
+        if self.zoom_scale is None:
+            return
+        sw, sh = self._display_size or (480, 320)
+        cx, cy = self.zoom_center
+        cx += dx * sw * self.ZOOM_PAN_FRACTION / self.zoom_scale
+        cy += dy * sh * self.ZOOM_PAN_FRACTION / self.zoom_scale
+        self.zoom_center = (cx, cy)
+        self._clamp_zoom_center()
+
+    def _clamp_zoom_center(self):
+        sw, sh = self._display_size or (480, 320)
+        iw, ih = self._pyramid.size
+        half_w = sw / (2 * self.zoom_scale)
+        half_h = sh / (2 * self.zoom_scale)
+        cx, cy = self.zoom_center
+        cx = iw / 2 if half_w * 2 >= iw else max(half_w, min(iw - half_w, cx))
+        cy = ih / 2 if half_h * 2 >= ih else max(half_h, min(ih - half_h, cy))
+        self.zoom_center = (cx, cy)
+
+    def _handle_grid_event(self, action):
+        """Move the grid selection; enter opens the image, back leaves the gallery."""
+        if action == "back":
+            if self.session is not None:
+                self.close_session()
+            else:
+                self.exit()
+            return
+        if not self.files:
+            if action == "enter":
+                self.exit()
+            return
+
+        total = len(self.files)
+        cols = self._grid_columns
+        if action == "left":
+            self.grid_index = max(0, self.grid_index - 1)
+        elif action == "right":
+            self.grid_index = min(total - 1, self.grid_index + 1)
+        elif action == "up":
+            if self.grid_index - cols >= 0:
+                self.grid_index -= cols
+        elif action == "down":
+            # Move to the next row, landing on the last image if the row is short
+            if self.grid_index // cols < (total - 1) // cols:
+                self.grid_index = min(total - 1, self.grid_index + cols)
+        elif action == "enter":
+            if self.is_session(self.files[self.grid_index]):
+                self.open_session(self.files[self.grid_index])
+            else:
+                self.close_grid()
+
+    def open_grid(self):
+        """Switch to the thumbnail grid, centred on the current image."""
+        self.view_mode = "grid"
+        self.show_metadata = False
+        self.reset_zoom()
+        self.grid_index = self.current_index
+        self._grid_snap = True
+        self._thumb_window = None
+        # Full-screen images are not needed while browsing thumbnails
+        with self._cache_lock:
+            self.image_cache.clear()
+
+    def close_grid(self):
+        """Return to single-image view on the image selected in the grid."""
+        self.view_mode = "single"
+        self.current_index = self.grid_index
+        self.target_index = self.grid_index
+        self.animating = False
+        self._thumb_window = None
+        with self._cache_lock:
+            self.thumb_cache.clear()
+        with self._thumb_cond:
+            self._thumb_wanted = set()
+            self._thumb_pending = []
+        self._update_buffer()
 
     def _get_buffer_indices(self, center_index: int = None) -> Set[int]:
         """Get the set of indices that should be in the buffer."""
@@ -143,9 +600,8 @@ class Gallery:
         with self._cache_lock:
             current_cached = set()
             for filepath in list(self.image_cache.keys()):
-                filename = os.path.basename(filepath)
-                if filename in self.files:
-                    idx = self.files.index(filename)
+                idx = self.index_of(os.path.basename(filepath))
+                if idx >= 0:
                     current_cached.add(idx)
                     if idx not in desired_indices:
                         del self.image_cache[filepath]
@@ -165,9 +621,9 @@ class Gallery:
         def load():
             try:
                 filename = self.files[index]
-                filepath = os.path.join(self.path, filename)
+                filepath = self._entry_image_path(filename)
                 
-                if not os.path.exists(filepath):
+                if filepath is None or not os.path.exists(filepath):
                     return
                 
                 # Load and scale image
@@ -203,11 +659,23 @@ class Gallery:
         surface.fill((0, 0, 0))
 
         if not self.files:
-            text = self.font.render("No Images Found", True, (255, 255, 255))
+            text = self.text_cache.render(self.font, "No Images Found", True, (255, 255, 255))
             rect = text.get_rect(center=surface.get_rect().center)
             surface.blit(text, rect)
             return
 
+        if self.view_mode == "grid":
+            self._render_grid(surface)
+            return
+
+        if self.zoom_scale is not None and self._pyramid is not None:
+            self._render_zoomed(surface)
+            return
+
+        if self._scrub_time is not None and pygame.time.get_ticks() - self._scrub_time >= self.SCRUB_SETTLE_MS:
+            self._scrub_time = None
+            self._update_buffer()
+
         width, height = surface.get_size()
         
         # Animation Logic
@@ -238,9 +706,11 @@ class Gallery:
         idx_to_show = self.target_index if self.animating else self.current_index
         filename = self.files[idx_to_show]
         info_text = f"{idx_to_show + 1}/{len(self.files)} - {filename}"
-        text = self.font.render(info_text, True, (255, 255, 255))
+        if self.session is not None:
+            info_text = f"{self.session} - {info_text}"
+        text = self.text_cache.render(self.font, info_text, True, (255, 255, 255))
         # Add shadow
-        shadow = self.font.render(info_text, True, (0, 0, 0))
+        shadow = self.text_cache.render(self.font, info_text, True, (0, 0, 0))
         surface.blit(shadow, (12, 12))
         surface.blit(text, (10, 10))
         
@@ -248,15 +718,282 @@ class Gallery:
         if self.show_metadata:
             self._draw_metadata(surface, filename)
 
+    def _render_zoomed(self, surface):
+        """Draw the visible tiles of the pyramid level matching the zoom."""
+        pyramid = self._pyramid
+        scale = self.zoom_scale
+        sw, sh = surface.get_size()
+        reduce = pyramid.level_for_scale(scale)
+        level_scale = scale * reduce  # Display pixels per level pixel
+
+        cx, cy = self.zoom_center
+        view = (cx - sw / (2 * scale), cy - sh / (2 * scale),
+                cx + sw / (2 * scale), cy + sh / (2 * scale))
+
+        missing = []
+        scaled_tiles = {}
+        for tx, ty in pyramid.visible_tiles(reduce, view):
+            left, top, right, bottom = pyramid.tile_box(reduce, tx, ty)
+            dest_x = int(round(left * level_scale - view[0] * scale))
+            dest_y = int(round(top * level_scale - view[1] * scale))
+            size = (math.ceil((right - left) * level_scale), math.ceil((bottom - top) * level_scale))
+
+            key = (pyramid.filepath, reduce, tx, ty)
+            tile = self.tile_cache.get(key)
+            if tile:
+                scaled_tiles[key] = self._scaled_tile(key, tile, level_scale, size)
+                surface.blit(scaled_tiles[key], (dest_x, dest_y))
+            else:
+                pygame.draw.rect(surface, (30, 30, 30), (dest_x, dest_y, size[0], size[1]))
+                if key not in self._failed_tiles:
+                    missing.append((tx, ty))
+        self._scaled_tiles = scaled_tiles  # Only what is on screen now
+
+        if missing:
+            self._request_tiles(pyramid, reduce, missing)
+
+        info_text = f"{self.current_index + 1}/{len(self.files)} - {int(round(scale * 100))}%"
+        shadow = self.text_cache.render(self.font, info_text, True, (0, 0, 0))
+        text = self.text_cache.render(self.font, info_text, True, (255, 255, 255))
+        surface.blit(shadow, (12, 12))
+        surface.blit(text, (10, 10))
+
+    def _scaled_tile(self, key, tile, level_scale: float, size):
+        """A level tile scaled for the current zoom, reused while the zoom stays the same."""
+        if level_scale == 1:
+            return tile
+        cached = self._scaled_tiles.get(key)
+        if cached is not None and cached.get_size() == size:
+            return cached
+        # Nearest-neighbour when magnifying keeps pixels crisp for focus checks
+        if level_scale > 1:
+            return pygame.transform.scale(tile, size)
+        return pygame.transform.smoothscale(tile, size)
+
+    def _request_tiles(self, pyramid: TilePyramid, reduce: int, tiles: List):
+        """Hand the currently missing tiles to the worker, replacing any older request."""
+        key = (pyramid.filepath, reduce, tuple(tiles))
+        with self._tile_cond:
+            if key == self._tile_request_key:
+                return
+            self._tile_request_key = key
+            self._tile_request = (pyramid, reduce, tiles)
+            self._tile_cond.notify()
+
+        if self._tile_worker is None or not self._tile_worker.is_alive():
+            self._tile_worker = threading.Thread(target=self._tile_worker_loop, daemon=True)
+            self._tile_worker.start()
+
+    def _tile_worker_loop(self):
+        writing = None  # Pyramid with decoded tiles still to be written to disk
+        while True:
+            with self._tile_cond:
+                while self._tile_request is None and writing is None:
+                    if not self.active or self.zoom_scale is None:
+                        return
+                    self._tile_cond.wait(timeout=0.5)
+                request = self._tile_request
+                self._tile_request = None
+
+            if request is None:
+                # Idle: write a few more tiles, then look for a new request again
+                if not writing.persist_pending(self.TILE_PERSIST_BATCH):
+                    writing = None
+                continue
+
+            pyramid, reduce, tiles = request
+            stored = set()
+
+            def store(pos, tile):
+                try:
+                    surf = pygame.image.frombuffer(tile.tobytes(), tile.size, "RGB")
+                    self.tile_cache.put((pyramid.filepath, reduce, pos[0], pos[1]), surf)
+                    stored.add(pos)
+                except Exception as e:
+                    print(f"Error converting tile {pos}: {e}")
+
+            pyramid.load_tiles(reduce, tiles, on_tile=store)
+            writing = pyramid
+            with self._tile_cond:
+                # Tiles that didn't load would otherwise be asked for on every frame
+                failed = {(pyramid.filepath, reduce, tx, ty) for tx, ty in tiles if (tx, ty) not in stored}
+                if failed:
+                    self._failed_tiles = self._failed_tiles | failed
+                # The same tiles may be requested again once evicted from the cache,
+                # unless the UI has asked for something newer meanwhile
+                if self._tile_request_key == (pyramid.filepath, reduce, tuple(tiles)):
+                    self._tile_request_key = None
+
+    def _get_grid_geometry(self, width: int, height: int):
+        """Return (columns, cell_w, cell_h, view_height) for the grid view."""
+        tw, th = self.GRID_THUMB_SIZE
+        cell_w = tw + self.GRID_GAP
+        cell_h = th + self.GRID_GAP
+        cols = max(1, (width - self.GRID_GAP) // cell_w)
+        view_h = max(cell_h, height - self.GRID_HEADER_HEIGHT)
+        return cols, cell_w, cell_h, view_h
+
+    def _render_grid(self, surface):
+        width, height = surface.get_size()
+        cols, cell_w, cell_h, view_h = self._get_grid_geometry(width, height)
+        self._grid_columns = cols
+
+        total = len(self.files)
+        self.grid_index = max(0, min(self.grid_index, total - 1))
+        total_rows = (total + cols - 1) // cols
+
+        # Scroll just enough to keep the selected row on screen
+        selected_row = self.grid_index // cols
+        target = self._grid_scroll
+        if selected_row * cell_h < target:
+            target = selected_row * cell_h
+        elif (selected_row + 1) * cell_h > target + view_h:
+            target = (selected_row + 1) * cell_h - view_h
+        target = max(0, min(target, max(0, total_rows * cell_h - view_h)))
+
+        # Ease towards the target once per frame
+        remaining = target - self._grid_scroll
+        if self._grid_snap or abs(remaining) < 1:
+            self._grid_snap = False
+            self._grid_scroll = float(target)
+        else:
+            self._grid_scroll += remaining * self.GRID_SCROLL_EASE
+
+        scroll = int(self._grid_scroll)
+        first_row = scroll // cell_h
+        last_row = min(total_rows - 1, (scroll + view_h) // cell_h)
+        self._update_thumbnail_window(first_row, last_row, cols)
+
+        tw, th = self.GRID_THUMB_SIZE
+        left = (width - (cols * cell_w - self.GRID_GAP)) // 2
+        top = self.GRID_HEADER_HEIGHT
+
+        surface.set_clip(pygame.Rect(0, top, width, view_h))
+        for row in range(first_row, last_row + 1):
+            cell_y = top + row * cell_h - scroll
+            for col in range(cols):
+                idx = row * cols + col
+                if idx >= total:
+                    break
+                cell_x = left + col * cell_w
+
+                with self._cache_lock:
+                    thumb = self.thumb_cache.get(self.files[idx])
+
+                if thumb:
+                    tx = cell_x + (tw - thumb.get_width()) // 2
+                    ty = cell_y + (th - thumb.get_height()) // 2
+                    surface.blit(thumb, (tx, ty))
+                else:
+                    pygame.draw.rect(surface, (40, 40, 40), (cell_x, cell_y, tw, th))
+
+                if self.is_session(self.files[idx]):
+                    self._draw_session_badge(surface, self.files[idx], cell_x + 4, cell_y + th - 24)
+
+                if idx == self.grid_index:
+                    pygame.draw.rect(surface, (0, 255, 255), (cell_x - 3, cell_y - 3, tw + 6, th + 6), 3)
+        surface.set_clip(None)
+
+        # Header: position and filename of the selection
+        info_text = f"{self.grid_index + 1}/{total} - {self.files[self.grid_index]}"
+        shadow = self.text_cache.render(self.font, info_text, True, (0, 0, 0))
+        text = self.text_cache.render(self.font, info_text, True, (255, 255, 255))
+        surface.blit(shadow, (12, 12))
+        surface.blit(text, (10, 10))
+
+    def _update_thumbnail_window(self, first_row: int, last_row: int, cols: int):
+        """Keep thumbnails only for visible rows plus a margin; queue the missing ones."""
+        total = len(self.files)
+        margin = self.GRID_MARGIN_ROWS
+        start = max(0, (first_row - margin) * cols)
+        end = min(total, (last_row + margin + 1) * cols)
+
+        if self._thumb_window == (start, end):
+            return
+        self._thumb_window = (start, end)
+
+        wanted_names = self.files[start:end]
+        wanted = set(wanted_names)
+
+        with self._cache_lock:
+            for name in list(self.thumb_cache.keys()):
+                if name not in wanted:
+                    del self.thumb_cache[name]
+            missing = [name for name in wanted_names if name not in self.thumb_cache]
+
+        # Visible cells first, then the off-screen margin
+        visible_start = first_row * cols
+        visible_end = (last_row + 1) * cols
+        visible = set(self.files[visible_start:visible_end])
+        missing.sort(key=lambda name: name not in visible)
+
+        with self._thumb_cond:
+            self._thumb_wanted = wanted
+            self._thumb_pending = missing
+            self._thumb_cond.notify()
+
+        if missing and (self._thumb_worker is None or not self._thumb_worker.is_alive()):
+            self._thumb_worker = threading.Thread(target=self._thumbnail_worker, daemon=True)
+            self._thumb_worker.start()
+
+    def _thumbnail_worker(self):
+        """Decode queued thumbnails, skipping any that scrolled out of the window."""
+        self.thumbnails.prune(self.GRID_THUMB_FILES)
+        while True:
+            with self._thumb_cond:
+                while not self._thumb_pending:
+                    if not self.active or self.view_mode != "grid":
+                        return
+                    self._thumb_cond.wait(timeout=0.5)
+                name = self._thumb_pending.pop(0)
+                if name not in self._thumb_wanted:
+                    continue
+
+            surf = None
+            filepath = self._entry_image_path(name)
+            thumb = self.thumbnails.get(filepath) if filepath else None
+            if thumb is not None:
+                try:
+                    surf = pygame.image.frombuffer(thumb.tobytes(), thumb.size, "RGB")
+                except Exception as e:
+                    print(f"Error converting thumbnail {name}: {e}")
+
+            with self._thumb_cond:
+                still_wanted = name in self._thumb_wanted
+            if still_wanted:
+                with self._cache_lock:
+                    self.thumb_cache[name] = surf
+
     def _draw_image(self, surface, filename, x_offset):
-        filepath = os.path.join(self.path, filename)
+        filepath = self._entry_image_path(filename)
+        if filepath is None:
+            # Empty session folder
+            self._draw_session_card(surface, filename, x_offset)
+            return
         
         # Thread-safe cache access
         with self._cache_lock:
             img = self.image_cache.get(filepath)
+
+        if img is None and self.session is not None:
+            # Scrubbing: show the low-resolution preview instead of decoding frames
+            preview = self.preview_cache.get(filepath)
+            if preview is None:
+                self._request_previews([filename])
+                self._draw_loading_indicator(surface, x_offset)
+            elif preview is PREVIEW_FAILED:
+                text = self.text_cache.render(self.meta_font, "Frame could not be read", True, (200, 200, 200))
+                rect = text.get_rect(center=surface.get_rect().center)
+                rect.x += x_offset
+                surface.blit(text, rect)
+            else:
+                rect = preview.get_rect(center=surface.get_rect().center)
+                rect.x += x_offset
+                surface.blit(preview, rect)
+            return
         
         # Check if image is currently being loaded
-        file_index = self.files.index(filename) if filename in self.files else -1
+        file_index = self.index_of(filename)
         is_loading = file_index in self._loading_indices
         
         # If not in cache and not loading, show loading indicator and trigger async load
@@ -287,6 +1024,81 @@ class Gallery:
             rect.x += x_offset
             surface.blit(img, rect)
 
+        if self.is_session(filename):
+            self._draw_session_card(surface, filename, x_offset)
+
+    def _draw_session_badge(self, surface, name, x, y):
+        count = self.get_session_info(name)["count"]
+        text = self.text_cache.render(self.meta_font, f"Timelapse - {count} frames", True, (255, 255, 255))
+        size = (text.get_width() + 8, text.get_height() + 4)
+        bg = self._session_badges.get(name)
+        if bg is None or bg.get_size() != size:
+            bg = pygame.Surface(size, pygame.SRCALPHA)
+            bg.fill((0, 0, 0, 180))
+            self._session_badges[name] = bg
+        surface.blit(bg, (x, y))
+        surface.blit(text, (x + 4, y + 2))
+
+    def _draw_session_card(self, surface, name, x_offset):
+        """Label a session entry in single view with its frame count."""
+        width, height = surface.get_size()
+        self._draw_session_badge(surface, name, 10 + x_offset, height - 60)
+        hint_text = "Enter to open, shutter to export video"
+        job = self.video_jobs.get(name)
+        if job is not None:
+            if job.state == "running":
+                hint_text = f"Exporting video {int(job.progress * 100)}%"
+            elif job.state == "done":
+                hint_text = f"Video saved: {os.path.basename(job.output_path)}"
+            elif job.state == "error":
+                hint_text = f"Video export failed: {job.error}"
+        hint = self.text_cache.render(self.meta_font, hint_text, True, (200, 200, 200))
+        surface.blit(hint, (14 + x_offset, height - 30))
+
+    def _request_previews(self, names: List[str]):
+        """Queue scrub previews for session frames, replacing older requests."""
+        paths = [os.path.join(self.path, name) for name in names]
+        paths = [p for p in paths if p not in self.preview_cache]
+        if not paths:
+            return
+
+        with self._preview_cond:
+            self._preview_request = paths
+            self._preview_cond.notify()
+
+        if self._preview_worker is None or not self._preview_worker.is_alive():
+            self._preview_worker = threading.Thread(target=self._preview_worker_loop, daemon=True)
+            self._preview_worker.start()
+
+    def _preview_worker_loop(self):
+        self.scrub_previews.prune(self.SCRUB_PREVIEW_FILES)
+        while True:
+            with self._preview_cond:
+                while not self._preview_request:
+                    if not self.active or self.session is None:
+                        return
+                    self._preview_cond.wait(timeout=0.5)
+                filepath = self._preview_request.pop(0)
+
+            if filepath in self.preview_cache:
+                continue
+            thumb = self.scrub_previews.get(filepath)
+            if thumb is None:
+                # Corrupt or partly written frame: don't decode it again on every frame
+                self.preview_cache.put(filepath, PREVIEW_FAILED)
+                continue
+            try:
+                surf = pygame.image.frombuffer(thumb.tobytes(), thumb.size, "RGB")
+                # Scale up to fit the screen once, not on every frame
+                sw, sh = self._display_size or (480, 320)
+                iw, ih = thumb.size
+                scale = min(sw / iw, sh / ih)
+                surf = pygame.transform.scale(surf, (int(iw * scale), int(ih * scale)))
+                self.preview_cache.put(filepath, surf)
+            except Exception as e:
+                print(f"Error converting preview {filepath}: {e}")
+                self.preview_cache.put(filepath, PREVIEW_FAILED)
+
     def _draw_loading_indicator(self, surface, x_offset):
         """Draw a loading spinner when image is being loaded asynchronously."""
         width, height = surface.get_size()
@@ -313,7 +1125,7 @@ class Gallery:
             pygame.draw.circle(surface, color[:3], (x, y), 4)
         
         # Draw "Loading..." text
-        loading_text = self.font.render("Loading...", True, (200, 200, 200))
+        loading_text = self.text_cache.render(self.font, "Loading...", True, (200, 200, 200))
         text_rect = loading_text.get_rect(center=(center_x, center_y + 50))
         surface.blit(loading_text, text_rect)
 
@@ -339,11 +1151,13 @@ class Gallery:
         ]
         
         for line in lines:
-            text = self.meta_font.render(line, True, (200, 200, 200))
+            text = self.text_cache.render(self.meta_font, line, True, (200, 200, 200))
             surface.blit(text, (x, y))
             y += 20
 
     def _get_image_metadata(self, filename):
+        if self.is_session(filename):
+            return self._get_session_metadata(filename)
         filepath = os.path.join(self.path, filename)
         metadata = {
             "File": filename,
@@ -388,3 +1202,30 @@ class Gallery:
             
         return metadata
 
+    def _get_session_metadata(self, name):
+        """Metadata of a session folder: frame count, frame size and capture time span."""
+        info = self.get_session_info(name)
+        metadata = {
+            "File": name,
+            "Resolution": "Unknown",
+            "Date": "Unknown",
+            "Size": f"{info['count']} frames"
+        }
+        if not info["cover"]:
+            return metadata
+
+        session_dir = os.path.join(self.path, name)
+        try:
+            with Image.open(os.path.join(session_dir, info["cover"])) as img:
+                metadata["Resolution"] = f"{img.width}x{img.height}"
+        except Exception:
+            pass
+        try:
+            start = datetime.fromtimestamp(os.path.getmtime(os.path.join(session_dir, info["cover"])))
+            end = datetime.fromtimestamp(os.path.getmtime(os.path.join(session_dir, info["last"])))
+            end_format = "%H:%M:%S" if end.date() == start.date() else "%Y-%m-%d %H:%M:%S"
+            metadata["Date"] = f"{start:%Y-%m-%d %H:%M:%S} - {end.strftime(end_format)}"
+        except OSError:
+            pass
+        return metadata
+
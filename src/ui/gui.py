@@ -1,23 +1,41 @@
 import pygame
 import sys
 import os
-from typing import Dict, Any, List, Optional, Callable
+import time
+from typing import Dict, Any, List, Optional, Callable, Tuple
 
-from src.ui.layout_parser import LayoutParser
+from src.core.menu_model import MenuModel
+from src.ui.formatters import DEFAULT_FORMATTERS, ValueFormatters
+from src.ui.layout_registry import get_layout_registry
+from src.ui.render_plan import parse_color, parse_dimension
 from src.ui.gallery import Gallery
 from src.ui.controls import MenuController
+from src.ui.text_cache import FontRegistry, TextCache
+from src.ui.damage import TRANSPARENT, DamageTracker
+from src.ui.profiler import FrameProfiler
 
 class GUI:
-    def __init__(self, settings: Dict[str, Any], menus: Dict[str, Any], camera: Optional[Any] = None):
+    # Regions of the UI layer, in drawing order; each is redrawn only when marked dirty
+    MENU_COLUMNS = ("level_0", "level_1", "level_2")
+    UI_REGIONS = MENU_COLUMNS + ("stats",)
+
+    def __init__(self, settings: Dict[str, Any], menus: Dict[str, Any], camera: Optional[Any] = None,
+                 init_layout: bool = True):
+        """``init_layout=False`` opens the window without the layout, so the splash can show
+        while the layout is parsed elsewhere; call ``init_layout()`` before ``run()``."""
         self.settings = settings
-        self.menus = menus
-        self.camera = camera
+        self.menus = MenuModel.wrap(menus)  # Options are looked up by name through its index
+        self.camera = None
         self.menu_positions = [0, 0, 0, 0]  # menu_index, submenu_index, option_index, level
         self.quick_menu_pos = [0] # Selected index for quick stats menu
         
         pygame.init()
+
+        # Fonts are loaded once per (face, size) and text surfaces reused across frames
+        self.fonts = FontRegistry(pygame.font.Font)
+        self.text_cache = TextCache(self.settings["display"].get("text_cache_size", 256))
         
-        self.gallery = Gallery(settings)
+        self.gallery = Gallery(settings, fonts=self.fonts, text_cache=self.text_cache)
         
         self.width = settings["display"]["width"]
         self.height = settings["display"]["height"]
@@ -26,9 +44,37 @@ class GUI:
         pygame.display.set_caption(settings["display"]["caption"])
         
         self.layer = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        
-        self.font = pygame.font.Font('freesansbold.ttf', settings["display"]["fontsize"])
-        self.stats_font = pygame.font.Font('freesansbold.ttf', 10)
+
+        # Only the parts of the layer that changed are composited and pushed to the display
+        self.damage = DamageTracker((self.width, self.height))
+        self._frame_rects = None  # Display rects to update this frame, None = whole screen
+        self._damage_layout_name = None
+        self._damage_showmenu = None
+
+        # Idle pacing: block on input instead of rendering at refreshrate when nothing moves
+        self.idle_refresh_ms = self.settings["display"].get("idle_refresh_ms", 1000)
+        self.idle_poll_ms = 20  # Hardware buttons are polled, not evented
+        self._held_event = None  # Event that woke the idle wait, handled next frame
+        self._text_scrolling = False
+        self.telemetry = {"fps": 0.0, "preview_fps": 0.0, "cpu_percent": 0.0, "idle_percent": 0.0,
+                          "camera_reads": 0, "camera_writes": 0, "camera_coalesced": 0, "idle": False}
+        self._telemetry_reads = 0
+        self._telemetry_start = time.perf_counter()
+        self._telemetry_cpu = time.process_time()
+        self._telemetry_frames = 0
+        self._telemetry_idle = 0.0
+        # Time-to-first-preview is measured from here unless the launcher sets an earlier start
+        self.started_at = time.perf_counter()
+        self.first_preview_ms: Optional[float] = None
+
+        # Per-stage frame timing, toggled with the "profiler" control and exported with "profiler_dump"
+        self.profiler = FrameProfiler(self.settings["display"].get("profiler_history", 240))
+        self.profiler_dir = self.settings["display"].get("profiler_dir", "home/profiles")
+        if self.settings["display"].get("profiler", False):
+            self.profiler.set_enabled(True)
+        
+        self.font = self.fonts.get(settings["display"]["fontsize"])
+        self.stats_font = self.fonts.get(10)
         self.clock = pygame.time.Clock()
         
         # Animation State
@@ -59,21 +105,46 @@ class GUI:
         
         # Cache
         self._icon_cache: Dict[str, Any] = {}
+        self._icon_sources: Dict[str, Any] = {}  # Decoded icon files by path, before scaling (see warm_icons)
         
         # Stats strip animation state
         self._prev_stat_values: Dict[str, Any] = {}  # Previous values for animation
         self._stat_animations: Dict[str, Dict] = {}  # {key: {start_time, old_value, new_value, direction}}
         self._stat_anim_duration = 100  # Default, will be overridden by layout
+
+        # Camera values come from the camera's state store and are formatted only when they change
+        self._stat_text: Dict[str, Tuple[Any, str]] = {}  # {key: (raw value, formatted text)}
+        self._default_formatters = ValueFormatters({}, DEFAULT_FORMATTERS)  # Used without a layout
+        self._camera_state_changed = False
+        self._state_refresh_time = 0.0
+        self.state_refresh_interval = 2.0  # Seconds between re-reads of values with no setter (free space)
+        self._preview_started = False
+        if camera is not None:
+            self.attach_camera(camera)
         
         # Menu highlight animation state
         self._highlight_animations: Dict[str, Dict] = {}  # {container_id: {start_time, from_index, to_index}}
         self._highlight_anim_duration = 100  # ms - animation duration for menu highlight
         self._prev_selection_indices: Dict[str, int] = {}  # {container_id: last_selected_index}
         
-        # Initialize Layout Parser
+        # Splash screen state (durations come from the layout)
+        self.layouts = None
+        self._layout_version = 0
+        self._splash_duration = 2000
+        self._splash_fade = 500
+        self._splash_start_time = 0
+        self._splash_active = True
+        self._splash_shown = False
+        if init_layout:
+            self.init_layout()
+
+    def init_layout(self):
+        """Load the shared layout and apply its durations, menu settings and startup config."""
         try:
-            # Pass full settings so layout can access theme colors/sizes and display.animation_duration
-            self.layout = LayoutParser(theme_config=settings)
+            # Pass full settings so layout can access theme colors/sizes and display.animation_duration.
+            # The parse is shared with SettingsManager when it loaded these settings.
+            self.layouts = get_layout_registry(self.settings)
+            self._layout_version = self.layouts.version
             print("Layout parser initialized")
             
             # Update durations from layout
@@ -92,13 +163,78 @@ class GUI:
             self._splash_fade = startup_config.get('splash_fade', 500)
         except Exception as e:
             print(f"Failed to initialize layout parser: {e}")
-            self.layout = None
-            self._splash_duration = 2000
-            self._splash_fade = 500
-        
-        # Splash screen timing
-        self._splash_start_time = 0
-        self._splash_active = True
+            self.layouts = None
+
+    def attach_camera(self, camera: Any) -> Any:
+        """Use ``camera`` for the preview and the stats strip (for a camera created after the window)."""
+        self.camera = camera
+        camera.state.subscribe(self._on_camera_state_change)
+        return camera
+
+    def show_splash(self):
+        """Draw the splash screen right away; its display time starts now."""
+        self._splash_start_time = pygame.time.get_ticks()
+        self._render_splash_screen(1.0)  # Full opacity
+        pygame.display.flip()
+        self._splash_shown = True
+
+    def pump_splash(self):
+        """Keep the window responsive while startup work runs elsewhere (input stays queued)."""
+        pygame.event.pump()
+
+    def start_preview(self):
+        """Start the camera preview once; run() skips it when startup already did."""
+        if self.camera is None or self._preview_started:
+            return
+        print("Starting camera preview...")
+        self.camera.startPreview()
+        self._preview_started = True
+        print("Camera preview started.")
+
+    def warm_icons(self, layout: Optional[Any] = None) -> int:
+        """Decode every icon of the layout's icon folder ahead of the first menu (safe off the main thread).
+
+        Pass the parsed layout when this runs before ``init_layout()``.
+        """
+        layout = layout if layout is not None else self.layout
+        if layout:
+            icon_dir, icon_ext = layout.get_icon_path(), layout.get_icon_extension()
+        else:
+            icon_dir, icon_ext = "src/ui/icons", ".svg"
+        try:
+            names = [name for name in os.listdir(icon_dir) if name.endswith(icon_ext)]
+        except OSError:
+            return 0
+        for name in names:
+            icon_path = f"{icon_dir}/{name}"
+            if icon_path not in self._icon_sources:
+                try:
+                    self._icon_sources[icon_path] = pygame.image.load(icon_path)
+                except (pygame.error, FileNotFoundError):
+                    pass
+        return len(self._icon_sources)
+
+    def _read_icon(self, icon_path: str):
+        """The decoded icon file, from the warm-up when it already ran."""
+        icon = self._icon_sources.get(icon_path)
+        return icon if icon is not None else pygame.image.load(icon_path)
+
+    @property
+    def layout(self):
+        """The current parsed layout (replaced as a whole when main.xml is reloaded)."""
+        return self.layouts.parser if self.layouts is not None else None
+
+    def _warm_layout(self, parser):
+        """Compile the render plan and formatters of a reloaded layout on the watcher thread, before it is swapped in."""
+        parser.get_render_plan((self.width, self.height), self.fonts.get)
+        parser.formatters
+
+    def _apply_reloaded_layout(self):
+        self._layout_version = self.layouts.version
+        self.flash_duration = self.layout.get_flash_duration()
+        self._highlight_anim_duration = self.layout.get_named_animation_duration('highlight_slide')
+        self._stat_text.clear()  # Formatters may have changed
+        self.damage.invalidate()
 
     def run(self, controls_callback: Callable, buttons_class: Any):
         # Check video driver
@@ -116,34 +252,43 @@ class GUI:
                         pass
 
         # Initial draw to show splash screen immediately
-        self._splash_start_time = pygame.time.get_ticks()
-        self._render_splash_screen(1.0)  # Full opacity
-        pygame.display.flip()
+        if not self._splash_shown:
+            self.show_splash()
 
-        if self.camera:
-            print("Starting camera preview...")
-            self.camera.startPreview()
-            print("Camera preview started.")
+        self.start_preview()
+
+        # Reparse main.xml off the render thread when it is edited
+        if self.layouts and self.settings["display"].get("layout_watch", True):
+            self.layouts.add_warmup(self._warm_layout)
+            self.layouts.start_watching()
 
         # Initialize buttons
         buttons = buttons_class(self.settings)
         
         frame_count = 0
+        profiler = self.profiler
 
         while self.running:
-            self.layer.fill((0, 0, 0, 0))  # Clear layer
+            profiler.begin_frame()
             
-            # Check for layout updates every 60 frames (approx 1 sec)
+            # Pick up a layout the watcher thread swapped in since the last frame
             frame_count += 1
-            if frame_count % 60 == 0:
-                if self.layout:
-                    self.layout.check_for_updates()
+            if self.layouts and self.layouts.version != self._layout_version:
+                self._apply_reloaded_layout()
+            if self.settings["display"].get("render_stats", False) and frame_count % 300 == 0:
+                print(f"Render: {self.damage.average_percent():.1f}% of pixels pushed per frame "
+                      f"(last {self.damage.stats['last_percent']:.1f}%)")
+            profiler.lap("layout")
             
             # Handle hardware buttons
             buttons.listen(pygame)
 
             # Handle events
-            for event in pygame.event.get():
+            events = pygame.event.get()
+            if self._held_event is not None:
+                events.insert(0, self._held_event)
+                self._held_event = None
+            for event in events:
                 if event.type == pygame.QUIT:
                     self.running = False
                 
@@ -153,6 +298,15 @@ class GUI:
                     self.running = False
                     continue
 
+                if action == "profiler":
+                    profiler.toggle()
+                    self.damage.invalidate()  # Repaint what the graph covered
+                    continue
+                if action == "profiler_dump":
+                    if profiler.enabled:
+                        profiler.export(self.profiler_dir)
+                    continue
+
                 # Gallery Events
                 if self.gallery.active:
                     # Load gallery layout and check behavior
@@ -165,6 +319,10 @@ class GUI:
                 # Toggle Menu Visibility (Enter Key)
                 if action == "enter":
                     if not self.settings["display"]["showmenu"]:
+                        # Open at the setting selected in the stats bar
+                        if self.camera is not None:
+                            MenuController.focus_quick_stat(self.quick_menu_pos, self.menu_positions, self.menus,
+                                                            self.camera, self.settings, self.layout)
                         self.settings["display"]["showmenu"] = True
                         continue
                     # If menu is active, pass Enter to controls for selection
@@ -221,6 +379,10 @@ class GUI:
 
                 # Pass event to controls
                 controls_callback(pygame, event, self.menu_positions, self.menus, camera=self.camera, menu_active=self.settings["display"]["showmenu"], quick_menu_pos=self.quick_menu_pos, action=action)
+                if action is not None:
+                    # Selection, values or the quick stats selection may have changed
+                    self.damage.mark(*self.UI_REGIONS)
+            profiler.lap("input")
 
             # Detect Level Change for Animation
             current_level = self.menu_positions[3]
@@ -251,15 +413,23 @@ class GUI:
                         opacity = 1.0 - (fade_elapsed / self._splash_fade)
                     
                     self._render_splash_screen(opacity)
+                    profiler.lap("splash")
                     pygame.display.flip()
+                    profiler.lap("present")
+                    self.damage.invalidate()
                     self.clock.tick(self.settings["display"]["refreshrate"])
+                    profiler.lap("wait")
                     continue  # Skip normal rendering during splash
 
             # Render Gallery
             if self.gallery.active:
                 self.gallery.render(self.screen)
+                profiler.lap("gallery")
                 pygame.display.flip()
+                profiler.lap("present")
+                self.damage.invalidate()
                 self.clock.tick(30)
+                profiler.lap("wait")
                 continue
 
             # Ensure layout is loaded based on current menu selection (even if menu hidden)
@@ -269,22 +439,42 @@ class GUI:
                     current_menu_name = self.menus["menus"][current_menu_index]["name"]
                     if current_menu_name != "gallery":
                         self.layout.load_layout(current_menu_name)
+                if self.layout.current_layout_name != self._damage_layout_name:
+                    self._damage_layout_name = self.layout.current_layout_name
+                    self.damage.invalidate()
 
             # Apply any pending debounced settings changes (from quick stats)
+            pending = len(MenuController._pending_quick_change)
             MenuController.apply_pending_changes(self.camera)
+            if len(MenuController._pending_quick_change) != pending:
+                self.damage.mark(*self.UI_REGIONS)
+            profiler.lap("layout")
+
+            showmenu = self.settings["display"]["showmenu"]
+            if showmenu != self._damage_showmenu:
+                self._damage_showmenu = showmenu
+                self.damage.invalidate()
+            # Without a camera the menu is drawn on white instead of over the preview
+            self.damage.begin_frame((255, 255, 255, 255) if self.camera is None and showmenu else TRANSPARENT)
 
             # Render Menu
             if self.settings["display"]["showmenu"]:
                 self._render_menu()
+            else:
+                # Only a drawn menu finishes its animations; a hidden one must not keep the loop awake
+                self._text_scrolling = False
+                self._highlight_animations.clear()
+            profiler.lap("menu")
 
             # Render Stats / Overlay
             if self.camera:
                 self._render_camera_overlay()
             else:
-                self.screen.blit(self.layer, (0, 0))
+                self._composite_layer()
 
             # Render Flash Effect - use overlay config from XML
-            if pygame.time.get_ticks() - self.flash_start_time < self.flash_duration:
+            flashing = pygame.time.get_ticks() - self.flash_start_time < self.flash_duration
+            if flashing:
                 flash_color = (255, 255, 255)  # Default
                 if self.layout:
                     flash_overlay = self.layout.get_overlay('flash_effect')
@@ -292,6 +482,7 @@ class GUI:
                         bg_color = flash_overlay['containers'][0].get('bg_color', '#FFFFFF')
                         flash_color = self._parse_color(bg_color)
                 self.screen.fill(flash_color)
+                self._frame_rects = None
 
             # Handle Timer Logic & Rendering
             if self.timer_active:
@@ -349,17 +540,139 @@ class GUI:
                 
                 # Render Timelapse Status - use overlay config from XML
                 self._render_overlay('timelapse_status', {'timelapse_count': self.timelapse_count})
-
-            pygame.display.flip()
-            self.clock.tick(self.settings["display"]["refreshrate"])
+            profiler.lap("effects")
+
+            if profiler.enabled and profiler.show_graph:
+                self._render_profiler()
+                profiler.lap("profiler")
+
+            self.damage.present(self._frame_rects)
+            profiler.lap("present")
+            if self.first_preview_ms is None:
+                self._note_first_preview()
+            if flashing:
+                # The flash covered the whole screen, so the next frame must repaint it
+                self.damage.invalidate()
+
+            if self._is_idle():
+                self._wait_while_idle(buttons)
+            else:
+                self.telemetry["idle"] = False
+                self.clock.tick(self.settings["display"]["refreshrate"])
+            profiler.lap("wait")
+            self._update_telemetry()
 
         self._cleanup()
 
-    def _render_menu(self):
-        # Determine background based on camera overlay
+    def _is_idle(self) -> bool:
+        """True when the next frame would look the same as this one."""
+        now = pygame.time.get_ticks()
+        if self._splash_active or self.gallery.active:
+            return False
+        if self.timer_active or self.timelapse_active:
+            return False
+        if self._highlight_animations or self._stat_animations or self._text_scrolling:
+            return False
+        if now - self.transition_start < self.transition_duration:
+            return False
+        if now - self.flash_start_time < self.flash_duration:
+            return False
+        if MenuController._pending_quick_change or self._camera_state_changed:
+            return False
+        if self.camera and self.camera.preview_needs_redraw():
+            return False
+        return True
+
+    def _wait_while_idle(self, buttons):
+        """Sleep until input arrives, polling hardware buttons, for at most idle_refresh_ms."""
+        self.telemetry["idle"] = True
+        start = time.perf_counter()
+        deadline = start + self.idle_refresh_ms / 1000.0
+        poll_ms = self.idle_poll_ms if buttons.buttons else self.idle_refresh_ms
+        while self.running:
+            remaining_ms = int((deadline - time.perf_counter()) * 1000)
+            if remaining_ms <= 0:
+                break
+            event = pygame.event.wait(min(poll_ms, remaining_ms))
+            if event.type != pygame.NOEVENT:
+                self._held_event = event
+                break
+            buttons.listen(pygame)
+            if pygame.event.peek() or self._camera_state_changed:
+                break
+        self._telemetry_idle += time.perf_counter() - start
+        # Keep the clock from reporting the wait as one long frame
+        self.clock.tick()
+
+    def _on_camera_state_change(self, key, old, new):
+        self._camera_state_changed = True
+        self.damage.mark("stats")
+
+    def _camera_values(self):
+        """Snapshot of the camera's cached settings; values without a setter are re-read
+        every state_refresh_interval seconds, nothing else touches the camera."""
+        now = time.monotonic()
+        if now - self._state_refresh_time >= self.state_refresh_interval:
+            self._state_refresh_time = now
+            self.camera.refresh_state(self.camera.VOLATILE_STATE)
+        values = self.camera.state_snapshot()[1]
+        self._camera_state_changed = False
+        return values
+
+    def _stat_text_for(self, key: str, value) -> str:
+        """Formatted stat text, recomputed only when the raw value changed."""
+        cached = self._stat_text.get(key)
+        if cached is not None and cached[0] == value:
+            return cached[1]
+        text = self._format_stat_value(key, value)
+        self._stat_text[key] = (value, text)
+        return text
+
+    def _note_first_preview(self):
+        """Log the time from startup to the first presented frame that shows the camera preview."""
         if self.camera is None:
-            self.layer.fill((255, 255, 255, 255))
-        
+            return
+        preview = self.camera.preview_stats()
+        # Hardware previews keep no counters and show as soon as the UI is up
+        if preview and not preview.get("frames"):
+            return
+        self.first_preview_ms = (time.perf_counter() - self.started_at) * 1000
+        self.telemetry["first_preview_ms"] = self.first_preview_ms
+        print(f"Time to first preview: {self.first_preview_ms:.0f} ms")
+
+    def _update_telemetry(self):
+        """Once a second, compute rendered fps, preview capture fps, process CPU use and time spent idle."""
+        self._telemetry_frames += 1
+        now = time.perf_counter()
+        elapsed = now - self._telemetry_start
+        if elapsed < 1.0:
+            return
+        cpu = time.process_time()
+        self.telemetry["fps"] = self._telemetry_frames / elapsed
+        self.telemetry["cpu_percent"] = 100.0 * (cpu - self._telemetry_cpu) / elapsed
+        self.telemetry["idle_percent"] = 100.0 * self._telemetry_idle / elapsed
+        # The preview is captured on its own thread, so its rate is independent of the UI's
+        preview = self.camera.preview_stats() if self.camera else {}
+        self.telemetry["preview_fps"] = preview.get("fps", 0.0) if preview else 0.0
+        # Getter calls that reached the camera in the last interval (only periodic refreshes)
+        reads = self.camera.state.stats["reads"] if self.camera else 0
+        self.telemetry["camera_reads"] = reads - self._telemetry_reads
+        self._telemetry_reads = reads
+        # Setting writes applied by the camera's command worker, and those merged into a later write
+        if self.camera:
+            self.telemetry["camera_writes"] = self.camera.commands.stats["applied"]
+            self.telemetry["camera_coalesced"] = self.camera.commands.stats["coalesced"]
+        self._telemetry_start = now
+        self._telemetry_cpu = cpu
+        self._telemetry_frames = 0
+        self._telemetry_idle = 0.0
+        if self.settings["display"].get("render_stats", False):
+            print(f"Loop: {self.telemetry['fps']:.1f} fps (preview {self.telemetry['preview_fps']:.1f} fps), "
+                  f"{self.telemetry['cpu_percent']:.1f}% CPU, {self.telemetry['idle_percent']:.0f}% idle, "
+                  f"{self.telemetry['camera_reads']} camera reads, {self.telemetry['camera_writes']} writes "
+                  f"({self.telemetry['camera_coalesced']} coalesced)")
+
+    def _render_menu(self):
         # Determine current menu name and load layout
         current_menu_index = self.menu_positions[0]
         if 0 <= current_menu_index < len(self.menus["menus"]):
@@ -368,12 +681,13 @@ class GUI:
             if self.layout and current_menu_name != "gallery":
                 self.layout.load_layout(current_menu_name)
 
-        # Get widths from layout config
-        layout_widths = self.layout.get_widths() if self.layout else {
+        # Get widths from the compiled layout
+        layout_widths = self._render_plan().widths if self.layout else {
             'level_0': 200, 'level_1': 260, 'level_2': 260, 'collapsed': 60
         }
 
         # Dynamic Layout Calculation with Animation
+        self._text_scrolling = False
         current_level = self.menu_positions[3]
         
         # Calculate Animation Progress
@@ -382,6 +696,7 @@ class GUI:
             t = (now - self.transition_start) / self.transition_duration
             # Simple ease-out
             t = 1 - (1 - t) * (1 - t)
+            self.damage.mark(*self.MENU_COLUMNS)  # Column widths keep changing
         else:
             t = 1.0
 
@@ -423,10 +738,11 @@ class GUI:
         l1_collapsed = self.layout.should_collapse_column('level_1', current_level) if self.layout else (current_level > 1)
 
         x_cursor = 0
+        columns = []  # (container_id, items, selected_index, options), drawn once all are placed
 
         # --- Level 0 (Main Menu) ---
-        self._render_container("level_0", self.menus["menus"], self.menu_positions[0], 
-                               override_x=x_cursor, override_width=l0_width, collapsed=l0_collapsed)
+        columns.append(("level_0", self.menus["menus"], self.menu_positions[0],
+                        dict(override_x=x_cursor, override_width=l0_width, collapsed=l0_collapsed)))
         x_cursor += l0_width
 
         # --- Level 1 (Submenu) ---
@@ -435,8 +751,8 @@ class GUI:
             
             # Only render if width > 0
             if l1_width > 0:
-                self._render_container("level_1", submenu_items, self.menu_positions[1],
-                                       override_x=x_cursor, override_width=l1_width, collapsed=l1_collapsed)
+                columns.append(("level_1", submenu_items, self.menu_positions[1],
+                                dict(override_x=x_cursor, override_width=l1_width, collapsed=l1_collapsed)))
                 x_cursor += l1_width
 
                 # --- Level 2 (Options/Values) ---
@@ -451,6 +767,7 @@ class GUI:
                         
                         # Get current value for "Old : New" display
                         current_val = option.get("_original_value", option.get("value", None))
+                        level_2 = dict(override_x=x_cursor, override_width=l2_width, current_value=current_val)
 
                         value_items = []
                         if option["type"] == "list":
@@ -461,8 +778,7 @@ class GUI:
                                 else:
                                     value_items.append({"name": str(opt), "displayname": str(opt), "value": opt})
                             
-                            self._render_container("level_2", value_items, self.menu_positions[2],
-                                                   override_x=x_cursor, override_width=l2_width, current_value=current_val)
+                            columns.append(("level_2", value_items, self.menu_positions[2], level_2))
                         elif option["type"] == "range":
                             value_items = [{
                                 "name": str(option["value"]), 
@@ -471,7 +787,30 @@ class GUI:
                                 "min": option["options"]["min"],
                                 "max": option["options"]["max"]
                             }]
-                            self._render_container("level_2", value_items, 0, override_x=x_cursor, override_width=l2_width, current_value=current_val)
+                            columns.append(("level_2", value_items, 0, level_2))
+
+        # Clear where columns moved from or closed first, so drawing one never erases another
+        rects = dict.fromkeys(self.MENU_COLUMNS)
+        for container_id, _, _, options in columns:
+            rects[container_id] = self._container_rect(container_id, options["override_x"], options["override_width"])
+        self.damage.place(self.layer, rects)
+        for container_id, items, selected_index, options in columns:
+            self._render_container(container_id, items, selected_index, **options)
+
+    def _render_plan(self):
+        """The current mode's compiled layout (resolved rects, colors, fonts)."""
+        return self.layout.get_render_plan((self.width, self.height), self.fonts.get)
+
+    def _container_rect(self, container_id: str, override_x: Optional[int] = None,
+                        override_width: Optional[int] = None) -> Optional[Tuple[int, int, int, int]]:
+        """Where a menu column is drawn, or None when the layout has no such container."""
+        container = self._render_plan().containers.get(container_id) if self.layout else None
+        if not container:
+            return None
+        x, y, w, h = container.rect
+        if override_x is not None: x = override_x
+        if override_width is not None: w = override_width
+        return x, y, w, h
 
     def _render_container(self, container_id: str, items: List[Dict[str, Any]], selected_index: int, 
                           override_x: Optional[int] = None, override_width: Optional[int] = None, 
@@ -479,39 +818,33 @@ class GUI:
         if not self.layout:
             return
 
-        container = self.layout.get_element_by_id(container_id)
+        container = self._render_plan().containers.get(container_id)
         if not container:
             return
 
-        # Parse container attributes
-        x = self._parse_dimension(container.get("x", "0"), self.width)
-        y = self._parse_dimension(container.get("y", "0"), self.height)
-        w = self._parse_dimension(container.get("width", "100"), self.width)
-        h = self._parse_dimension(container.get("height", "100"), self.height)
+        x, y, w, h = container.rect
         
         # Apply overrides
         if override_x is not None: x = override_x
         if override_width is not None: w = override_width
+
+        # Clean columns keep last frame's pixels on the layer
+        if not self.damage.begin_region(self.layer, container_id, (x, y, w, h)):
+            return
         
-        bg_color = self._parse_color(container.get("bg_color", "#00000000"))
-        selected_color = self._parse_color(container.get("selected_color", "#FFFFFF"))
-        unselected_color = self._parse_color(container.get("unselected_color", "#AAAAAA"))
-        selection_bg_color = self._parse_color(container.get("selection_bg_color", "#FFFFFF33"))
+        bg_color = container.bg_color
+        selected_color = container.selected_color
+        unselected_color = container.unselected_color
+        selection_bg_color = container.selection_bg_color
         
-        font_size = int(container.get("font_size", "20"))
-        item_height = int(container.get("item_height", "30"))
-        padding = int(container.get("padding", "5"))
-        orientation = container.get("orientation", "vertical")
+        item_height = container.item_height
+        padding = container.padding
+        orientation = container.orientation
+        font = container.font
 
         # Draw background
         pygame.draw.rect(self.layer, bg_color, (x, y, w, h))
 
-        # Setup font
-        if font_size == self.settings["display"]["fontsize"]:
-            font = self.font
-        else:
-            font = pygame.font.Font('freesansbold.ttf', font_size)
-
         # Draw items
         current_x = x + padding
         current_y = y + padding
@@ -557,6 +890,7 @@ class GUI:
                 # Ease-out cubic for smooth deceleration
                 t = 1 - (1 - t) ** 3
                 highlight_y_offset = anim['from_index'] + (anim['to_index'] - anim['from_index']) * t
+                self.damage.mark(container_id)
             else:
                 # Animation complete - clean up
                 del self._highlight_animations[container_id]
@@ -611,7 +945,7 @@ class GUI:
                         icon_loaded = True
                 elif os.path.exists(icon_path):
                     try:
-                        icon = pygame.image.load(icon_path)
+                        icon = self._read_icon(icon_path)
                         # Scale icon to fit within item_height (with some padding)
                         icon_size = int(item_height * 0.7)
                         icon = pygame.transform.scale(icon, (icon_size, icon_size))
@@ -631,7 +965,7 @@ class GUI:
                 
                 if not icon_loaded:
                     short_name = display_name[0] if display_name else "?"
-                    text_surf = font.render(short_name, True, color)
+                    text_surf = self.text_cache.render(font, short_name, True, color)
                     text_rect = text_surf.get_rect(center=(x + w//2, current_y + (i * item_height) + item_height//2))
                     self.layer.blit(text_surf, text_rect)
             else:
@@ -669,7 +1003,7 @@ class GUI:
                         icon_width = icon.get_width() + 10
                 elif os.path.exists(icon_path):
                     try:
-                        icon = pygame.image.load(icon_path)
+                        icon = self._read_icon(icon_path)
                         icon_size = int(item_height * 0.6)
                         icon = pygame.transform.scale(icon, (icon_size, icon_size))
                         self._icon_cache[icon_path] = icon
@@ -701,7 +1035,7 @@ class GUI:
                          if current_value is not None and str(item.get("value")) == str(current_value):
                              name_text += " *"
 
-                text_surf = font.render(name_text, True, color)
+                text_surf = self.text_cache.render(font, name_text, True, color)
                 text_rect = text_surf.get_rect()
                 
                 # Position text
@@ -716,14 +1050,12 @@ class GUI:
                     draw_x = current_x + icon_width
                     
                     if overflow > 0 and is_selected:
-                        # Get scroll config from layout
-                        if self.layout:
-                            scroll_config = self.layout.get_text_scroll_config()
-                            scroll_speed = scroll_config.get('speed', 0.05)
-                            pause_time = scroll_config.get('pause_ms', 1000)
-                        else:
-                            scroll_speed = 0.05
-                            pause_time = 1000
+                        self._text_scrolling = True
+                        self.damage.mark(container_id)
+                        # Scroll config comes from the compiled layout
+                        plan = self._render_plan()
+                        scroll_speed = plan.scroll_speed
+                        pause_time = plan.scroll_pause_ms
                         
                         scroll_time = overflow / scroll_speed
                         total_cycle_time = scroll_time + (pause_time * 2)
@@ -741,7 +1073,7 @@ class GUI:
 
                     # Draw Chevron
                     if "options" in item:
-                        chevron_surf = font.render(">", True, color)
+                        chevron_surf = self.text_cache.render(font, ">", True, color)
                         chevron_rect = chevron_surf.get_rect(midright=(x + w - 10, dest_y + text_rect.height // 2))
                         chevron_bg_rect = chevron_rect.inflate(5, 5)
                         pygame.draw.rect(self.layer, bg_color, chevron_bg_rect)
@@ -749,12 +1081,9 @@ class GUI:
 
                 else: # horizontal
                     self.layer.blit(text_surf, (current_x, current_y))
-                    current_x += text_rect.width + int(container.get("item_spacing", "20"))
-        
-        # Reset clip
-        self.layer.set_clip(None)
+                    current_x += text_rect.width + container.item_spacing
         
-        # Render Slider for Range Types (Level 2)
+        # Render Slider for Range Types (Level 2), still clipped: the column only clears its own rect
         if container_id == "level_2" and len(items) == 1 and items[0].get("is_range"):
             item = items[0]
             val = item["value"]
@@ -780,30 +1109,21 @@ class GUI:
             pygame.draw.rect(self.layer, selected_color, (handle_x, bar_y - 5, handle_w, bar_h + 10))
 
             # Draw Min/Max
-            min_surf = font.render(str(min_val), True, unselected_color)
-            max_surf = font.render(str(max_val), True, unselected_color)
+            min_surf = self.text_cache.render(font, str(min_val), True, unselected_color)
+            max_surf = self.text_cache.render(font, str(max_val), True, unselected_color)
             
             # Position Min/Max below slider
             self.layer.blit(min_surf, (bar_x, bar_y + 20))
             self.layer.blit(max_surf, (bar_x + bar_w - max_surf.get_width(), bar_y + 20))
 
+        # Reset clip
+        self.layer.set_clip(None)
+
     def _parse_dimension(self, value: str, total_size: int) -> int:
-        value = str(value)
-        if value.endswith("%"):
-            return int(total_size * float(value.strip("%")) / 100)
-        if value == "center":
-            return total_size // 2
-        if value == "right" or value == "bottom":
-            return total_size # Needs context of object size to be useful, simplified here
-        return int(value)
+        return parse_dimension(value, total_size)
 
     def _parse_color(self, hex_string: str) -> tuple:
-        hex_string = hex_string.lstrip('#')
-        if len(hex_string) == 6:
-            return tuple(int(hex_string[i:i+2], 16) for i in (0, 2, 4))
-        elif len(hex_string) == 8:
-            return tuple(int(hex_string[i:i+2], 16) for i in (0, 2, 4, 6))
-        return (255, 255, 255)
+        return parse_color(hex_string)
 
     def _render_splash_screen(self, opacity: float = 1.0):
         """Render the splash screen with logo and text."""
@@ -841,14 +1161,9 @@ class GUI:
             self.screen.blit(logo, logo_rect)
         
         # Title: "Pi Camera GUI"
-        try:
-            title_font = pygame.font.Font('freesansbold.ttf', 28)
-            subtitle_font = pygame.font.Font('freesansbold.ttf', 14)
-            version_font = pygame.font.Font('freesansbold.ttf', 12)
-        except:
-            title_font = pygame.font.Font(None, 28)
-            subtitle_font = pygame.font.Font(None, 14)
-            version_font = pygame.font.Font(None, 12)
+        title_font = self.fonts.get(28)
+        subtitle_font = self.fonts.get(14)
+        version_font = self.fonts.get(12)
         
         # Title color: Cyan (#00FFFF)
         title_color = (0, 255, 255)
@@ -863,19 +1178,19 @@ class GUI:
         
         # Title
         title_y = int(self.height * 0.58)
-        title_surf = title_font.render("Pi Camera GUI", True, title_color)
+        title_surf = self.text_cache.render(title_font, "Pi Camera GUI", True, title_color)
         title_rect = title_surf.get_rect(center=(center_x, title_y))
         self.screen.blit(title_surf, title_rect)
         
         # Subtitle
         subtitle_y = int(self.height * 0.68)
-        subtitle_surf = subtitle_font.render("Snap. Tweak. Create.", True, subtitle_color)
+        subtitle_surf = self.text_cache.render(subtitle_font, "Snap. Tweak. Create.", True, subtitle_color)
         subtitle_rect = subtitle_surf.get_rect(center=(center_x, subtitle_y))
         self.screen.blit(subtitle_surf, subtitle_rect)
         
         # Version
         version_y = int(self.height * 0.90)
-        version_surf = version_font.render("v1.0", True, version_color)
+        version_surf = self.text_cache.render(version_font, "v1.0", True, version_color)
         version_rect = version_surf.get_rect(center=(center_x, version_y))
         self.screen.blit(version_surf, version_rect)
 
@@ -918,12 +1233,8 @@ class GUI:
         elif overlay_name == 'timer_countdown':
             text = str(data.get('countdown', ''))
         
-        # Create font at specified size and render
-        try:
-            font = pygame.font.Font('freesansbold.ttf', font_size)
-        except:
-            font = pygame.font.Font(None, font_size)
-        text_surf = font.render(text, True, color)
+        font = self.fonts.get(font_size)
+        text_surf = self.text_cache.render(font, text, True, color)
         
         # Center if position is percentage-based or centered flag is set
         centered = overlay.get('centered', False)
@@ -934,14 +1245,16 @@ class GUI:
         
         # Render shadow if enabled
         if has_shadow:
-            shadow_surf = font.render(text, True, shadow_color)
+            shadow_surf = self.text_cache.render(font, text, True, shadow_color)
             self.screen.blit(shadow_surf, (x + shadow_offset, y + shadow_offset))
+            self.damage.add((x + shadow_offset, y + shadow_offset, shadow_surf.get_width(), shadow_surf.get_height()))
         
         self.screen.blit(text_surf, (x, y))
+        self.damage.add((x, y, text_surf.get_width(), text_surf.get_height()))
 
     def _render_camera_overlay(self):
         # Stats
-        directory = self.camera.directory()
+        values = self._camera_values()
         
         # Get current camera mode from settings
         current_mode = self.settings.get("mode", {}).get("cameramode", "auto")
@@ -961,64 +1274,44 @@ class GUI:
         left_stats = stats_config.get("left", ["mode", "iso", "shutter", "awb", "exposure"])
         right_stats = stats_config.get("right", ["resolution", "filesize", "remaining"])
         
-        # Use stats container from layout
+        # Use stats container from the compiled layout
         if self.layout:
-            container = self.layout.get_element_by_id("stats")
+            plan = self._render_plan()
+            container = plan.containers.get("stats")
             if container:
-                # Position and dimensions
-                x = self._parse_dimension(container.get("x", "0"), self.width)
-                y = self._parse_dimension(container.get("y", "0"), self.height)
-                w = self._parse_dimension(container.get("width", "100%"), self.width)
-                h = self._parse_dimension(container.get("height", "30"), self.height)
-                
-                # Colors
-                bg_color = self._parse_color(container.get("bg_color", "#00000088"))
-                color = self._parse_color(container.get("color", "#FFFFFF"))
-                label_color = self._parse_color(container.get("label_color", "#B4B4B4"))
-                
-                # Typography
-                font_size = int(container.get("font_size", 16))
-                label_truncate = int(container.get("label_truncate", 3))
-                
-                # Icons
-                icon_size = int(container.get("icon_size", 20))
-                icon_gap = int(container.get("icon_gap", 5))
-                
-                # Spacing
-                spacing = int(container.get("spacing", 15))
-                padding = int(container.get("padding", 15))
-                padding_right = int(container.get("padding_right", padding))
-                
-                # Selection styling
-                selection_alpha = int(container.get("selection_alpha", 60))
-                selection_border = int(container.get("selection_border_width", 1))
-                selection_pad_x = int(container.get("selection_padding_x", 5))
-                selection_pad_y = int(container.get("selection_padding_y", 3))
-                
-                # Animation - get from layout's named animation or use default
-                value_transition = container.get("value_transition", "stat_change")
-                if self.layout and value_transition:
-                    anim_config = self.layout.get_animation(value_transition)
-                    self._stat_anim_duration = anim_config.get('duration', 100)
-                
+                x, y, w, h = container.rect
+                bg_color = container.bg_color
+                color = container.color
+                label_color = container.label_color
+                label_truncate = container.label_truncate
+                icon_size = container.icon_size
+                icon_gap = container.icon_gap
+                spacing = container.spacing
+                padding = container.padding
+                padding_right = container.padding_right
+                selection_alpha = container.selection_alpha
+                selection_border = container.selection_border
+                selection_pad_x = container.selection_pad_x
+                selection_pad_y = container.selection_pad_y
+                if container.value_transition_ms is not None:
+                    self._stat_anim_duration = container.value_transition_ms
+
+                # Redrawn when a camera value, the quick stats selection or a column under it changed
+                if not self.damage.begin_region(self.layer, "stats", (x, y, w, h)):
+                    self._composite_layer()
+                    return
+                # Value transitions slide in from outside the strip
+                self.layer.set_clip(pygame.Rect(x, y, w, h))
+
                 # Draw background
                 pygame.draw.rect(self.layer, bg_color, (x, y, w, h))
                 
                 # Draw stats with icons
                 current_x = x + padding
                 center_y = y + h // 2
-                font = pygame.font.Font('freesansbold.ttf', font_size)
-                
-                # Get mode colors from layout parser or fallback
-                if self.layout:
-                    mode_colors_config = self.layout.get_mode_colors()
-                else:
-                    mode_colors_config = {
-                        "auto": "#00FFFF",
-                        "manual": "#FFC864",
-                        "timelapse": "#64FF64"
-                    }
-                selected_color = self._parse_color(self.settings.get("theme", {}).get("colors", {}).get("selected", "#00FFFF"))
+                font = container.font
+                mode_colors = plan.mode_colors
+                selected_color = plan.selected_color
                 
                 # First pass: calculate positions for all renderable stats
                 stat_positions = []  # List of (key, start_x, end_x, is_cameramode, render_color)
@@ -1027,10 +1320,10 @@ class GUI:
                 
                 for key in quick_stats:
                     if key == "cameramode":
-                        mode_color = self._parse_color(mode_colors_config.get(current_mode, "#FFFFFF"))
+                        mode_color = mode_colors.get(current_mode, (255, 255, 255))
                         mode_display = current_mode.upper()[:4]
                         new_value = f"[{mode_display}]"
-                        mode_surf = font.render(new_value, True, mode_color)
+                        mode_surf = self.text_cache.render(font, new_value, True, mode_color)
                         
                         # Check for value change and start animation
                         old_value = self._prev_stat_values.get(key)
@@ -1055,10 +1348,9 @@ class GUI:
                             "value": new_value
                         })
                         temp_x += mode_surf.get_width() + spacing + 5
-                    elif key in directory:
+                    elif key in values:
                         start_x = temp_x
-                        raw_value = directory[key]()
-                        value = self._format_stat_value(key, raw_value)
+                        value = self._stat_text_for(key, values[key])
                         
                         # Check for value change and start animation
                         old_value = self._prev_stat_values.get(key)
@@ -1083,11 +1375,11 @@ class GUI:
                         if icon:
                             temp_x += icon_size + icon_gap
                         else:
-                            label_surf = font.render(key[:label_truncate].upper(), True, label_color)
+                            label_surf = self.text_cache.render(font, key[:label_truncate].upper(), True, label_color)
                             temp_x += label_surf.get_width() + icon_gap
                         
                         # Calculate value width
-                        val_surf = font.render(value, True, color)
+                        val_surf = self.text_cache.render(font, value, True, color)
                         end_x = temp_x + val_surf.get_width()
                         
                         stat_positions.append({
@@ -1159,7 +1451,7 @@ class GUI:
                             self.layer.blit(stat["icon"], icon_rect)
                             render_x += icon_size + icon_gap
                         else:
-                            label_surf = font.render(stat["key"][:label_truncate].upper(), True, label_color)
+                            label_surf = self.text_cache.render(font, stat["key"][:label_truncate].upper(), True, label_color)
                             label_rect = label_surf.get_rect(midleft=(render_x, center_y))
                             self.layer.blit(label_surf, label_rect)
                             render_x += label_surf.get_width() + icon_gap
@@ -1172,18 +1464,18 @@ class GUI:
                                 anim_progress, anim["direction"], is_midleft=True
                             )
                         else:
-                            val_surf = font.render(stat["value"], True, color)
+                            val_surf = self.text_cache.render(font, stat["value"], True, color)
                             val_rect = val_surf.get_rect(midleft=(render_x, center_y))
                             self.layer.blit(val_surf, val_rect)
 
                 # Render Right Stats (Right Justified)
                 current_x = x + w - padding_right
                 for key in reversed(right_stats):
-                    if key in directory:
-                        value = self._format_stat_value(key, directory[key]())
+                    if key in values:
+                        value = self._stat_text_for(key, values[key])
                         
                         # Calculate width first to position correctly
-                        val_surf = font.render(value, True, color)
+                        val_surf = self.text_cache.render(font, value, True, color)
                         val_width = val_surf.get_width()
                         
                         icon_width = icon_size + icon_gap
@@ -1204,19 +1496,53 @@ class GUI:
                         
                         current_x -= (item_width + spacing)
 
+                self.layer.set_clip(None)
+                if self._stat_animations:
+                    self.damage.mark("stats")
+
                 # Delegate rendering to camera
-                self.camera.render(self.layer, self.screen)
+                self._composite_layer()
                 return
 
         # Fallback if no layout
-        stats_details = " ".join([f"{k}:{v()}" for k, v in directory.items()])
+        stats_details = " ".join([f"{k}:{v}" for k, v in values.items()])
         stats_surf = self._generate_text(stats_details, (255, 255, 255), (0, 0, 0), font=self.stats_font)
         stats_rect = stats_surf.get_rect()
         pos = (self.width / 2 - stats_rect.width / 2, self.height - stats_rect.height)
-        self.layer.blit(stats_surf, pos)
+        if self.damage.begin_region(self.layer, "stats", pos + stats_rect.size):
+            self.layer.blit(stats_surf, pos)
 
         # Delegate rendering to camera
-        self.camera.render(self.layer, self.screen)
+        self._composite_layer()
+
+    def _composite_layer(self):
+        """Put the changed parts of the UI layer on screen, via the camera when there is one."""
+        self.profiler.lap("overlay")
+        rects = self.damage.end_frame(self.layer)
+        if self.camera:
+            self.profiler.lap("composite")
+            result = self.camera.render(self.layer, self.screen, rects)
+            # Timed on its own: preview scaling and the hardware overlay are the camera's cost, not the UI's
+            self.profiler.lap("camera")
+            # Cameras return the display rects they changed, or None for the whole screen
+            self._frame_rects = result if isinstance(result, list) else None
+        else:
+            if rects is None:
+                self.screen.blit(self.layer, (0, 0))
+            else:
+                for rect in rects:
+                    self.screen.blit(self.layer, rect, rect)
+            self._frame_rects = rects
+            self.profiler.lap("composite")
+
+    def _render_profiler(self):
+        """Draw the frame profiler graph in the top right corner of the screen."""
+        w = min(self.width // 2, 480)
+        h = min(self.height // 2, 320)
+        rect = (self.width - w, 0, w, h)
+        budget_ms = 1000.0 / max(1, self.settings["display"]["refreshrate"])
+        self.profiler.draw(self.screen, rect, self.stats_font, budget_ms)
+        self.damage.add(rect)
 
     def _load_icon(self, key: str, size: int = 24):
         """Load and cache an icon by key name."""
@@ -1245,7 +1571,7 @@ class GUI:
         
         if os.path.exists(icon_path):
             try:
-                icon = pygame.image.load(icon_path)
+                icon = self._read_icon(icon_path)
                 icon = pygame.transform.scale(icon, (size, size))
                 self._icon_cache[cache_key] = icon
                 return icon
@@ -1272,12 +1598,12 @@ class GUI:
         offset = int(max_offset * eased)
         
         # Old value scrolls out (in direction)
-        old_surf = font.render(old_value, True, color)
+        old_surf = self.text_cache.render(font, old_value, True, color).copy()
         old_alpha = int(255 * (1 - eased))
         old_surf.set_alpha(old_alpha)
         
         # New value scrolls in (from opposite direction)
-        new_surf = font.render(new_value, True, color)
+        new_surf = self.text_cache.render(font, new_value, True, color).copy()
         new_alpha = int(255 * eased)
         new_surf.set_alpha(new_alpha)
         
@@ -1304,51 +1630,14 @@ class GUI:
 
     def _format_stat_value(self, key: str, value) -> str:
         """Format stat values for display using XML-defined formatters."""
-        # Use layout's formatter if available
         if self.layout:
-            formatted = self.layout.format_value(key, value)
-            # If formatter handled it (not just str(value)), return it
-            formatter = self.layout.get_formatter(key)
-            if formatter:
-                return formatted
-        
-        # Fallback formatting for common types
-        if key == "shutter":
-            if isinstance(value, (int, float)) and value > 0:
-                if value >= 1000000:
-                    return f"{value / 1000000:.1f}s"
-                elif value >= 1000:
-                    fraction = 1000000 / value
-                    if fraction >= 1:
-                        return f"1/{int(fraction)}"
-                    return f"{value / 1000:.0f}ms"
-                else:
-                    return f"{value}µs"
-            return str(value)
-        
-        elif key == "iso":
-            return str(value)
-        
-        elif key == "resolution":
-            if isinstance(value, str) and "," in value:
-                parts = value.split(",")
-                return f"{parts[0]}×{parts[1]}"
-            elif isinstance(value, tuple):
-                return f"{value[0]}×{value[1]}"
-            return str(value)
-        
-        elif key == "exposurecomp":
-            if isinstance(value, (int, float)):
-                sign = "+" if value > 0 else ""
-                return f"{sign}{value}"
-            return str(value)
-        
-        return str(value)
+            return self.layout.formatters.format(key, value)
+        return self._default_formatters.format(key, value)
 
     def _generate_text(self, text: str, fg: tuple, bg: tuple, font=None):
         if font is None:
             font = self.font
-        return font.render(str(text).upper(), False, fg, bg)
+        return self.text_cache.render(font, str(text).upper(), False, fg, bg)
 
     def _get_action_from_event(self, event):
         if event.type != pygame.KEYDOWN:
@@ -1368,6 +1657,11 @@ class GUI:
         return None
 
     def _cleanup(self):
+        if self.layouts:
+            self.layouts.stop_watching()
+            self.layouts.remove_warmup(self._warm_layout)
+        if self.profiler.enabled and self.profiler.frames:
+            self.profiler.export(self.profiler_dir)
         if self.camera:
             self.camera.stopPreview()
             self.camera.closeCamera()
@@ -1,12 +1,39 @@
 import xml.etree.ElementTree as ET
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable, Tuple
+import hashlib
+import json
 import os
+import pickle
+
+from src.ui.formatters import DEFAULT_FORMATTERS, ValueFormatters
+from src.ui.render_plan import (
+    MENU_DEFAULTS, STATS_DEFAULTS, RenderPlan, compile_container, freeze, parse_color
+)
+
+# Bump when the parsed model changes shape so old cache files are ignored
+LAYOUT_CACHE_VERSION = 1
+
+# Theme config sections that parsing reads (theme variables, default sizes and durations)
+THEME_SECTIONS = ("theme", "colors", "sizes", "display")
+
 
 class LayoutParser:
-    def __init__(self, theme_config: Dict[str, Any] = None, layout_dir: str = "src/ui/layouts"):
+    # Parsed state written to and restored from the layout cache file
+    CACHED_STATE = (
+        "_id_cache", "_config_cache", "_style_cache", "_animation_cache", "_behavior_cache",
+        "_text_style_cache", "_border_style_cache", "_menu_cache", "_stats_cache", "_global_config",
+        "_layouts_cache", "_mode_overrides_cache", "_component_cache", "_slots_cache",
+        "_overlays_cache", "_formatters_cache",
+    )
+
+    def __init__(self, theme_config: Dict[str, Any] = None, layout_dir: str = "src/ui/layouts",
+                 cache_file: Optional[str] = None):
         self.layout_dir = layout_dir
         self.theme_config = theme_config or {}
-        self.main_layout = None  # The unified main.xml root
+        self.cache_file = cache_file  # Serialized parse of main.xml, None = always parse
+        self.loaded_from_cache = False
+        self._main_layout = None  # The unified main.xml root, parsed on demand after a cache hit
+        self._unified = False  # main.xml was loaded (parsed or from the cache)
         self.file_timestamp = 0
         self.current_mode_name = "default"
         self._id_cache: Dict[str, Dict[str, Any]] = {}  # Cache per mode
@@ -26,6 +53,10 @@ class LayoutParser:
         self._slots_cache: Dict[str, Dict[str, Any]] = {}  # Data slot definitions
         self._overlays_cache: Dict[str, Dict[str, Any]] = {}  # Overlay definitions
         self._formatters_cache: Dict[str, Dict[str, Any]] = {}  # Value formatters
+        self._formatters: Optional[ValueFormatters] = None  # ...compiled, built on first use
+        self._plan_cache: Dict[Tuple[str, Tuple[int, int]], RenderPlan] = {}  # Compiled render plans
+        self._plan_fonts: Optional[Callable] = None
+        self.plan_stats = {"compiled": 0, "hits": 0}
         
         # For backwards compatibility - track "old" layouts too
         self.layouts: Dict[str, Any] = {}
@@ -35,19 +66,88 @@ class LayoutParser:
         # Try to load unified main.xml first, fallback to individual files
         self._load_main_layout()
     
+    @property
+    def unified(self) -> bool:
+        """True when main.xml was loaded, False when it fell back to the legacy layout files."""
+        return self._unified
+
+    @property
+    def main_layout(self):
+        """The unified main.xml root element (None when main.xml isn't used)."""
+        if self._main_layout is None and self._unified:
+            self._main_layout = ET.parse(os.path.join(self.layout_dir, "main.xml")).getroot()
+        return self._main_layout
+
+    def _cache_key(self, path: str) -> Tuple:
+        """What the cached parse depends on: the XML content, the theme values and this parser."""
+        with open(path, "rb") as f:
+            xml_digest = hashlib.sha256(f.read()).hexdigest()
+        theme = {section: self.theme_config.get(section) for section in THEME_SECTIONS}
+        theme_digest = hashlib.sha256(json.dumps(theme, sort_keys=True, default=str).encode()).hexdigest()
+        return (LAYOUT_CACHE_VERSION, os.path.getmtime(__file__), os.path.abspath(path), xml_digest, theme_digest)
+
+    def _read_cache(self, key: Tuple) -> bool:
+        """Restore the parsed state from the cache file if it was built from the same sources."""
+        try:
+            with open(self.cache_file, "rb") as f:
+                cached = pickle.load(f)
+            if cached.get("key") != key:
+                return False
+            state = cached["state"]
+            for name in self.CACHED_STATE:
+                setattr(self, name, state[name])
+            return True
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            print(f"Ignoring layout cache {self.cache_file}: {e}")
+            return False
+
+    def _write_cache(self, key: Tuple):
+        state = {name: getattr(self, name) for name in self.CACHED_STATE}
+        tmp_path = f"{self.cache_file}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.cache_file) or ".", exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                pickle.dump({"key": key, "state": state}, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.cache_file)  # Readers never see a partly written file
+        except Exception as e:
+            print(f"Could not write layout cache {self.cache_file}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
     def _load_main_layout(self) -> bool:
-        """Load the unified main.xml layout file."""
+        """Load the unified main.xml layout file (from the cache file when it is current)."""
         path = os.path.join(self.layout_dir, "main.xml")
+        self._plan_cache.clear()
+        self._formatters = None
         
         if not os.path.exists(path):
             # Fallback to loading default.xml
             self._load_layout("default")
             return False
+
+        cache_key = None
+        if self.cache_file:
+            try:
+                cache_key = self._cache_key(path)
+                if self._read_cache(cache_key):
+                    self._main_layout = None
+                    self._unified = True
+                    self.loaded_from_cache = True
+                    self.file_timestamp = os.path.getmtime(path)
+                    print("Loaded unified layout: main.xml (cached)")
+                    return True
+            except OSError as e:
+                print(f"Layout cache unavailable: {e}")
+                cache_key = None
         
         try:
             tree = ET.parse(path)
             root = tree.getroot()
-            self.main_layout = root
+            self._main_layout = root
+            self._unified = True
+            self.loaded_from_cache = False
             self.file_timestamp = os.path.getmtime(path)
             
             # Parse global style element
@@ -112,6 +212,8 @@ class LayoutParser:
                     self._parse_mode(mode_name, mode_elem)
             
             print(f"Loaded unified layout: main.xml")
+            if cache_key is not None:
+                self._write_cache(cache_key)
             return True
         except Exception as e:
             print(f"Error loading main.xml: {e}")
@@ -718,7 +820,7 @@ class LayoutParser:
         normalized_name = layout_name.lower().replace(" ", "_")
         
         # If using unified layout and mode exists
-        if self.main_layout is not None and normalized_name in self._id_cache:
+        if self._unified and normalized_name in self._id_cache:
             self.current_mode_name = normalized_name
             self.current_layout_name = normalized_name
             return
@@ -746,6 +848,7 @@ class LayoutParser:
             root = tree.getroot()
             self.layouts[name] = root
             self.file_timestamps[name] = os.path.getmtime(path)
+            self._plan_cache.clear()
             
             # Initialize caches
             if name not in self._id_cache:
@@ -885,8 +988,57 @@ class LayoutParser:
         
         return None
 
-    def check_for_updates(self):
-        """Check if main.xml has changed and reload."""
+    def get_render_plan(self, size: Tuple[int, int], font_for: Optional[Callable] = None) -> RenderPlan:
+        """Compiled render plan for the current mode at the given display size.
+
+        Plans are built once per (mode, size) and dropped when the XML is
+        reloaded. ``font_for(size)`` supplies font handles for the containers.
+        """
+        if font_for != self._plan_fonts:
+            self._plan_fonts = font_for
+            self._plan_cache.clear()
+
+        key = (self.current_mode_name, tuple(size))
+        plan = self._plan_cache.get(key)
+        if plan is not None:
+            self.plan_stats["hits"] += 1
+            return plan
+
+        plan = self._compile_render_plan(self.current_mode_name, tuple(size), font_for)
+        self._plan_cache[key] = plan
+        self.plan_stats["compiled"] += 1
+        return plan
+
+    def _compile_render_plan(self, mode: str, size: Tuple[int, int], font_for: Optional[Callable]) -> RenderPlan:
+        # Same lookup order as get_element_by_id: the mode's containers over the default ones
+        elements = dict(self._id_cache.get("default", {}))
+        elements.update(self._id_cache.get(mode, {}))
+
+        containers = {}
+        for eid, attrs in elements.items():
+            defaults = STATS_DEFAULTS if eid == "stats" else MENU_DEFAULTS
+            try:
+                containers[eid] = compile_container(eid, attrs, size, defaults, font_for, self.get_animation)
+            except (TypeError, ValueError) as e:
+                print(f"Skipping container {eid} in render plan: {e}")
+
+        widths = self.get_widths()
+        scroll = self.get_text_scroll_config()
+        selected = self.theme_config.get("theme", {}).get("colors", {}).get("selected", "#00FFFF")
+
+        return RenderPlan(
+            mode=mode,
+            size=size,
+            containers=freeze(containers),
+            widths=freeze(widths),
+            mode_colors=freeze({name: parse_color(c) for name, c in self.get_mode_colors().items()}),
+            selected_color=parse_color(selected),
+            scroll_speed=scroll.get('speed', 0.05),
+            scroll_pause_ms=scroll.get('pause_ms', 1000),
+        )
+
+    def check_for_updates(self) -> bool:
+        """Check if main.xml has changed and reload. Returns True if it was reloaded."""
         path = os.path.join(self.layout_dir, "main.xml")
         
         if os.path.exists(path):
@@ -895,8 +1047,10 @@ class LayoutParser:
                 if current_mtime > self.file_timestamp:
                     print("Reloading main.xml")
                     self._load_main_layout()
+                    return True
             except OSError:
                 pass
+        return False
 
     def get_layout_structure(self) -> Dict[str, Any]:
         """Returns a simplified dictionary representation of the layout."""
@@ -1093,46 +1247,17 @@ class LayoutParser:
         """Get all overlay definitions."""
         return self._overlays_cache
     
+    @property
+    def formatters(self) -> ValueFormatters:
+        """The layout's formatters compiled to callables, over the built-in ones for the stats."""
+        formatters = self._formatters
+        if formatters is None:
+            formatters = self._formatters = ValueFormatters(self._formatters_cache, DEFAULT_FORMATTERS)
+        return formatters
+
     def format_value(self, key: str, value: Any) -> str:
         """Format a value using the configured formatter for that key."""
-        formatter = self._formatters_cache.get(key)
-        if not formatter:
-            return str(value)
-        
-        fmt_type = formatter.get('type', 'string')
-        
-        if fmt_type == 'shutter_speed':
-            if isinstance(value, (int, float)) and value > 0:
-                if value >= 1000000:
-                    return f"{value / 1000000:.1f}s"
-                elif value >= 1000:
-                    fraction = 1000000 / value
-                    if fraction >= 1:
-                        return f"1/{int(fraction)}"
-                    return f"{value / 1000:.0f}ms"
-                else:
-                    return f"{value}µs"
-            return str(value)
-        
-        elif fmt_type == 'resolution':
-            sep = formatter.get('separator', '×')
-            if isinstance(value, str) and ',' in value:
-                parts = value.split(',')
-                return f"{parts[0]}{sep}{parts[1]}"
-            elif isinstance(value, tuple):
-                return f"{value[0]}{sep}{value[1]}"
-            return str(value)
-        
-        elif fmt_type == 'signed_number':
-            if isinstance(value, (int, float)):
-                sign = '+' if value > 0 else ''
-                return f"{sign}{value}"
-            return str(value)
-        
-        # Default: apply prefix/suffix
-        prefix = formatter.get('prefix', '')
-        suffix = formatter.get('suffix', '')
-        return f"{prefix}{value}{suffix}"
+        return self.formatters.format(key, value)
 
     # ==========================================
     # Layout Access Methods
@@ -0,0 +1,154 @@
+import copy
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from src.ui.layout_parser import LayoutParser
+from src.ui.layout_watcher import LayoutWatcher
+
+DEFAULT_LAYOUT_DIR = "src/ui/layouts"
+
+
+class LayoutRegistry:
+    """The parsed layout shared by settings, GUI and controls.
+
+    ``main.xml`` is parsed once per process. A reload parses a complete new
+    LayoutParser next to the current one and then swaps the reference, so
+    readers see either the old layout or the new one, never a half-updated
+    mix. Always go through ``parser`` rather than keeping the LayoutParser.
+
+    ``start_watching()`` moves the reload onto a background thread that
+    reacts to edits of main.xml; ``version`` increases with every swap so
+    the render loop only has to compare an integer per frame.
+    """
+
+    def __init__(self, theme_config: Optional[Dict[str, Any]] = None, layout_dir: str = DEFAULT_LAYOUT_DIR,
+                 cache_file: Optional[str] = None):
+        self.theme_config = theme_config
+        self.layout_dir = layout_dir
+        self.cache_file = cache_file  # See LayoutParser: serialized parse for fast cold starts
+        self._parser: Optional[LayoutParser] = None
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()  # One reload at a time (watcher thread vs. manual)
+        self._warmups: List[Callable[[LayoutParser], None]] = []
+        self.watcher: Optional[LayoutWatcher] = None
+        self.version = 0
+        self.stats = {"parses": 0, "swaps": 0, "rejected": 0}
+
+    @property
+    def parser(self) -> LayoutParser:
+        parser = self._parser
+        if parser is None:
+            with self._lock:
+                if self._parser is None:
+                    self._parser = self._parse()
+                parser = self._parser
+        return parser
+
+    def _parse(self) -> LayoutParser:
+        self.stats["parses"] += 1
+        return LayoutParser(theme_config=self.theme_config, layout_dir=self.layout_dir, cache_file=self.cache_file)
+
+    def add_warmup(self, warmup: Callable[[LayoutParser], None]):
+        """Run ``warmup(parser)`` on each new parse before it is swapped in (e.g. compile render plans)."""
+        if warmup not in self._warmups:
+            self._warmups.append(warmup)
+
+    def remove_warmup(self, warmup: Callable[[LayoutParser], None]):
+        if warmup in self._warmups:
+            self._warmups.remove(warmup)
+
+    def reload(self) -> LayoutParser:
+        """Parse the layout files again and swap the new parse in.
+
+        A main.xml that no longer parses (e.g. saved halfway through an
+        edit) doesn't replace a working layout; the current parse is kept.
+        """
+        with self._reload_lock:
+            fresh = self._parse()
+            old = self._parser
+            if old is not None:
+                if old.unified and not fresh.unified:
+                    self.stats["rejected"] += 1
+                    print("Keeping the current layout: main.xml failed to load")
+                    return old
+                # Keep the mode the UI is showing
+                fresh.current_mode_name = old.current_mode_name
+                fresh.current_layout_name = old.current_layout_name
+            for warmup in list(self._warmups):
+                try:
+                    warmup(fresh)
+                except Exception as e:
+                    print(f"Layout warmup failed: {e}")
+            with self._lock:
+                old = self._parser
+                if old is not None:
+                    # The UI may have switched modes while we were parsing
+                    fresh.current_mode_name = old.current_mode_name
+                    fresh.current_layout_name = old.current_layout_name
+                self._parser = fresh
+                self.stats["swaps"] += 1
+                self.version += 1
+            return fresh
+
+    def check_for_updates(self) -> bool:
+        """Reload if main.xml changed since it was parsed. Returns True if it was reloaded."""
+        path = os.path.join(self.layout_dir, "main.xml")
+        try:
+            changed = os.path.getmtime(path) > self.parser.file_timestamp
+        except OSError:
+            return False
+        if changed:
+            print("Reloading main.xml")
+            self.reload()
+        return changed
+
+    def start_watching(self, poll_interval: float = 1.0) -> LayoutWatcher:
+        """Reload in the background whenever main.xml changes."""
+        self.parser  # Parse now so the watcher only ever reacts to edits
+        if self.watcher is None:
+            self.watcher = LayoutWatcher(self.layout_dir, "main.xml", self._reload_if_changed, poll_interval)
+        self.watcher.start()
+        return self.watcher
+
+    def stop_watching(self):
+        if self.watcher is not None:
+            self.watcher.stop()
+
+    def _reload_if_changed(self):
+        path = os.path.join(self.layout_dir, "main.xml")
+        try:
+            if os.path.getmtime(path) == self.parser.file_timestamp:
+                return
+        except OSError:
+            return
+        print("Reloading main.xml")
+        self.reload()
+
+    def menus(self) -> List[Dict[str, Any]]:
+        """A private copy of the menu definitions, free to be filled with the user's values."""
+        return copy.deepcopy(self.parser.get_menus_list())
+
+
+_registries: Dict[str, LayoutRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_layout_registry(theme_config: Optional[Dict[str, Any]] = None,
+                        layout_dir: str = DEFAULT_LAYOUT_DIR, cache_file: Optional[str] = None) -> LayoutRegistry:
+    """The process-wide registry for ``layout_dir``.
+
+    Callers passing the same settings dict share one parse. A different
+    settings dict (theme values are resolved while parsing) replaces it.
+    ``cache_file`` turns on the layout cache for a registry that hasn't
+    parsed yet.
+    """
+    key = os.path.abspath(layout_dir)
+    with _registries_lock:
+        registry = _registries.get(key)
+        if registry is None or (theme_config is not None and registry.theme_config is not theme_config):
+            registry = LayoutRegistry(theme_config, layout_dir, cache_file)
+            _registries[key] = registry
+        elif cache_file and registry._parser is None:
+            registry.cache_file = cache_file
+        return registry
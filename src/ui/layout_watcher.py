@@ -0,0 +1,128 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+from typing import Callable, Optional, Set
+
+
+class _Inotify:
+    """Minimal inotify(7) binding via ctypes for watching one directory (Linux only)."""
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+    def __init__(self, directory: str):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        # Editors either rewrite the file or write a new one and rename it over
+        mask = self.IN_MODIFY | self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+
+    def read(self, timeout: float) -> Set[str]:
+        """Names of files that changed, waiting at most ``timeout`` seconds for the first event."""
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        names = set()
+        offset = 0
+        while offset + self.EVENT_HEADER.size <= len(data):
+            _, _, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            names.add(os.fsdecode(data[offset:offset + length].rstrip(b"\0")))
+            offset += length
+        return names
+
+    def close(self):
+        os.close(self.fd)
+
+
+class LayoutWatcher:
+    """Call ``on_change()`` on a background thread when a layout file changes.
+
+    Uses inotify where available and otherwise checks the file's mtime every
+    ``poll_interval`` seconds. Bursts of writes (editors saving in several
+    steps) are collapsed: the callback runs once the file has been quiet for
+    ``settle`` seconds.
+    """
+
+    def __init__(self, directory: str, filename: str, on_change: Callable[[], None],
+                 poll_interval: float = 1.0, settle: float = 0.1):
+        self.directory = directory
+        self.filename = filename
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+        self.settle = settle
+        self.mode: Optional[str] = None  # "inotify" or "polling" once started
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._inotify: Optional[_Inotify] = None
+        self._last_mtime = 0.0
+        self.stats = {"changes": 0, "errors": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._inotify = None
+        if sys.platform.startswith("linux"):
+            try:
+                self._inotify = _Inotify(self.directory)
+            except (OSError, AttributeError) as e:
+                print(f"LayoutWatcher: inotify unavailable ({e}), polling instead")
+        self.mode = "inotify" if self._inotify else "polling"
+        self._last_mtime = self._mtime()  # Taken here so an edit right after start() isn't missed
+        self._thread = threading.Thread(target=self._run, name="layout-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        self._stop.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+        if self._inotify:
+            self._inotify.close()
+            self._inotify = None
+
+    def _mtime(self) -> float:
+        try:
+            return os.path.getmtime(os.path.join(self.directory, self.filename))
+        except OSError:
+            return 0.0
+
+    def _run(self):
+        while not self._stop.is_set():
+            if self._inotify:
+                changed = self.filename in self._inotify.read(0.5)
+                # Wait until the writes stop before reloading
+                while changed and not self._stop.is_set() and self.filename in self._inotify.read(self.settle):
+                    pass
+            else:
+                self._stop.wait(self.poll_interval)
+                mtime = self._mtime()
+                changed = mtime != self._last_mtime
+                self._last_mtime = mtime
+            if changed and not self._stop.is_set():
+                self.stats["changes"] += 1
+                try:
+                    self.on_change()
+                except Exception as e:
+                    self.stats["errors"] += 1
+                    print(f"LayoutWatcher: reload failed: {e}")
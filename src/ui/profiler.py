@@ -0,0 +1,209 @@
+import csv
+import json
+import os
+import time
+import pygame
+from array import array
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Stages of GUI.run in the order they happen within a frame
+STAGES = ("input", "layout", "splash", "gallery", "menu", "overlay", "composite", "camera", "effects", "profiler", "present", "wait", "other")
+
+STAGE_COLORS = {
+    "input": (80, 160, 255),
+    "layout": (255, 200, 0),
+    "splash": (120, 120, 200),
+    "gallery": (0, 150, 255),
+    "menu": (0, 200, 120),
+    "overlay": (0, 230, 230),
+    "composite": (255, 90, 90),
+    "camera": (255, 60, 160),
+    "effects": (200, 120, 255),
+    "profiler": (255, 255, 255),
+    "present": (255, 140, 0),
+    "wait": (70, 70, 70),
+    "other": (150, 150, 150),
+}
+
+
+class FrameProfiler:
+    """Time each stage of the render loop.
+
+    The loop calls ``begin_frame()`` at the top and ``lap(stage)`` after each
+    stage; a lap is the time since the previous lap. Per-stage totals for the
+    last ``history`` frames are kept in fixed-size ring buffers (for the
+    percentiles and the graph), and the laps themselves for trace export.
+    Disabled, every call returns straight away.
+    """
+
+    def __init__(self, history: int = 240, stages: Sequence[str] = STAGES):
+        self.history = history
+        self.stages = tuple(stages)
+        self.enabled = False
+        self.show_graph = True  # Draw the on-screen graph while enabled
+        self._index = {stage: i for i, stage in enumerate(self.stages)}
+        self._clear()
+
+    def _clear(self):
+        self._durations = [array('d', bytes(8 * self.history)) for _ in self.stages]
+        self._totals = array('d', bytes(8 * self.history))
+        self._frames = 0  # Frames recorded since enabled; the ring slot is frames % history
+        self._trace: deque = deque(maxlen=self.history)  # (frame start, [(stage, start, duration)])
+        self._frame_start: Optional[float] = None
+        self._last = 0.0
+        self._laps: List[Tuple[str, float, float]] = []
+        self._origin = time.perf_counter()
+
+    def set_enabled(self, enabled: bool):
+        if enabled and not self.enabled:
+            self._clear()
+        self.enabled = enabled
+        print(f"Frame profiler {'enabled' if enabled else 'disabled'}")
+
+    def toggle(self):
+        self.set_enabled(not self.enabled)
+
+    def begin_frame(self):
+        """Close the previous frame (time since its last lap counts as 'other') and start a new one."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self._frame_start is not None:
+            self._lap_at("other", now)
+            self._end_frame(now)
+        self._frame_start = now
+        self._last = now
+        self._laps = []
+
+    def lap(self, stage: str):
+        """Attribute the time since the previous lap to ``stage``."""
+        if not self.enabled or self._frame_start is None:
+            return
+        self._lap_at(stage, time.perf_counter())
+
+    def _lap_at(self, stage: str, now: float):
+        duration = now - self._last
+        if duration > 0:
+            self._laps.append((stage, self._last, duration))
+        self._last = now
+
+    def _end_frame(self, now: float):
+        slot = self._frames % self.history
+        for durations in self._durations:
+            durations[slot] = 0.0
+        for stage, _, duration in self._laps:
+            self._durations[self._index[stage]][slot] += duration
+        self._totals[slot] = now - self._frame_start
+        self._trace.append((self._frame_start, self._laps))
+        self._frames += 1
+
+    @property
+    def frames(self) -> int:
+        """Frames currently held in the ring buffers."""
+        return min(self._frames, self.history)
+
+    def _ordered(self, values: array) -> List[float]:
+        """Ring buffer contents, oldest first."""
+        n = self.frames
+        if self._frames <= self.history:
+            return list(values[:n])
+        slot = self._frames % self.history
+        return list(values[slot:]) + list(values[:slot])
+
+    def percentiles(self, stage: Optional[str] = None, points: Sequence[float] = (50, 95, 99),
+                    exclude: Sequence[str] = ()) -> Dict[float, float]:
+        """Percentiles in ms of a stage's time per frame, or of the whole frame when stage is None
+        (less the stages in ``exclude``, e.g. "wait" for the time spent working)."""
+        if stage is not None:
+            samples = self._ordered(self._durations[self._index[stage]])
+        else:
+            samples = self._ordered(self._totals)
+            for excluded in exclude:
+                samples = [t - d for t, d in zip(samples, self._ordered(self._durations[self._index[excluded]]))]
+        samples.sort()
+        if not samples:
+            return {p: 0.0 for p in points}
+        last = len(samples) - 1
+        return {p: samples[min(last, int(round(p / 100.0 * last)))] * 1000.0 for p in points}
+
+    def summary(self) -> Dict[str, Dict[float, float]]:
+        """{stage: {percentile: ms}} for every stage and 'frame'."""
+        result = {stage: self.percentiles(stage) for stage in self.stages}
+        result["frame"] = self.percentiles()
+        return result
+
+    def export_chrome_trace(self, path: str) -> str:
+        """Write the recorded laps as a Chrome trace (chrome://tracing, Perfetto)."""
+        events = []
+        for frame, (start, laps) in enumerate(self._trace):
+            for stage, lap_start, duration in laps:
+                events.append({
+                    "name": stage, "cat": "frame", "ph": "X", "pid": 1, "tid": 1,
+                    "ts": round((lap_start - self._origin) * 1e6, 1),
+                    "dur": round(duration * 1e6, 1),
+                    "args": {"frame": frame},
+                })
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return path
+
+    def export_csv(self, path: str) -> str:
+        """Write one row per frame with the ms spent in each stage."""
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "start_ms", "total_ms"] + list(self.stages))
+            for frame, (start, laps) in enumerate(self._trace):
+                per_stage = dict.fromkeys(self.stages, 0.0)
+                for stage, _, duration in laps:
+                    per_stage[stage] += duration
+                total = sum(per_stage.values())
+                writer.writerow([frame, f"{(start - self._origin) * 1000:.3f}", f"{total * 1000:.3f}"]
+                                + [f"{per_stage[s] * 1000:.3f}" for s in self.stages])
+        return path
+
+    def export(self, directory: str) -> Tuple[str, str]:
+        """Write a Chrome trace and a CSV file named after the current time into ``directory``."""
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, time.strftime("profile_%Y%m%d_%H%M%S"))
+        paths = (self.export_chrome_trace(base + ".json"), self.export_csv(base + ".csv"))
+        print(f"Frame profile written to {paths[0]} and {paths[1]}")
+        return paths
+
+    def draw(self, surface, rect: Tuple[int, int, int, int], font, budget_ms: float = 33.3):
+        """Draw stacked per-stage bars for the recorded frames and the p50/p95 table into ``rect``.
+
+        The table changes every frame, so it is rendered directly rather than
+        through the shared text cache, where it would evict the menu's text.
+        """
+        x, y, w, h = rect
+        surface.fill((0, 0, 0), rect)
+        graph_h = h // 2
+        bottom = y + graph_h
+        scale = graph_h / (2 * budget_ms / 1000.0)  # Twice the frame budget fills the graph
+        columns = [self._ordered(d) for d in self._durations]
+        bar_w = max(1, w // self.history)
+        n = min(self.frames, w // bar_w)
+        first = self.frames - n
+        start_x = x + w - n * bar_w
+        for i in range(n):
+            top = bottom
+            for stage_index, stage in enumerate(self.stages):
+                height = min(round(columns[stage_index][first + i] * scale), top - y)
+                if height <= 0:
+                    continue
+                top -= height
+                surface.fill(STAGE_COLORS.get(stage, (255, 255, 255)), (start_x + i * bar_w, top, bar_w, height))
+        budget_y = bottom - int(budget_ms / 1000.0 * scale)
+        pygame.draw.line(surface, (255, 255, 255), (x, budget_y), (x + w - 1, budget_y))
+
+        line_h = font.get_linesize()
+        row_y = bottom + 2
+        summary = self.summary()
+        for stage in self.stages + ("frame",):
+            if row_y + line_h > y + h:
+                break
+            p = summary[stage]
+            text = f"{stage:<9} p50 {p[50]:6.2f}  p95 {p[95]:6.2f}  p99 {p[99]:6.2f} ms"
+            surface.blit(font.render(text, False, STAGE_COLORS.get(stage, (255, 255, 255))), (x + 2, row_y))
+            row_y += line_h
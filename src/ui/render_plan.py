@@ -0,0 +1,135 @@
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, NamedTuple, Optional, Tuple
+
+Color = Tuple[int, ...]
+Rect = Tuple[int, int, int, int]
+
+# Attribute defaults used by the render loop, per container kind
+MENU_DEFAULTS = {
+    "x": "0", "y": "0", "width": "100", "height": "100",
+    "bg_color": "#00000000", "color": "#FFFFFF", "label_color": "#B4B4B4",
+    "selected_color": "#FFFFFF", "unselected_color": "#AAAAAA", "selection_bg_color": "#FFFFFF33",
+    "font_size": 20, "item_height": 30, "item_spacing": 20, "padding": 5,
+    "orientation": "vertical",
+}
+
+STATS_DEFAULTS = dict(MENU_DEFAULTS, **{
+    "width": "100%", "height": "30", "bg_color": "#00000088",
+    "font_size": 16, "padding": 15, "spacing": 15, "label_truncate": 3,
+    "icon_size": 20, "icon_gap": 5, "selection_alpha": 60, "selection_border_width": 1,
+    "selection_padding_x": 5, "selection_padding_y": 3, "value_transition": "stat_change",
+})
+
+
+def parse_color(value: Any) -> Color:
+    """'#RRGGBB' / '#RRGGBBAA' (or an existing tuple) to an RGB(A) tuple."""
+    if isinstance(value, (tuple, list)):
+        return tuple(int(v) for v in value)
+    hex_string = str(value).lstrip('#')
+    if len(hex_string) == 6:
+        return tuple(int(hex_string[i:i+2], 16) for i in (0, 2, 4))
+    elif len(hex_string) == 8:
+        return tuple(int(hex_string[i:i+2], 16) for i in (0, 2, 4, 6))
+    return (255, 255, 255)
+
+
+def parse_dimension(value: Any, total_size: int) -> int:
+    """Pixels, 'N%' of total_size, or 'center'/'right'/'bottom'."""
+    value = str(value)
+    if value.endswith("%"):
+        return int(total_size * float(value.strip("%")) / 100)
+    if value == "center":
+        return total_size // 2
+    if value == "right" or value == "bottom":
+        return total_size  # Needs context of object size to be useful, simplified here
+    return int(value)
+
+
+class ContainerPlan(NamedTuple):
+    """A layout container with every attribute resolved to what the renderer draws with."""
+    id: str
+    rect: Rect
+    bg_color: Color
+    color: Color
+    label_color: Color
+    selected_color: Color
+    unselected_color: Color
+    selection_bg_color: Color
+    font_size: int
+    font: Any
+    item_height: int
+    item_spacing: int
+    padding: int
+    padding_right: int
+    orientation: str
+    spacing: int
+    label_truncate: int
+    icon_size: int
+    icon_gap: int
+    selection_alpha: int
+    selection_border: int
+    selection_pad_x: int
+    selection_pad_y: int
+    value_transition_ms: Optional[int]
+
+
+class RenderPlan(NamedTuple):
+    """Everything the GUI needs to draw one mode, compiled once from the layout XML."""
+    mode: str
+    size: Tuple[int, int]
+    containers: Mapping[str, ContainerPlan]
+    widths: Mapping[str, int]
+    mode_colors: Mapping[str, Color]
+    selected_color: Color
+    scroll_speed: float
+    scroll_pause_ms: int
+
+
+def compile_container(container_id: str, attrs: Dict[str, Any], size: Tuple[int, int],
+                      defaults: Dict[str, Any], font_for: Optional[Callable] = None,
+                      animation_for: Optional[Callable] = None) -> ContainerPlan:
+    """Resolve a container's raw attributes against the display size and defaults."""
+    width, height = size
+
+    def get(key):
+        value = attrs.get(key)
+        return defaults.get(key) if value is None else value
+
+    padding = int(get("padding"))
+    font_size = int(get("font_size"))
+    transition = get("value_transition")
+    transition_ms = None
+    if transition and animation_for:
+        transition_ms = int(animation_for(transition).get("duration", 100))
+
+    return ContainerPlan(
+        id=container_id,
+        rect=(parse_dimension(get("x"), width), parse_dimension(get("y"), height),
+              parse_dimension(get("width"), width), parse_dimension(get("height"), height)),
+        bg_color=parse_color(get("bg_color")),
+        color=parse_color(get("color")),
+        label_color=parse_color(get("label_color")),
+        selected_color=parse_color(get("selected_color")),
+        unselected_color=parse_color(get("unselected_color")),
+        selection_bg_color=parse_color(get("selection_bg_color")),
+        font_size=font_size,
+        font=font_for(font_size) if font_for else None,
+        item_height=int(get("item_height")),
+        item_spacing=int(get("item_spacing")),
+        padding=padding,
+        padding_right=int(attrs.get("padding_right", padding)),
+        orientation=str(get("orientation")),
+        spacing=int(get("spacing") or 0),
+        label_truncate=int(get("label_truncate") or 0),
+        icon_size=int(get("icon_size") or 0),
+        icon_gap=int(get("icon_gap") or 0),
+        selection_alpha=int(get("selection_alpha") or 0),
+        selection_border=int(get("selection_border_width") or 0),
+        selection_pad_x=int(get("selection_padding_x") or 0),
+        selection_pad_y=int(get("selection_padding_y") or 0),
+        value_transition_ms=transition_ms,
+    )
+
+
+def freeze(mapping: Dict[str, Any]) -> Mapping[str, Any]:
+    return MappingProxyType(dict(mapping))
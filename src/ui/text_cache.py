@@ -0,0 +1,87 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+DEFAULT_FACE = 'freesansbold.ttf'
+
+
+class FontRegistry:
+    """Load each (face, size) font once and hand out the same object afterwards.
+
+    ``factory`` is the font constructor, normally ``pygame.font.Font``.
+    """
+
+    def __init__(self, factory: Callable):
+        self._factory = factory
+        self._fonts: Dict[Tuple[Optional[str], int], Any] = {}
+        self._lock = threading.Lock()
+        self.stats = {"loaded": 0, "hits": 0}
+
+    def get(self, size: int, face: Optional[str] = DEFAULT_FACE):
+        key = (face, int(size))
+        with self._lock:
+            font = self._fonts.get(key)
+            if font is not None:
+                self.stats["hits"] += 1
+                return font
+            try:
+                font = self._factory(face, int(size))
+            except Exception:
+                # Fall back to pygame's built-in font
+                font = self._factory(None, int(size))
+            self._fonts[key] = font
+            self.stats["loaded"] += 1
+            return font
+
+    def clear(self):
+        with self._lock:
+            self._fonts.clear()
+
+
+class TextCache:
+    """LRU of rendered text surfaces keyed by (font, text, color, antialias, background).
+
+    Returned surfaces are shared between callers: blit them, but copy before
+    changing alpha or drawing on them. ``max_entries = 0`` disables caching.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._surfaces: "OrderedDict[Tuple, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def render(self, font, text, antialias: bool, color, background=None):
+        """Same arguments as ``Font.render`` with the font first."""
+        text = str(text)
+        if self.max_entries <= 0:
+            return self._render(font, text, color, antialias, background)
+
+        key = (font, text, tuple(color), antialias, tuple(background) if background is not None else None)
+        with self._lock:
+            surf = self._surfaces.get(key)
+            if surf is not None:
+                self._surfaces.move_to_end(key)
+                self.stats["hits"] += 1
+                return surf
+
+        surf = self._render(font, text, color, antialias, background)
+        with self._lock:
+            self.stats["misses"] += 1
+            self._surfaces[key] = surf
+            while len(self._surfaces) > self.max_entries:
+                self._surfaces.popitem(last=False)
+        return surf
+
+    def _render(self, font, text, color, antialias, background):
+        if background is None:
+            return font.render(text, antialias, color)
+        return font.render(text, antialias, color, background)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._surfaces)
+
+    def clear(self):
+        with self._lock:
+            self._surfaces.clear()
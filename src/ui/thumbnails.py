@@ -0,0 +1,155 @@
+import os
+import io
+import hashlib
+import threading
+from typing import Optional, Tuple
+
+try:
+    from PIL import Image, ExifTags
+except ImportError:
+    Image = None
+    ExifTags = None
+
+# EXIF IFD1 tags describing the embedded JPEG thumbnail
+JPEG_INTERCHANGE_FORMAT = 0x0201
+JPEG_INTERCHANGE_FORMAT_LENGTH = 0x0202
+
+
+def extract_exif_thumbnail(filepath: str) -> Optional[bytes]:
+    """Return the JPEG thumbnail embedded in a file's EXIF block, if any.
+
+    Only the EXIF header is read; the main image data is never decoded.
+    """
+    if not Image:
+        return None
+
+    try:
+        with Image.open(filepath) as img:
+            raw = img.info.get("exif")
+            if not raw:
+                return None
+            ifd1 = img.getexif().get_ifd(ExifTags.IFD.IFD1)
+    except Exception:
+        return None
+
+    offset = ifd1.get(JPEG_INTERCHANGE_FORMAT)
+    length = ifd1.get(JPEG_INTERCHANGE_FORMAT_LENGTH)
+    if not offset or not length:
+        return None
+
+    # Offsets are relative to the TIFF header, which follows the "Exif\0\0" marker
+    base = 6 if raw.startswith(b"Exif\x00\x00") else 0
+    data = raw[base + offset:base + offset + length]
+    if len(data) != length or not data.startswith(b"\xff\xd8"):
+        return None
+    return data
+
+
+class ThumbnailStore:
+    """Disk-backed thumbnail cache for gallery browsing.
+
+    Thumbnails are taken from the embedded EXIF thumbnail when present, and
+    otherwise produced with JPEG draft (DCT-scaled) decoding so a full
+    resolution decode is never needed. Results are written to ``cache_dir``
+    keyed by source path, mtime and thumbnail size.
+    """
+
+    def __init__(self, cache_dir: str = os.path.join("home", "cache", "thumbs"),
+                 size: Tuple[int, int] = (160, 120), quality: int = 80):
+        self.cache_dir = cache_dir
+        self.size = size
+        self.quality = quality
+        self._lock = threading.Lock()
+        self.stats = {"disk_hits": 0, "exif": 0, "decoded": 0, "errors": 0}
+
+    def _cache_path(self, filepath: str) -> Optional[str]:
+        try:
+            mtime = os.path.getmtime(filepath)
+        except OSError:
+            return None
+        key = f"{os.path.abspath(filepath)}|{mtime}|{self.size[0]}x{self.size[1]}"
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.jpg")
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def get(self, filepath: str):
+        """Return a PIL image no larger than ``size`` for ``filepath``, or None."""
+        if not Image:
+            return None
+
+        cache_path = self._cache_path(filepath)
+        if cache_path is None:
+            return None
+
+        # 1. Previously generated thumbnail
+        if os.path.exists(cache_path):
+            try:
+                with Image.open(cache_path) as cached:
+                    cached.load()
+                    self._count("disk_hits")
+                    # Mark as recently used for prune()
+                    os.utime(cache_path)
+                    return cached.convert("RGB")
+            except Exception:
+                pass
+
+        # 2. Embedded EXIF thumbnail, 3. draft decode of the full image
+        thumb = None
+        exif_data = extract_exif_thumbnail(filepath)
+        if exif_data:
+            try:
+                thumb = Image.open(io.BytesIO(exif_data))
+                thumb.draft("RGB", self.size)
+                thumb = thumb.convert("RGB")
+                thumb.thumbnail(self.size)
+                self._count("exif")
+            except Exception:
+                thumb = None
+
+        if thumb is None:
+            try:
+                with Image.open(filepath) as img:
+                    # draft() lets libjpeg decode at 1/2, 1/4 or 1/8 scale
+                    img.draft("RGB", self.size)
+                    thumb = img.convert("RGB")
+                thumb.thumbnail(self.size)
+                self._count("decoded")
+            except Exception as e:
+                print(f"Thumbnail error for {filepath}: {e}")
+                self._count("errors")
+                return None
+
+        self._write(cache_path, thumb)
+        return thumb
+
+    def prune(self, keep: int):
+        """Remove all but the ``keep`` most recently used thumbnails."""
+        if not os.path.isdir(self.cache_dir):
+            return
+        try:
+            entries = [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)
+                       if name.endswith(".jpg")]
+            entries.sort(key=os.path.getmtime, reverse=True)
+        except OSError:
+            return
+        for stale in entries[keep:]:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+
+    def _write(self, cache_path: str, thumb):
+        # Per-writer temp name: the gallery's worker and the startup warm-up may write the same thumbnail
+        tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            if not os.path.exists(self.cache_dir):
+                os.makedirs(self.cache_dir, exist_ok=True)
+            thumb.save(tmp_path, format="JPEG", quality=self.quality)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"Error writing thumbnail cache {cache_path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
@@ -0,0 +1,268 @@
+import os
+import math
+import shutil
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Iterable, List, Optional, Tuple
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+class TileCache:
+    """Bounded LRU of rendered tiles shared by every pyramid."""
+
+    def __init__(self, max_tiles: int = 96):
+        self.max_tiles = max_tiles
+        self._tiles: "OrderedDict[Tuple, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple) -> Optional[Any]:
+        with self._lock:
+            tile = self._tiles.get(key)
+            if tile is not None:
+                self._tiles.move_to_end(key)
+            return tile
+
+    def put(self, key: Tuple, tile: Any):
+        with self._lock:
+            self._tiles[key] = tile
+            self._tiles.move_to_end(key)
+            while len(self._tiles) > self.max_tiles:
+                self._tiles.popitem(last=False)
+
+    def __contains__(self, key: Tuple) -> bool:
+        with self._lock:
+            return key in self._tiles
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._tiles)
+
+    def clear(self):
+        with self._lock:
+            self._tiles.clear()
+
+
+class TilePyramid:
+    """Lazily built multi-resolution tile pyramid for a single image.
+
+    Level ``r`` holds the image downscaled by ``r`` (1, 2, 4 or 8), which are
+    exactly the scales libjpeg can decode directly through ``draft()``. A level
+    is decoded the first time one of its tiles is requested; the requested
+    tiles are cropped out and returned immediately. ``persist_pending()``
+    then writes the level to ``cache_dir`` a few tiles at a time, visible
+    tiles first, so later pans only read small tile files.
+
+    Pillow can only decode a whole level, so levels larger than
+    ``MAX_LEVEL_PIXELS`` are never built; deeper zooms magnify the finest
+    level that fits instead.
+    """
+
+    TILE_SIZE = 256
+    LEVELS = (8, 4, 2, 1)
+    MAX_LEVEL_PIXELS = 4_000_000  # 12 MB decoded; a 12 MP sensor's full level would be 36 MB
+
+    def __init__(self, filepath: str, cache_dir: str = os.path.join("home", "cache", "tiles")):
+        self.filepath = filepath
+        with Image.open(filepath) as img:
+            self.size = img.size
+            self.format = img.format
+
+        mtime = os.path.getmtime(filepath)
+        digest = hashlib.sha1(f"{os.path.abspath(filepath)}|{mtime}".encode("utf-8")).hexdigest()
+        self.root = os.path.join(cache_dir, digest)
+        if os.path.isdir(self.root):
+            # Mark as recently used for prune_tile_cache()
+            os.utime(self.root)
+        self._build_lock = threading.Lock()
+        self._level: Optional[Tuple[int, Any]] = None  # (reduce, decoded image) until its tiles are written
+        self._unwritten: List[Tuple[int, int]] = []
+        self.stats = {"level_decodes": 0, "disk_tiles": 0}
+
+    @property
+    def finest_level(self) -> int:
+        """Smallest reduce whose decoded level stays within MAX_LEVEL_PIXELS."""
+        for reduce in reversed(self.LEVELS):
+            lw, lh = self.level_size(reduce)
+            if lw * lh <= self.MAX_LEVEL_PIXELS:
+                return reduce
+        return self.LEVELS[0]
+
+    def level_for_scale(self, scale: float) -> int:
+        """Coarsest level that still has at least one pixel per display pixel, if it may be decoded."""
+        finest = self.finest_level
+        for reduce in self.LEVELS:
+            if reduce <= finest or 1.0 / reduce >= scale:
+                return reduce
+        return finest
+
+    def level_size(self, reduce: int) -> Tuple[int, int]:
+        w, h = self.size
+        return math.ceil(w / reduce), math.ceil(h / reduce)
+
+    def tile_grid(self, reduce: int) -> Tuple[int, int]:
+        lw, lh = self.level_size(reduce)
+        return math.ceil(lw / self.TILE_SIZE), math.ceil(lh / self.TILE_SIZE)
+
+    def tile_box(self, reduce: int, tx: int, ty: int) -> Tuple[int, int, int, int]:
+        """Tile bounds in level pixel coordinates."""
+        lw, lh = self.level_size(reduce)
+        left = tx * self.TILE_SIZE
+        top = ty * self.TILE_SIZE
+        return left, top, min(lw, left + self.TILE_SIZE), min(lh, top + self.TILE_SIZE)
+
+    def visible_tiles(self, reduce: int, box: Tuple[float, float, float, float]) -> List[Tuple[int, int]]:
+        """Tiles of a level intersecting ``box`` (given in source pixel coordinates)."""
+        cols, rows = self.tile_grid(reduce)
+        span = self.TILE_SIZE * reduce
+        x0 = max(0, int(box[0] // span))
+        y0 = max(0, int(box[1] // span))
+        x1 = min(cols - 1, int(math.ceil(box[2] / span)) - 1)
+        y1 = min(rows - 1, int(math.ceil(box[3] / span)) - 1)
+        return [(tx, ty) for ty in range(y0, y1 + 1) for tx in range(x0, x1 + 1)]
+
+    def _tile_path(self, reduce: int, tx: int, ty: int) -> str:
+        return os.path.join(self.root, str(reduce), f"{tx}_{ty}.jpg")
+
+    def _level_complete(self, reduce: int) -> bool:
+        return os.path.exists(os.path.join(self.root, str(reduce), "complete"))
+
+    def read_tile(self, reduce: int, tx: int, ty: int):
+        """Read an already built tile from disk, or None."""
+        path = self._tile_path(reduce, tx, ty)
+        if not os.path.exists(path):
+            return None
+        try:
+            with Image.open(path) as tile:
+                tile.load()
+                self.stats["disk_tiles"] += 1
+                return tile.convert("RGB")
+        except Exception:
+            return None
+
+    def load_tiles(self, reduce: int, wanted: Iterable[Tuple[int, int]], on_tile=None) -> dict:
+        """Return ``{(tx, ty): PIL image}`` for the wanted tiles of a level.
+
+        Tiles already on disk are read directly. Otherwise they are cropped
+        from the decoded level, which is decoded once at draft scale and kept
+        until ``persist_pending()`` has written the rest of its tiles.
+        ``on_tile`` is called for each tile as soon as it is available.
+        """
+        wanted = list(wanted)
+        result = {}
+        missing = []
+        for tx, ty in wanted:
+            tile = self.read_tile(reduce, tx, ty)
+            if tile is None:
+                missing.append((tx, ty))
+            else:
+                result[(tx, ty)] = tile
+                if on_tile:
+                    on_tile((tx, ty), tile)
+
+        if not missing:
+            return result
+        if self._level_complete(reduce):
+            # A tile file went missing (disk error, manual cleanup): build the level again
+            try:
+                os.remove(os.path.join(self.root, str(reduce), "complete"))
+            except OSError:
+                pass
+
+        with self._build_lock:
+            level_img = self._decoded_level(reduce)
+            if level_img is None:
+                return result
+            tiles = {pos: level_img.crop(self.tile_box(reduce, *pos)) for pos in missing}
+            # The tiles on screen are the first ones written to disk
+            first = set(missing)
+            self._unwritten = missing + [pos for pos in self._unwritten if pos not in first]
+
+        for pos, tile in tiles.items():
+            result[pos] = tile
+            if on_tile:
+                on_tile(pos, tile)
+        return result
+
+    def persist_pending(self, limit: int = 4) -> bool:
+        """Write up to ``limit`` tiles of the decoded level to disk.
+
+        Returns True while tiles are left, so callers can spread the work
+        over idle moments. The decoded level is released once all are written.
+        """
+        with self._build_lock:
+            if self._level is None:
+                return False
+            reduce, level_img = self._level
+            batch = [pos for pos in self._unwritten[:limit] if not os.path.exists(self._tile_path(reduce, *pos))]
+            self._unwritten = self._unwritten[limit:]
+            done = not self._unwritten
+            if done:
+                self._level = None
+
+        level_dir = os.path.join(self.root, str(reduce))
+        try:
+            os.makedirs(level_dir, exist_ok=True)
+            for tx, ty in batch:
+                level_img.crop(self.tile_box(reduce, tx, ty)).save(
+                    self._tile_path(reduce, tx, ty), format="JPEG", quality=90)
+            if done:
+                cols, rows = self.tile_grid(reduce)
+                with open(os.path.join(level_dir, "complete"), "w") as f:
+                    f.write(f"{cols}x{rows}")
+        except OSError as e:
+            print(f"Error writing tiles for {self.filepath}: {e}")
+            with self._build_lock:
+                # Don't mark the level complete; it is decoded again when next needed
+                if self._level is not None and self._level[1] is level_img:
+                    self._level = None
+            return False
+        return not done
+
+    def _decoded_level(self, reduce: int):
+        """Decoded image of a level, kept until its tiles are written (called with the lock held)."""
+        if self._level is not None and self._level[0] == reduce:
+            return self._level[1]
+        level_img = self._decode_level(reduce)
+        if level_img is None:
+            return None
+        # Only one level is held at a time; a dropped level's written tiles stay on disk
+        self._level = (reduce, level_img)
+        cols, rows = self.tile_grid(reduce)
+        self._unwritten = [(tx, ty) for ty in range(rows) for tx in range(cols)]
+        return level_img
+
+    def _decode_level(self, reduce: int):
+        lw, lh = self.level_size(reduce)
+        if lw * lh > self.MAX_LEVEL_PIXELS:
+            print(f"Not decoding {self.filepath} at 1/{reduce}: {lw}x{lh} is over the level size limit")
+            return None
+        try:
+            with Image.open(self.filepath) as img:
+                # draft() makes libjpeg decode at 1/reduce scale directly
+                img.draft("RGB", (lw, lh))
+                level_img = img.convert("RGB")
+            if level_img.size != (lw, lh):
+                level_img = level_img.resize((lw, lh), Image.BILINEAR)
+            self.stats["level_decodes"] += 1
+            return level_img
+        except Exception as e:
+            print(f"Error decoding {self.filepath} at 1/{reduce}: {e}")
+            return None
+
+
+def prune_tile_cache(cache_dir: str, keep: int = 8):
+    """Remove all but the ``keep`` most recently used image pyramids."""
+    if not os.path.isdir(cache_dir):
+        return
+    try:
+        entries = [os.path.join(cache_dir, name) for name in os.listdir(cache_dir)]
+        entries = sorted((p for p in entries if os.path.isdir(p)), key=os.path.getmtime, reverse=True)
+    except OSError:
+        return
+    for stale in entries[keep:]:
+        shutil.rmtree(stale, ignore_errors=True)
@@ -0,0 +1,121 @@
+"""
+Tests for the coalescing camera command queue and asynchronous setting writes.
+"""
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from src.hardware.camera import MockCamera
+from src.hardware.camera_commands import CameraCommandQueue
+from src.ui.controls import MenuController
+
+
+class TestCameraCommandQueue(unittest.TestCase):
+    def setUp(self):
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.batches = []
+
+        def apply_batch(batch):
+            self.started.set()
+            self.release.wait(5)
+            self.batches.append(list(batch.items()))
+
+        self.queue = CameraCommandQueue(apply_batch)
+
+    def tearDown(self):
+        self.release.set()
+        self.queue.close()
+
+    def test_latest_value_wins_in_first_queued_order(self):
+        self.queue.submit("iso", 100)
+        self.assertTrue(self.started.wait(5))  # The worker is now busy with the first batch
+        for value in (200, 400, 800):
+            self.queue.submit("iso", value)
+        self.queue.submit("awb", "sun")
+        self.queue.submit("iso", 1600)
+        self.assertFalse(self.queue.idle)
+
+        self.release.set()
+        self.assertTrue(self.queue.wait(5))
+        self.assertEqual(self.batches, [[("iso", 100)], [("iso", 1600), ("awb", "sun")]])
+        self.assertEqual(self.queue.stats["submitted"], 6)
+        self.assertEqual(self.queue.stats["coalesced"], 3)
+        self.assertEqual(self.queue.stats["applied"], 3)
+        self.assertEqual(self.queue.stats["batches"], 2)
+
+    def test_errors_are_counted_and_the_worker_keeps_going(self):
+        queue = CameraCommandQueue(MagicMock(side_effect=[RuntimeError("busy"), None]))
+        queue.submit("iso", 100)
+        self.assertTrue(queue.wait(5))
+        queue.submit("iso", 200)
+        self.assertTrue(queue.wait(5))
+        self.assertEqual(queue.stats["errors"], 1)
+        self.assertEqual(queue.stats["applied"], 1)
+        queue.close()
+
+    def test_failed_settings_are_counted_per_key(self):
+        queue = CameraCommandQueue(lambda batch: {"iso": RuntimeError("busy")} if "iso" in batch else None)
+        queue.submit_many({"iso": 100, "awb": "sun"})
+        self.assertTrue(queue.wait(5))
+        self.assertEqual(queue.stats["errors"], 1)
+        self.assertEqual(queue.stats["applied"], 1)
+        queue.close()
+
+    def test_close_applies_what_is_queued(self):
+        self.release.set()
+        self.queue.submit("iso", 100)
+        self.queue.close()
+        self.queue.submit("iso", 200)  # After close: applied by the next wait, on the caller
+        self.assertTrue(self.queue.wait(5))
+        self.assertEqual(self.batches[-1], [("iso", 200)])
+
+
+class TestAsyncCameraSettings(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        settings = {"files": {"path": self.test_dir, "cache_path": self.test_dir, "template": "img_{}_{}"},
+                    "display": {"width": 100, "height": 100, "fullscreen": False}}
+        self.camera = MockCamera({}, settings)
+        self.camera.directory()
+        self.setter = MagicMock(side_effect=lambda value=None: time.sleep(0.05) or value)
+        self.camera._raw_accessors["iso"] = self.setter
+
+    def tearDown(self):
+        self.camera.commands.close()
+        shutil.rmtree(self.test_dir)
+
+    def test_held_key_does_not_block_and_sends_the_final_value(self):
+        start = time.perf_counter()
+        for value in (100, 200, 400, 800):
+            MenuController._apply_setting(self.camera, {"name": "iso", "value": value})
+            self.assertEqual(self.camera.state.get("iso"), value)
+        self.assertLess(time.perf_counter() - start, 0.05 * 4)
+
+        self.assertTrue(self.camera.wait_for_settings())
+        self.assertEqual(self.setter.call_args_list[-1].kwargs, {"value": 800})
+        self.assertLess(self.setter.call_count, 4)
+        self.assertEqual(self.camera.state.get("iso"), 800)
+        self.assertGreater(self.camera.commands.stats["coalesced"], 0)
+
+    def test_failing_setter_is_not_counted_as_applied(self):
+        self.camera._raw_accessors["awb"] = MagicMock(side_effect=RuntimeError("camera busy"))
+        self.camera.submit_settings({"iso": 400, "awb": "sunlight"})
+        self.assertTrue(self.camera.wait_for_settings())
+        self.assertEqual(self.camera.commands.stats["applied"], 1)
+        self.assertEqual(self.camera.commands.stats["errors"], 1)
+
+    def test_capture_waits_for_queued_settings(self):
+        self.camera.submit_settings({"iso": 400})
+        self.camera._get_next_filename = MagicMock(return_value=f"{self.test_dir}/img.jpg")
+        self.camera.queue_manager = MagicMock()
+        self.camera.captureImage()
+        self.setter.assert_called_once_with(value=400)
+        self.assertTrue(self.camera.commands.idle)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+"""
+Tests for the camera state store and how the camera and GUI use it.
+"""
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+
+# Mock dependencies
+sys.modules['picamera'] = MagicMock()
+sys.modules['pygame'] = MagicMock()
+sys.modules['pygame.camera'] = MagicMock()
+
+from src.hardware.camera_state import CameraState
+from src.hardware.camera import MockCamera
+
+
+class TestCameraState(unittest.TestCase):
+    def setUp(self):
+        self.state = CameraState()
+        self.changes = []
+        self.unsubscribe = self.state.subscribe(lambda key, old, new: self.changes.append((key, old, new)))
+
+    def test_notifies_only_on_change(self):
+        self.assertTrue(self.state.set("iso", 100))
+        self.assertFalse(self.state.set("iso", 100))
+        self.assertTrue(self.state.set("iso", 200))
+        self.assertEqual(self.changes, [("iso", None, 100), ("iso", 100, 200)])
+        self.assertEqual(self.state.stats["sets"], 3)
+        self.assertEqual(self.state.stats["changes"], 2)
+
+    def test_snapshot_rebuilt_only_after_change(self):
+        self.state.set("iso", 100)
+        version, values = self.state.snapshot()
+        self.assertIs(self.state.snapshot()[1], values)
+        self.assertEqual(values["iso"], 100)
+        with self.assertRaises(TypeError):
+            values["iso"] = 1
+
+        self.state.set("iso", 400)
+        new_version, new_values = self.state.snapshot()
+        self.assertGreater(new_version, version)
+        self.assertEqual(new_values["iso"], 400)
+        self.assertEqual(values["iso"], 100)
+
+    def test_unsubscribe_and_listener_errors(self):
+        self.state.subscribe(MagicMock(side_effect=RuntimeError("boom")))
+        self.unsubscribe()
+        self.assertTrue(self.state.set("awb", "auto"))
+        self.assertEqual(self.changes, [])
+
+
+class TestCameraStateIntegration(unittest.TestCase):
+    def setUp(self):
+        self.settings = {
+            "files": {"path": "/tmp", "template": "img_{}_{}"},
+            "display": {"width": 100, "height": 100, "fullscreen": False}
+        }
+        self.camera = MockCamera({}, self.settings)
+
+    def test_directory_built_once(self):
+        self.assertIs(self.camera.directory(), self.camera.directory())
+
+    def test_setters_update_state_and_dependents(self):
+        self.camera.state_snapshot()
+        old_size = self.camera.state.get("filesize")
+        changes = []
+        self.camera.state.subscribe(lambda key, old, new: changes.append(key))
+
+        self.camera.directory()["iso"](value=400)
+        self.assertEqual(self.camera.state.get("iso"), 400)
+
+        self.camera.directory()["resolution"](value="640,480")
+        self.assertEqual(self.camera.state.get("resolution"), (640, 480))
+        self.assertNotEqual(self.camera.state.get("filesize"), old_size)
+        self.assertEqual(changes[:3], ["iso", "resolution", "filesize"])
+
+    def test_snapshots_do_not_read_the_camera(self):
+        _, values = self.camera.state_snapshot()
+        reads = self.camera.state.stats["reads"]
+        self.assertEqual(reads, len(self.camera.directory()))
+        self.assertIn("shutter", values)
+
+        for _ in range(100):
+            self.camera.state_snapshot()
+        self.assertEqual(self.camera.state.stats["reads"], reads)
+
+
+class TestGUICameraValues(unittest.TestCase):
+    def setUp(self):
+        self.settings = {
+            "files": {"path": "/tmp", "template": "img_{}_{}"},
+            "display": {"width": 800, "height": 480, "caption": "Test", "fontsize": 20,
+                        "showmenu": True, "refreshrate": 30, "fullscreen": False},
+            "theme": {}
+        }
+        # Imported here so this file doesn't decide which pygame mock the GUI module binds
+        from src.ui.gui import GUI
+        self.camera = MockCamera({}, self.settings)
+        self.gui = GUI(self.settings, {"menus": []}, self.camera)
+
+    def test_render_loop_reads_snapshot(self):
+        self.gui._camera_values()
+        reads = self.camera.state.stats["reads"]
+
+        # Frames within the refresh interval don't touch the camera at all
+        for _ in range(60):
+            values = self.gui._camera_values()
+        self.assertEqual(self.camera.state.stats["reads"], reads)
+        self.assertEqual(values["iso"], self.camera._iso)
+
+        # Values without a setter are re-read once the interval has passed
+        self.gui._state_refresh_time -= self.gui.state_refresh_interval
+        self.gui._camera_values()
+        self.assertEqual(self.camera.state.stats["reads"], reads + len(self.camera.VOLATILE_STATE))
+
+    def test_changes_wake_the_loop(self):
+        self.gui._camera_values()
+        self.assertFalse(self.gui._camera_state_changed)
+        self.camera.directory()["iso"](value=800)
+        self.assertTrue(self.gui._camera_state_changed)
+        self.assertEqual(self.gui._camera_values()["iso"], 800)
+        self.assertFalse(self.gui._camera_state_changed)
+
+    def test_stat_text_formatted_on_change(self):
+        with patch.object(self.gui, "_format_stat_value", side_effect=lambda key, value: f"{key}={value}") as fmt:
+            for _ in range(10):
+                self.assertEqual(self.gui._stat_text_for("iso", 100), "iso=100")
+            self.assertEqual(self.gui._stat_text_for("iso", 200), "iso=200")
+        self.assertEqual(fmt.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
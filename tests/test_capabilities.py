@@ -0,0 +1,128 @@
+"""
+Tests for the on-disk camera capability cache and the startup settings application.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from src.hardware.camera import MockCamera
+from src.hardware.capabilities import CapabilityCache, build_choices
+
+
+def sample_menus():
+    return {"menus": [
+        {"name": "camera", "options": [
+            {"name": "awb", "type": "list", "value": "missing", "options": []},
+            {"name": "exposure", "type": "list", "value": "night", "options": []},
+            {"name": "grid", "type": "list", "value": "off", "options": ["off", "on"]},
+            {"name": "iso", "type": "range", "value": 400, "options": {"min": 0, "max": 800, "step": 100}},
+        ]},
+    ]}
+
+
+class TestCapabilityCache(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_file = os.path.join(self.test_dir, "capabilities.json")
+        self.camera = MagicMock()
+        self.camera.capability_key.return_value = ("RealCamera", "ov5647", "1.13")
+        self.camera.get_supported_options.side_effect = \
+            lambda key: {"awb": ["off", "auto", "sunlight"], "exposure": ["auto", "night"]}.get(key)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_build_choices(self):
+        self.assertEqual(build_choices(["off", "fluorescent_light"]),
+                         [{"value": "off", "displayname": "Off"},
+                          {"value": "fluorescent_light", "displayname": "Fluorescent Light"}])
+
+    def test_second_boot_does_not_ask_the_camera(self):
+        first = CapabilityCache(self.cache_file).choices(self.camera, ["awb", "exposure", "grid"])
+        self.assertEqual(self.camera.get_supported_options.call_count, 3)
+        self.assertIsNone(first["grid"])
+
+        self.camera.get_supported_options.reset_mock()
+        cache = CapabilityCache(self.cache_file)
+        self.assertEqual(cache.choices(self.camera, ["awb", "exposure", "grid"]), first)
+        self.camera.get_supported_options.assert_not_called()
+        self.assertEqual(cache.stats, {"hits": 3, "discovered": 0})
+
+        # A new menu option is discovered on its own
+        cache.choices(self.camera, ["awb", "metering"])
+        self.camera.get_supported_options.assert_called_once_with("metering")
+
+    def test_another_camera_or_library_is_rediscovered(self):
+        CapabilityCache(self.cache_file).choices(self.camera, ["awb"])
+        self.camera.capability_key.return_value = ("RealCamera", "imx219", "1.13")
+        self.camera.get_supported_options.reset_mock()
+        CapabilityCache(self.cache_file).choices(self.camera, ["awb"])
+        self.camera.get_supported_options.assert_called_once_with("awb")
+
+    def test_file_is_kept_out_of_the_capture_queue_directory(self):
+        cache = CapabilityCache.for_settings({"files": {"cache_path": self.test_dir}})
+        self.assertNotEqual(os.path.dirname(cache.cache_file), self.test_dir)
+
+    def test_unreadable_cache_is_ignored(self):
+        with open(self.cache_file, "w") as f:
+            f.write("{not json")
+        choices = CapabilityCache(self.cache_file).choices(self.camera, ["awb"])
+        self.assertEqual(choices["awb"][0]["value"], "off")
+
+    def test_populate_menu_options_uses_the_cache(self):
+        from run import populate_menu_options
+
+        menus = sample_menus()
+        populate_menu_options(menus, self.camera, CapabilityCache(self.cache_file))
+        self.camera.get_supported_options.reset_mock()
+        cached_menus = sample_menus()
+        populate_menu_options(cached_menus, self.camera, CapabilityCache(self.cache_file))
+        self.camera.get_supported_options.assert_not_called()
+
+        self.assertEqual(cached_menus, menus)
+        awb, exposure, grid = cached_menus["menus"][0]["options"][:3]
+        self.assertEqual(awb["value"], "off")  # Unsupported value replaced by the first choice
+        self.assertEqual(exposure["value"], "night")
+        self.assertEqual(grid["options"], ["off", "on"])
+
+
+class TestStartupApply(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        settings = {"files": {"path": self.test_dir, "cache_path": self.test_dir, "template": "img_{}_{}"},
+                    "display": {"width": 100, "height": 100, "fullscreen": False}}
+        self.camera = MockCamera({}, settings)
+
+    def tearDown(self):
+        self.camera.commands.close()
+        shutil.rmtree(self.test_dir)
+
+    def test_values_at_camera_defaults_are_skipped(self):
+        from run import apply_settings_to_camera
+
+        self.camera.directory()
+        width, height = self.camera.directory()["resolution"]()
+        iso = MagicMock(wraps=self.camera._raw_accessors["iso"])
+        awb = MagicMock(wraps=self.camera._raw_accessors["awb"])
+        resolution = MagicMock(wraps=self.camera._raw_accessors["resolution"])
+        self.camera._raw_accessors.update(iso=iso, awb=awb, resolution=resolution)
+        # The layout and database give the resolution as "w,h"; the camera reports a tuple
+        menus = {"menus": [{"name": "camera", "options": [
+            {"name": "iso", "value": 400}, {"name": "awb", "value": "auto"},
+            {"name": "resolution", "value": f"{width},{height}"}]}]}
+
+        apply_settings_to_camera(menus, self.camera)
+        self.assertTrue(self.camera.wait_for_settings())
+        iso.assert_called_once_with(value=400)
+        awb.assert_not_called()
+        resolution.assert_not_called()
+
+    def test_mock_camera_key(self):
+        backend, model, _ = self.camera.capability_key()
+        self.assertEqual((backend, model), ("MockCamera", "mock"))
+
+
+if __name__ == "__main__":
+    unittest.main()
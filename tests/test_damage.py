@@ -0,0 +1,129 @@
+"""
+Tests for damage tracking of the retained UI layer.
+"""
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+
+# Mock pygame before importing the tracker
+sys.modules['pygame'] = MagicMock()
+
+from src.ui.damage import TRANSPARENT, DamageTracker
+
+
+class TestDamageTracker(unittest.TestCase):
+    def setUp(self):
+        self.tracker = DamageTracker((512, 128))
+        self.layer = MagicMock()
+        self.display_patcher = patch('src.ui.damage.pygame.display')
+        self.display = self.display_patcher.start()
+        self.columns = {"level_0": (0, 0, 200, 128), "level_1": (200, 0, 260, 128)}
+        self.stats = (0, 100, 512, 28)
+
+    def tearDown(self):
+        self.display_patcher.stop()
+
+    def _frame(self, columns=None):
+        """Draw the regions like the GUI does; returns the regions drawn and the rects composited."""
+        self.tracker.begin_frame()
+        drawn = [name for name, rect in (columns or self.columns).items()
+                 if self.tracker.begin_region(self.layer, name, rect)]
+        if self.tracker.begin_region(self.layer, "stats", self.stats):
+            drawn.append("stats")
+        rects = self.tracker.end_frame(self.layer)
+        self.tracker.present(rects)
+        return drawn, rects
+
+    def test_first_frame_is_full(self):
+        drawn, rects = self._frame()
+        self.assertEqual(drawn, ["level_0", "level_1", "stats"])
+        self.assertIsNone(rects)
+        self.layer.fill.assert_called_once_with(TRANSPARENT)
+        self.display.flip.assert_called_once()
+        self.assertEqual(self.tracker.stats["last_percent"], 100.0)
+
+    def test_unmarked_frame_draws_and_pushes_nothing(self):
+        self._frame()
+        self.layer.fill.reset_mock()
+        self.assertEqual(self._frame(), ([], []))
+        self.layer.fill.assert_not_called()
+        self.display.update.assert_not_called()
+        self.assertEqual(self.tracker.stats["last_percent"], 0.0)
+
+    def test_marked_region_and_overlapping_later_regions_redrawn(self):
+        self._frame()
+        self.tracker.mark("level_1")
+        drawn, rects = self._frame()
+        # The stats strip is drawn over the bottom of the column, so it is cleared with it
+        self.assertEqual(drawn, ["level_1", "stats"])
+        self.assertEqual(rects, [(200, 0, 260, 128), self.stats])
+        self.layer.fill.assert_any_call(TRANSPARENT, (200, 0, 260, 128))
+
+    def test_only_stats_marked(self):
+        self._frame()
+        self.tracker.mark("stats")
+        self.assertEqual(self._frame(), (["stats"], [self.stats]))
+
+    def test_moved_region_clears_old_and_new_area(self):
+        self._frame()
+        drawn, rects = self._frame({"level_0": (0, 0, 60, 128), "level_1": (60, 0, 260, 128)})
+        self.assertEqual(drawn, ["level_0", "level_1", "stats"])
+        self.assertEqual(rects, [(0, 0, 200, 128), (0, 0, 60, 128), (200, 0, 260, 128),
+                                 (60, 0, 260, 128), self.stats])
+
+    def test_removed_region_is_cleared(self):
+        self._frame()
+        self.tracker.begin_frame()
+        self.tracker.place(self.layer, {"level_0": (0, 0, 200, 128), "level_1": None})
+        self.assertEqual(self.tracker.end_frame(self.layer), [(200, 0, 260, 128)])
+        self.layer.fill.assert_called_with(TRANSPARENT, (200, 0, 260, 128))
+
+    def test_place_clears_left_areas_before_drawing(self):
+        self._frame()
+        self.tracker.begin_frame()
+        # level_1 moves right and its old area overlaps level_0's new one
+        self.tracker.place(self.layer, {"level_0": (0, 0, 250, 128), "level_1": (250, 0, 260, 128)})
+        self.assertTrue(self.tracker.begin_region(self.layer, "level_0", (0, 0, 250, 128)))
+        self.layer.fill.reset_mock()
+        self.assertTrue(self.tracker.begin_region(self.layer, "level_1", (250, 0, 260, 128)))
+        # Only its new area is cleared now, not the part of level_0 drawn a moment ago
+        self.layer.fill.assert_called_once_with(TRANSPARENT, (250, 0, 260, 128))
+
+    def test_screen_overlays_repainted_next_frame(self):
+        self._frame()
+        self.tracker.begin_frame()
+        rects = self.tracker.end_frame(self.layer)
+        self.tracker.add((300, 40, 20, 10))
+        self.tracker.present(rects)
+        self.display.update.assert_called_once_with([(300, 40, 20, 10)])
+
+        # The overlay is gone, so its old area must be composited again
+        self.assertEqual(self._frame(), ([], [(300, 40, 20, 10)]))
+
+    def test_invalidate_forces_full_frame(self):
+        self._frame()
+        self.tracker.invalidate()
+        drawn, rects = self._frame()
+        self.assertEqual(drawn, ["level_0", "level_1", "stats"])
+        self.assertIsNone(rects)
+        self.assertEqual(self.display.flip.call_count, 2)
+
+    def test_full_frame_presented_by_the_camera_ends_the_full_redraw(self):
+        # Hardware overlays return [] even for a full frame; the next frame is incremental anyway
+        self.tracker.begin_frame()
+        for name, rect in list(self.columns.items()) + [("stats", self.stats)]:
+            self.tracker.begin_region(self.layer, name, rect)
+        self.assertIsNone(self.tracker.end_frame(self.layer))
+        self.tracker.present([])
+        self.assertEqual(self._frame(), ([], []))
+
+    def test_background_fills_cleared_areas(self):
+        self._frame()
+        self.tracker.mark("stats")
+        self.tracker.begin_frame((255, 255, 255, 255))
+        self.tracker.begin_region(self.layer, "stats", self.stats)
+        self.layer.fill.assert_called_with((255, 255, 255, 255), self.stats)
+
+
+if __name__ == '__main__':
+    unittest.main()
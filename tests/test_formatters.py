@@ -0,0 +1,96 @@
+"""
+Tests for the precompiled, memoized value formatters.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.ui.formatters import DEFAULT_FORMATTERS, MEMO_SIZE, ValueFormatters, compile_formatter
+from src.ui.layout_parser import LayoutParser
+
+
+class TestCompileFormatter(unittest.TestCase):
+    def test_shutter_speed(self):
+        fmt = compile_formatter({"type": "shutter_speed"})
+        self.assertEqual(fmt(2000000), "2.0s")
+        self.assertEqual(fmt(4000), "1/250")
+        self.assertEqual(fmt(500), "500µs")
+        self.assertEqual(fmt(0), "0")
+        self.assertEqual(fmt("auto"), "auto")
+
+    def test_resolution(self):
+        fmt = compile_formatter({"type": "resolution", "separator": "x"})
+        self.assertEqual(fmt("1920,1080"), "1920x1080")
+        self.assertEqual(fmt((640, 480)), "640x480")
+        self.assertEqual(fmt("max"), "max")
+
+    def test_signed_number(self):
+        fmt = compile_formatter({"type": "signed_number"})
+        self.assertEqual(fmt(3), "+3")
+        self.assertEqual(fmt(-1.5), "-1.5")
+        self.assertEqual(fmt(0), "0")
+
+    def test_prefix_suffix(self):
+        self.assertEqual(compile_formatter({"prefix": "ISO ", "suffix": "!"})(100), "ISO 100!")
+        self.assertIs(compile_formatter({"type": "string"}), str)
+
+
+class TestValueFormatters(unittest.TestCase):
+    def test_memoizes_per_value_and_type(self):
+        formatters = ValueFormatters({"ev": {"type": "signed_number"}})
+        self.assertEqual(formatters.format("ev", 1), "+1")
+        self.assertEqual(formatters.format("ev", 1), "+1")
+        self.assertEqual(formatters.format("ev", 1.0), "+1.0")
+        self.assertEqual(formatters.format("ev", True), "+True")
+        self.assertEqual(formatters.stats, {"calls": 4, "hits": 1})
+
+    def test_unknown_keys_and_unhashable_values(self):
+        formatters = ValueFormatters({"res": {"type": "resolution"}})
+        self.assertEqual(formatters.format("iso", 100), "100")
+        self.assertEqual(formatters.format("res", [1, 2]), "[1, 2]")
+
+    def test_memo_is_bounded(self):
+        formatters = ValueFormatters({"n": {"suffix": "px"}})
+        for value in range(MEMO_SIZE * 3):
+            self.assertEqual(formatters.format("n", value), f"{value}px")
+        self.assertLessEqual(len(formatters._memo["n"]), MEMO_SIZE)
+
+    def test_layout_overrides_defaults(self):
+        formatters = ValueFormatters({"resolution": {"type": "resolution", "separator": "/"}}, DEFAULT_FORMATTERS)
+        self.assertEqual(formatters.format("resolution", "4,3"), "4/3")
+        self.assertEqual(formatters.format("shutter", 4000), "1/250")
+
+
+class TestLayoutFormatters(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        with open(os.path.join(self.test_dir, "main.xml"), "w") as f:
+            f.write("""
+            <layout>
+                <config>
+                    <formatters>
+                        <format key="iso" prefix="ISO " />
+                        <format key="exposurecomp" type="signed_number" />
+                    </formatters>
+                </config>
+            </layout>
+            """)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_compiled_once_from_the_layout_and_its_cache(self):
+        cache_file = os.path.join(self.test_dir, "layout.cache")
+        for expect_cached in (False, True):
+            parser = LayoutParser(layout_dir=self.test_dir, cache_file=cache_file)
+            self.assertEqual(parser.loaded_from_cache, expect_cached)
+            self.assertIs(parser.formatters, parser.formatters)
+            self.assertEqual(parser.format_value("iso", 400), "ISO 400")
+            self.assertEqual(parser.format_value("exposurecomp", 2), "+2")
+            self.assertEqual(parser.format_value("shutter", 4000), "1/250")
+            self.assertEqual(parser.format_value("whitebalance", "auto"), "auto")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+"""
+Tests for the background preview frame grabber and its use in MockCamera.render.
+"""
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+
+# Mock dependencies
+sys.modules['picamera'] = MagicMock()
+sys.modules['pygame'] = MagicMock()
+sys.modules['pygame.camera'] = MagicMock()
+
+from src.hardware.frame_grabber import FrameGrabber
+from src.hardware.camera import MockCamera
+
+
+class SlowSource:
+    """Webcam stand-in that hands out a numbered frame each time it is released."""
+
+    def __init__(self):
+        self.release = threading.Semaphore(0)
+        self.count = 0
+        self.surfaces = []
+
+    def get_image(self, surface=None):
+        self.surfaces.append(surface)
+        if not self.release.acquire(timeout=0.05):
+            raise TimeoutError("no frame")
+        self.count += 1
+        return f"frame-{self.count}"
+
+
+class TestFrameGrabber(unittest.TestCase):
+    def setUp(self):
+        self.source = SlowSource()
+        self.grabber = FrameGrabber(self.source)
+        self.grabber.ERROR_BACKOFF = 0.001
+
+    def tearDown(self):
+        self.grabber.stop()
+
+    def _wait_for(self, seq):
+        deadline = time.time() + 2
+        while self.grabber.seq < seq and time.time() < deadline:
+            time.sleep(0.001)
+
+    def test_latest_does_not_block_on_slow_source(self):
+        self.grabber.start()
+        start = time.perf_counter()
+        self.assertEqual(self.grabber.latest(), (0, None))
+        self.assertLess(time.perf_counter() - start, 0.02)
+
+        self.source.release.release()
+        self._wait_for(1)
+        self.assertEqual(self.grabber.latest(), (1, "frame-1"))
+
+    def test_empty_reads_back_off(self):
+        source = MagicMock()
+        source.get_image.return_value = None
+        grabber = FrameGrabber(source)
+        grabber.ERROR_BACKOFF = 0.02
+        grabber.start()
+        time.sleep(0.1)
+        grabber.stop()
+        self.assertLessEqual(source.get_image.call_count, 10)
+        self.assertEqual(grabber.seq, 0)
+
+    def test_frames_published_with_increasing_sequence(self):
+        self.grabber.start()
+        for i in range(3):
+            self.source.release.release()
+            self._wait_for(i + 1)
+            self.assertEqual(self.grabber.latest(), (i + 1, f"frame-{i + 1}"))
+        self.assertEqual(self.grabber.stats["frames"], 3)
+        self.assertEqual(self.grabber.stats["dropped"], 0)
+
+    def test_unread_frames_counted_as_dropped(self):
+        for i in range(3):
+            self.grabber._publish(self.grabber._next_slot(), f"frame-{i}")
+        self.assertEqual(self.grabber.latest(), (3, "frame-2"))
+        self.assertEqual(self.grabber.stats["dropped"], 2)
+
+    def test_slot_in_use_by_reader_is_not_overwritten(self):
+        self.grabber._publish(0, "a")
+        self.grabber.latest()  # Reader holds slot 0
+        self.grabber._publish(1, "b")  # Slot 1 is now the newest
+        self.assertEqual(self.grabber._next_slot(), 2)
+
+    def test_buffers_are_reused(self):
+        self.grabber._slots = ["old-0", "old-1", "old-2"]
+        self.grabber.start()
+        self.source.release.release()
+        self._wait_for(1)
+        # The device reads into an existing slot surface instead of allocating a new one
+        self.assertEqual(self.source.surfaces[0], "old-0")
+
+    def test_stop_joins_thread(self):
+        self.grabber.start()
+        self.grabber.stop()
+        self.assertFalse(self.grabber.running)
+        self.assertIsNone(self.grabber._thread)
+
+
+class TestMockCameraPreview(unittest.TestCase):
+    def setUp(self):
+        self.settings = {
+            "files": {"path": "/tmp", "template": "img_{}_{}"},
+            "display": {"width": 100, "height": 100, "fullscreen": False}
+        }
+        self.camera = MockCamera({}, self.settings)
+        self.camera.is_previewing = True
+        self.camera.grabber = MagicMock()
+        self.camera.grabber.latest.return_value = (1, self._frame())
+        self.display = MagicMock()
+        self.display.get_size.return_value = (100, 100)
+        self.overlay = MagicMock()
+
+    def _frame(self):
+        frame = MagicMock()
+        frame.get_size.return_value = (200, 100)
+        frame.get_bitsize.return_value = 32
+        return frame
+
+    def test_frame_scaled_once_per_sequence(self):
+        with patch('src.hardware.camera.pygame.transform.scale') as scale:
+            self.assertIsNone(self.camera.render(self.overlay, self.display, []))
+            self.assertEqual(self.camera.render(self.overlay, self.display, []), [])
+            self.assertEqual(scale.call_count, 1)
+            self.assertEqual(scale.call_args[0][1], (100, 50))
+
+            self.camera.grabber.latest.return_value = (2, self._frame())
+            self.assertEqual(self.camera.render(self.overlay, self.display, []), [(0, 25, 100, 50)])
+            self.assertEqual(scale.call_count, 2)
+
+    def test_dirty_rects_repaint_preview_under_overlay(self):
+        with patch('src.hardware.camera.pygame.transform.scale'):
+            self.camera.render(self.overlay, self.display, [])
+        self.display.reset_mock()
+
+        self.assertEqual(self.camera.render(self.overlay, self.display, [(0, 0, 10, 10)]), [(0, 0, 10, 10)])
+        self.display.set_clip.assert_any_call((0, 0, 10, 10))
+        self.display.blit.assert_any_call(self.camera._preview_frame, self.camera._preview_rect)
+        self.display.blit.assert_any_call(self.overlay, (0, 0, 10, 10), (0, 0, 10, 10))
+
+    def test_stop_preview_stops_grabber(self):
+        grabber = self.camera.grabber
+        self.camera.stopPreview()
+        grabber.stop.assert_called_once()
+        self.assertIsNone(self.camera.grabber)
+        self.assertEqual(self.camera.preview_stats(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+"""
+Tests for the per-stage frame profiler.
+"""
+import csv
+import json
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+
+# Mock dependencies
+sys.modules['pygame'] = MagicMock()
+
+from src.ui.profiler import FrameProfiler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, ms):
+        self.now += ms / 1000.0
+
+
+class TestFrameProfiler(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.patcher = patch('src.ui.profiler.time.perf_counter', self.clock)
+        self.patcher.start()
+        self.profiler = FrameProfiler(history=4)
+        self.profiler.set_enabled(True)
+
+    def tearDown(self):
+        self.patcher.stop()
+
+    def _frame(self, menu_ms, present_ms=1.0, extra_ms=0.0):
+        self.profiler.begin_frame()
+        self.clock.advance(menu_ms)
+        self.profiler.lap("menu")
+        self.clock.advance(present_ms)
+        self.profiler.lap("present")
+        self.clock.advance(extra_ms)
+
+    def test_laps_accumulate_per_stage(self):
+        self._frame(5.0, extra_ms=2.0)
+        self.profiler.begin_frame()
+        self.assertEqual(self.profiler.frames, 1)
+        self.assertAlmostEqual(self.profiler.percentiles("menu")[50], 5.0)
+        self.assertAlmostEqual(self.profiler.percentiles("present")[50], 1.0)
+        # Time after the last lap is reported as 'other'
+        self.assertAlmostEqual(self.profiler.percentiles("other")[50], 2.0)
+        self.assertAlmostEqual(self.profiler.percentiles()[50], 8.0)
+
+    def test_frame_percentiles_excluding_stages(self):
+        self._frame(5.0, present_ms=20.0)
+        self.profiler.begin_frame()
+        self.assertAlmostEqual(self.profiler.percentiles()[50], 25.0)
+        self.assertAlmostEqual(self.profiler.percentiles(exclude=("present",))[50], 5.0)
+
+    def test_ring_buffer_keeps_last_frames(self):
+        for ms in (50.0, 1.0, 2.0, 3.0, 4.0, 5.0):
+            self._frame(ms)
+        self.profiler.begin_frame()
+        self.assertEqual(self.profiler.frames, 4)
+        p = self.profiler.percentiles("menu", (0, 100))
+        self.assertAlmostEqual(p[0], 2.0)
+        self.assertAlmostEqual(p[100], 5.0)
+
+    def test_disabled_records_nothing(self):
+        self.profiler.set_enabled(False)
+        self._frame(5.0)
+        self.profiler.begin_frame()
+        self.assertEqual(self.profiler.frames, 0)
+        self.assertEqual(self.profiler.percentiles("menu"), {50: 0.0, 95: 0.0, 99: 0.0})
+
+        # Re-enabling starts from a clean history
+        self.profiler.set_enabled(True)
+        self.assertEqual(self.profiler.frames, 0)
+
+    def test_exports(self):
+        self._frame(5.0)
+        self._frame(7.0)
+        self.profiler.begin_frame()
+        with tempfile.TemporaryDirectory() as directory:
+            trace_path, csv_path = self.profiler.export(directory)
+            with open(trace_path) as f:
+                events = json.load(f)["traceEvents"]
+            with open(csv_path) as f:
+                rows = list(csv.DictReader(f))
+
+        menus = [e for e in events if e["name"] == "menu"]
+        self.assertEqual(len(menus), 2)
+        self.assertEqual(menus[1]["ph"], "X")
+        self.assertAlmostEqual(menus[1]["dur"], 7000.0)
+        self.assertLess(menus[0]["ts"], menus[1]["ts"])
+
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1]["menu"], "7.000")
+        self.assertEqual(rows[1]["total_ms"], "8.000")
+
+    def test_draw_stacks_stage_bars(self):
+        self._frame(10.0, present_ms=5.0)
+        self.profiler.begin_frame()
+        surface = MagicMock()
+        font = MagicMock()
+        font.get_linesize.return_value = 12
+        self.profiler.draw(surface, (0, 0, 100, 200), font, budget_ms=25.0)
+
+        # 100px graph for 50ms, 25px bars (4 frames of history): 20px of menu, then 10px of present on top
+        bars = [c.args[1] for c in surface.fill.call_args_list[1:]]
+        self.assertEqual(bars[:2], [(75, 80, 25, 20), (75, 70, 25, 10)])
+        self.assertTrue(font.render.called)  # The table doesn't go through the shared text cache
+
+
+class TestGUIStages(unittest.TestCase):
+    def setUp(self):
+        settings = {
+            "files": {"path": "/tmp", "template": "img_{}_{}"},
+            "display": {"width": 800, "height": 480, "caption": "Test", "fontsize": 20,
+                        "showmenu": True, "refreshrate": 30, "fullscreen": False},
+            "theme": {}
+        }
+        from src.ui.gui import GUI
+        self.camera = MagicMock()
+        self.camera.render.return_value = []
+        self.gui = GUI(settings, {"menus": []}, self.camera)
+        self.gui.profiler = MagicMock()
+
+    def test_camera_render_has_its_own_stage(self):
+        self.gui._composite_layer()
+        laps = [c.args[0] for c in self.gui.profiler.lap.call_args_list]
+        self.assertEqual(laps, ["overlay", "composite", "camera"])
+        self.camera.render.assert_called_once()
+
+    def test_without_camera_everything_is_composite(self):
+        self.gui.camera = None
+        self.gui._composite_layer()
+        laps = [c.args[0] for c in self.gui.profiler.lap.call_args_list]
+        self.assertEqual(laps, ["overlay", "composite"])
+
+
+if __name__ == '__main__':
+    unittest.main()
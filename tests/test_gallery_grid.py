@@ -0,0 +1,285 @@
+"""
+Tests for the gallery thumbnail grid and the thumbnail store behind it.
+"""
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+import io
+import shutil
+import struct
+import tempfile
+
+# Mock pygame before importing Gallery
+sys.modules['pygame'] = MagicMock()
+import pygame
+
+pygame.time.get_ticks = MagicMock(return_value=0)
+pygame.font.Font = MagicMock(return_value=MagicMock())
+
+from PIL import Image
+from src.ui.gallery import Gallery
+from src.ui.thumbnails import ThumbnailStore, extract_exif_thumbnail
+
+
+def make_exif_with_thumbnail(thumb_bytes):
+    """Build a little-endian EXIF block whose IFD1 points at thumb_bytes."""
+    ifd0 = struct.pack('<H', 0) + struct.pack('<I', 14)  # no entries, next IFD at 14
+    ifd1_offset = 14
+    thumb_offset = ifd1_offset + 2 + 2 * 12 + 4
+    ifd1 = struct.pack('<H', 2)
+    ifd1 += struct.pack('<HHII', 0x0201, 4, 1, thumb_offset)
+    ifd1 += struct.pack('<HHII', 0x0202, 4, 1, len(thumb_bytes))
+    ifd1 += struct.pack('<I', 0)
+    tiff = b'II*\x00' + struct.pack('<I', 8) + ifd0 + ifd1 + thumb_bytes
+    return b'Exif\x00\x00' + tiff
+
+
+class TestThumbnailStore(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.test_dir, 'thumbs')
+        self.store = ThumbnailStore(cache_dir=self.cache_dir, size=(160, 120))
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _write_jpeg(self, name, size=(1600, 1200), exif=None):
+        path = os.path.join(self.test_dir, name)
+        img = Image.new('RGB', size, (200, 50, 50))
+        if exif:
+            img.save(path, 'JPEG', exif=exif)
+        else:
+            img.save(path, 'JPEG')
+        return path
+
+    def test_extract_exif_thumbnail(self):
+        buf = io.BytesIO()
+        Image.new('RGB', (160, 120), (0, 0, 255)).save(buf, 'JPEG')
+        path = self._write_jpeg('with_thumb.jpg', exif=make_exif_with_thumbnail(buf.getvalue()))
+
+        data = extract_exif_thumbnail(path)
+        self.assertEqual(data, buf.getvalue())
+
+    def test_extract_exif_thumbnail_missing(self):
+        path = self._write_jpeg('plain.jpg')
+        self.assertIsNone(extract_exif_thumbnail(path))
+
+    def test_get_prefers_exif_thumbnail(self):
+        buf = io.BytesIO()
+        Image.new('RGB', (160, 120), (0, 0, 255)).save(buf, 'JPEG')
+        path = self._write_jpeg('with_thumb.jpg', exif=make_exif_with_thumbnail(buf.getvalue()))
+
+        thumb = self.store.get(path)
+        self.assertIsNotNone(thumb)
+        self.assertEqual(self.store.stats['exif'], 1)
+        self.assertEqual(self.store.stats['decoded'], 0)
+        # Blue thumbnail rather than the red full image
+        r, g, b = thumb.getpixel((80, 60))
+        self.assertGreater(b, r)
+
+    def test_get_draft_decode_and_disk_cache(self):
+        path = self._write_jpeg('plain.jpg')
+
+        thumb = self.store.get(path)
+        self.assertLessEqual(thumb.size[0], 160)
+        self.assertLessEqual(thumb.size[1], 120)
+        self.assertEqual(self.store.stats['decoded'], 1)
+
+        # Second request is served from the disk cache
+        self.store.get(path)
+        self.assertEqual(self.store.stats['disk_hits'], 1)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+
+    def test_get_missing_file(self):
+        self.assertIsNone(self.store.get(os.path.join(self.test_dir, 'nope.jpg')))
+
+    def test_concurrent_writers_use_their_own_temp_file(self):
+        import threading
+        path = self._write_jpeg('plain.jpg')
+        thumb = Image.new('RGB', (160, 120))
+        target = os.path.join(self.cache_dir, 'thumb.jpg')
+        temp_names = []
+        original_save = thumb.save
+        both_writing = threading.Barrier(2, timeout=5)
+
+        def save(tmp_path, **kwargs):
+            temp_names.append(tmp_path)
+            both_writing.wait()  # Both writers are between choosing a temp name and publishing
+            original_save(tmp_path, **kwargs)
+
+        thumb.save = save
+        writers = [threading.Thread(target=self.store._write, args=(target, thumb)) for _ in range(2)]
+        for writer in writers:
+            writer.start()
+        for writer in writers:
+            writer.join()
+        self.assertEqual(len(set(temp_names)), 2)
+        self.assertEqual(os.listdir(self.cache_dir), ['thumb.jpg'])
+        self.assertIsNotNone(self.store.get(path))
+
+    def test_prune_keeps_most_recently_used(self):
+        paths = [self._write_jpeg(f'{i}.jpg', size=(320, 240)) for i in range(3)]
+        for age, path in enumerate(paths):
+            self.store.get(path)
+            cached = self.store._cache_path(path)
+            os.utime(cached, (1000 + age, 1000 + age))
+        self.store.get(paths[0])  # Disk hit marks it as used
+
+        self.store.prune(keep=2)
+        kept = sorted(os.listdir(self.cache_dir))
+        self.assertEqual(kept, sorted(os.path.basename(self.store._cache_path(p)) for p in (paths[0], paths[2])))
+
+
+class TestGalleryWarmUp(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        for i in range(4):
+            Image.new("RGB", (640, 480), (i * 40, 0, 0)).save(os.path.join(self.test_dir, f"IMG_{i:04d}.jpg"))
+        os.makedirs(os.path.join(self.test_dir, "timelapse_0001"))
+        self.gallery = Gallery({"files": {"path": self.test_dir}, "display": {"fontsize": 20}})
+        self.gallery.thumbnails = ThumbnailStore(cache_dir=os.path.join(self.test_dir, "thumbs"), size=(160, 120))
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_newest_thumbnails_are_prepared_without_touching_the_listing(self):
+        self.assertEqual(self.gallery.warm_up(count=2), 2)
+        self.assertEqual(self.gallery.thumbnails.stats["decoded"], 2)
+        self.assertEqual(self.gallery.files, [])
+
+        self.gallery.thumbnails.get(os.path.join(self.test_dir, "IMG_0003.jpg"))
+        self.assertEqual(self.gallery.thumbnails.stats["disk_hits"], 1)
+
+    def test_missing_folder(self):
+        self.gallery._root_path = os.path.join(self.test_dir, "missing")
+        self.assertEqual(self.gallery.warm_up(), 0)
+
+
+class TestGalleryGrid(unittest.TestCase):
+    def setUp(self):
+        self.settings = {
+            "files": {"path": "test/path"},
+            "display": {"fontsize": 20}
+        }
+        self.gallery = Gallery(self.settings)
+        self.gallery._update_buffer = MagicMock()
+        self.gallery.files = [f"{i:05d}.jpg" for i in range(10000)]
+        self.gallery.active = True
+        self.gallery.current_index = 500
+        # Don't start the decode thread in unit tests
+        self.worker_patcher = patch('src.ui.gallery.threading.Thread')
+        self.mock_thread = self.worker_patcher.start()
+
+    def tearDown(self):
+        self.worker_patcher.stop()
+
+    def _surface(self, width=800, height=480):
+        surface = MagicMock()
+        surface.get_size.return_value = (width, height)
+        return surface
+
+    def test_down_opens_grid_at_current_image(self):
+        self.gallery.handle_event(None, action="down")
+        self.assertEqual(self.gallery.view_mode, "grid")
+        self.assertEqual(self.gallery.grid_index, 500)
+
+    def test_down_hides_metadata_first(self):
+        self.gallery.show_metadata = True
+        self.gallery.handle_event(None, action="down")
+        self.assertFalse(self.gallery.show_metadata)
+        self.assertEqual(self.gallery.view_mode, "single")
+
+    def test_grid_navigation(self):
+        self.gallery.open_grid()
+        self.gallery._grid_columns = 4
+
+        self.gallery.handle_event(None, action="right")
+        self.assertEqual(self.gallery.grid_index, 501)
+        self.gallery.handle_event(None, action="down")
+        self.assertEqual(self.gallery.grid_index, 505)
+        self.gallery.handle_event(None, action="up")
+        self.assertEqual(self.gallery.grid_index, 501)
+        self.gallery.handle_event(None, action="left")
+        self.assertEqual(self.gallery.grid_index, 500)
+
+    def test_grid_navigation_clamps_at_edges(self):
+        self.gallery.open_grid()
+        self.gallery._grid_columns = 4
+        self.gallery.grid_index = 1
+        self.gallery.handle_event(None, action="up")
+        self.assertEqual(self.gallery.grid_index, 1)
+
+        self.gallery.grid_index = 9998
+        self.gallery.handle_event(None, action="down")
+        self.assertEqual(self.gallery.grid_index, 9998)
+
+    def test_enter_returns_to_single_view(self):
+        self.gallery.open_grid()
+        self.gallery.grid_index = 42
+        self.gallery.handle_event(None, action="enter")
+        self.assertEqual(self.gallery.view_mode, "single")
+        self.assertEqual(self.gallery.current_index, 42)
+        self.assertTrue(self.gallery.active)
+
+    def test_back_exits_gallery(self):
+        self.gallery.open_grid()
+        self.gallery.handle_event(None, action="back")
+        self.assertFalse(self.gallery.active)
+
+    def test_window_only_covers_visible_rows_plus_margin(self):
+        self.gallery.open_grid()
+        self.gallery.render(self._surface())
+
+        cols, _, cell_h, view_h = self.gallery._get_grid_geometry(800, 480)
+        visible_rows = view_h // cell_h + 1
+        max_rows = visible_rows + 1 + 2 * self.gallery.GRID_MARGIN_ROWS
+
+        start, end = self.gallery._thumb_window
+        self.assertLessEqual(end - start, max_rows * cols)
+        self.assertLessEqual(len(self.gallery._thumb_pending), max_rows * cols)
+        self.assertIn(self.gallery.files[500], self.gallery._thumb_wanted)
+
+    def test_scrolling_evicts_distant_thumbnails(self):
+        self.gallery.open_grid()
+        surface = self._surface()
+        self.gallery.render(surface)
+        first = self.gallery.files[500]
+        self.gallery.thumb_cache[first] = MagicMock()
+
+        # Jump far away and let the scroll settle
+        self.gallery.grid_index = 9000
+        for _ in range(60):
+            self.gallery.render(surface)
+
+        self.assertNotIn(first, self.gallery.thumb_cache)
+        self.assertNotIn(first, self.gallery._thumb_wanted)
+        self.assertIn(self.gallery.files[9000], self.gallery._thumb_wanted)
+
+    def test_visible_thumbnails_queued_first(self):
+        self.gallery.open_grid()
+        self.gallery.grid_index = 5000
+        surface = self._surface()
+        for _ in range(60):
+            self.gallery.render(surface)
+
+        self.gallery._thumb_window = None
+        self.gallery.render(surface)
+        first_pending = self.gallery._thumb_pending[0]
+        cols = self.gallery._grid_columns
+        # The first queued cell must be on screen, not in the margin row above
+        scroll = int(self.gallery._grid_scroll)
+        _, _, cell_h, _ = self.gallery._get_grid_geometry(800, 480)
+        first_visible = (scroll // cell_h) * cols
+        self.assertGreaterEqual(self.gallery.files.index(first_pending), first_visible)
+
+    def test_exit_clears_thumbnails(self):
+        self.gallery.open_grid()
+        self.gallery.thumb_cache["00001.jpg"] = MagicMock()
+        self.gallery.exit()
+        self.assertEqual(self.gallery.thumb_cache, {})
+        self.assertEqual(self.gallery.view_mode, "single")
+
+
+if __name__ == '__main__':
+    unittest.main()
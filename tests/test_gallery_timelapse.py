@@ -0,0 +1,187 @@
+"""
+Tests for browsing timelapse session folders in the gallery.
+"""
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+import shutil
+import tempfile
+from datetime import datetime
+
+# Mock pygame before importing Gallery
+sys.modules['pygame'] = MagicMock()
+import pygame
+
+pygame.time.get_ticks = MagicMock(return_value=0)
+pygame.font.Font = MagicMock(return_value=MagicMock())
+
+from src.ui.gallery import Gallery
+
+
+class TestGalleryTimelapse(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        for name in ("2025-01-01-1.jpg", "2025-01-01-2.jpg"):
+            open(os.path.join(self.test_dir, name), "wb").close()
+        self.session = "timelapse_20250101_120000"
+        session_dir = os.path.join(self.test_dir, self.session)
+        os.makedirs(session_dir)
+        for i in range(1, 13):
+            open(os.path.join(session_dir, f"2025-01-01-{i}.jpg"), "wb").close()
+        os.makedirs(os.path.join(self.test_dir, "not_a_session"))
+
+        self.gallery = Gallery({"files": {"path": self.test_dir, "cache_path": os.path.join(self.test_dir, "cache")},
+                                "display": {"fontsize": 20}})
+        self.gallery._update_buffer = MagicMock()
+        self.worker_patcher = patch('src.ui.gallery.threading.Thread')
+        self.mock_thread = self.worker_patcher.start()
+        self.ticks_patcher = patch('src.ui.gallery.pygame.time.get_ticks', return_value=0)
+        self.mock_ticks = self.ticks_patcher.start()
+
+    def tearDown(self):
+        self.worker_patcher.stop()
+        self.ticks_patcher.stop()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_session_listed_as_single_entry(self):
+        self.gallery.enter()
+        self.assertEqual(self.gallery.files, ["2025-01-01-1.jpg", "2025-01-01-2.jpg", self.session])
+        self.assertTrue(self.gallery.is_session(self.session))
+        # Frames are not enumerated just by entering the gallery
+        self.assertEqual(self.gallery._session_info, {})
+
+    def test_session_info_count_and_cover(self):
+        self.gallery.enter()
+        info = self.gallery.get_session_info(self.session)
+        self.assertEqual(info["count"], 12)
+        self.assertEqual(info["cover"], "2025-01-01-1.jpg")
+        self.assertEqual(
+            self.gallery._entry_image_path(self.session),
+            os.path.join(self.test_dir, self.session, "2025-01-01-1.jpg"))
+
+    def test_session_metadata_without_opening_the_folder_as_an_image(self):
+        self.gallery.enter()
+        session_dir = os.path.join(self.test_dir, self.session)
+        first = datetime(2025, 1, 1, 12, 0, 0).timestamp()
+        os.utime(os.path.join(session_dir, "2025-01-01-1.jpg"), (first, first))
+        os.utime(os.path.join(session_dir, "2025-01-01-12.jpg"), (first + 660, first + 660))
+
+        with patch('builtins.print') as mock_print:
+            meta = self.gallery._get_image_metadata(self.session)
+        mock_print.assert_not_called()
+        self.assertEqual(meta["File"], self.session)
+        self.assertEqual(meta["Size"], "12 frames")
+        self.assertEqual(meta["Date"], "2025-01-01 12:00:00 - 12:11:00")
+
+    def test_enter_opens_session_in_frame_order(self):
+        self.gallery.enter()
+        self.assertEqual(self.gallery.current_index, 2)
+        self.gallery.handle_event(None, action="enter")
+
+        self.assertTrue(self.gallery.active)
+        self.assertEqual(self.gallery.session, self.session)
+        self.assertEqual(len(self.gallery.files), 12)
+        self.assertEqual(self.gallery.files[8:10], ["2025-01-01-9.jpg", "2025-01-01-10.jpg"])
+        self.assertEqual(self.gallery.current_index, 0)
+
+    def test_back_returns_to_session_entry(self):
+        self.gallery.enter()
+        self.gallery.open_session(self.session)
+        self.gallery.handle_event(None, action="back")
+
+        self.assertTrue(self.gallery.active)
+        self.assertIsNone(self.gallery.session)
+        self.assertEqual(self.gallery.files[self.gallery.current_index], self.session)
+
+    def test_file_positions_follow_the_listing(self):
+        self.gallery.enter()
+        self.assertEqual(self.gallery.index_of(self.session), 2)
+        self.assertEqual(self.gallery.index_of("missing.jpg"), -1)
+        self.gallery.open_session(self.session)
+        self.assertEqual(self.gallery.index_of("2025-01-01-10.jpg"), 9)
+        self.assertEqual(self.gallery.index_of(self.session), -1)
+
+    def test_session_badge_background_is_reused(self):
+        self.gallery.enter()
+        text = MagicMock()
+        text.get_width.return_value, text.get_height.return_value = 100, 20
+        self.gallery.text_cache.render = MagicMock(return_value=text)
+
+        def make_surface(size, flags=0):
+            surf = MagicMock()
+            surf.get_size.return_value = size
+            return surf
+
+        gallery_pygame = Gallery._draw_session_badge.__globals__["pygame"]
+        with patch.object(gallery_pygame, "Surface", side_effect=make_surface) as surface_class:
+            for _ in range(3):
+                self.gallery._draw_session_badge(MagicMock(), self.session, 10, 10)
+        surface_class.assert_called_once_with((108, 24), gallery_pygame.SRCALPHA)
+
+    def test_scrub_defers_full_resolution_loading(self):
+        self.gallery.enter()
+        self.gallery.open_session(self.session)
+        self.gallery._update_buffer.reset_mock()
+
+        for _ in range(5):
+            self.gallery.handle_event(None, action="right")
+        self.assertEqual(self.gallery.current_index, 5)
+        self.assertFalse(self.gallery.animating)
+        self.gallery._update_buffer.assert_not_called()
+        # Previews requested for the current frame and the next ones
+        self.assertEqual(
+            self.gallery._preview_request,
+            [os.path.join(self.gallery.path, f"2025-01-01-{i}.jpg") for i in (6, 7, 8)])
+
+        surface = MagicMock()
+        surface.get_size.return_value = (800, 480)
+        self.mock_ticks.return_value = self.gallery.SCRUB_SETTLE_MS
+        self.gallery.render(surface)
+        self.gallery._update_buffer.assert_called_once()
+
+    def test_unreadable_frame_is_not_decoded_again(self):
+        self.gallery.enter()
+        self.gallery.open_session(self.session)
+        self.assertTrue(self.gallery.scrub_previews.cache_dir.startswith(self.test_dir))
+        filepath = os.path.join(self.gallery.path, "2025-01-01-1.jpg")  # Empty file
+        self.gallery.scrub_previews.get = MagicMock(return_value=None)
+        self.gallery._preview_request = [filepath]
+        self.gallery.active = False  # Worker returns once the queue is empty
+        self.gallery._preview_worker_loop()
+
+        self.assertIn(filepath, self.gallery.preview_cache)
+        self.gallery.active = True
+        self.gallery._preview_request = []
+        surface = MagicMock()
+        surface.get_size.return_value = (800, 480)
+        self.gallery._draw_image(surface, "2025-01-01-1.jpg", 0)
+        self.assertEqual(self.gallery._preview_request, [])
+        self.gallery.scrub_previews.get.assert_called_once()
+
+    def test_scrub_clamps_at_ends(self):
+        self.gallery.enter()
+        self.gallery.open_session(self.session)
+        self.gallery.handle_event(None, action="left")
+        self.assertEqual(self.gallery.current_index, 0)
+
+    def test_grid_enter_opens_session(self):
+        self.gallery.enter()
+        self.gallery.open_grid()
+        self.gallery.handle_event(None, action="enter")
+        self.assertEqual(self.gallery.session, self.session)
+        self.assertEqual(self.gallery.view_mode, "single")
+
+    def test_shutter_on_session_exports_video(self):
+        self.gallery.enter()
+        self.gallery.handle_event(None, action="shutter")
+
+        job = self.gallery.video_jobs[self.session]
+        self.assertEqual(job.output_path, os.path.join(self.test_dir, self.session, f"{self.session}.avi"))
+        self.assertEqual(len(job.frames), 12)
+        self.assertTrue(job.frames[9].endswith("2025-01-01-10.jpg"))
+        self.assertIsNone(self.gallery.zoom_scale)
+
+
+if __name__ == '__main__':
+    unittest.main()
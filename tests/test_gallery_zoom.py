@@ -0,0 +1,245 @@
+"""
+Tests for the gallery's tiled zoom and the tile pyramid behind it.
+"""
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+import shutil
+import tempfile
+
+# Mock pygame before importing Gallery
+sys.modules['pygame'] = MagicMock()
+import pygame
+
+pygame.time.get_ticks = MagicMock(return_value=0)
+pygame.font.Font = MagicMock(return_value=MagicMock())
+
+from PIL import Image
+from src.ui.gallery import Gallery
+from src.ui.tiles import TileCache, TilePyramid, prune_tile_cache
+
+
+class TestTilePyramid(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.test_dir, 'tiles')
+        self.path = os.path.join(self.test_dir, 'big.jpg')
+        Image.new('RGB', (2000, 1500), (10, 200, 10)).save(self.path, 'JPEG')
+        self.pyramid = TilePyramid(self.path, cache_dir=self.cache_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_level_for_scale(self):
+        self.assertEqual(self.pyramid.level_for_scale(0.1), 8)
+        self.assertEqual(self.pyramid.level_for_scale(0.25), 4)
+        self.assertEqual(self.pyramid.level_for_scale(0.3), 2)
+        self.assertEqual(self.pyramid.level_for_scale(1.0), 1)
+        self.assertEqual(self.pyramid.level_for_scale(2.0), 1)
+
+    def test_tile_grid_and_edges(self):
+        self.assertEqual(self.pyramid.tile_grid(1), (8, 6))
+        self.assertEqual(self.pyramid.tile_box(1, 7, 5), (1792, 1280, 2000, 1500))
+
+    def test_visible_tiles(self):
+        # 800x480 window at 100% starting at the origin
+        tiles = self.pyramid.visible_tiles(1, (0, 0, 800, 480))
+        self.assertEqual(tiles, [(tx, ty) for ty in range(2) for tx in range(4)])
+        # Whole image at 1/8 fits in a single tile
+        self.assertEqual(self.pyramid.visible_tiles(8, (0, 0, 2000, 1500)), [(0, 0)])
+
+    def test_level_decoded_once_then_read_from_disk(self):
+        delivered = []
+        tiles = self.pyramid.load_tiles(1, [(3, 2)], on_tile=lambda pos, t: delivered.append(pos))
+        self.assertEqual(delivered, [(3, 2)])
+        self.assertEqual(tiles[(3, 2)].size, (256, 256))
+        self.assertEqual(self.pyramid.stats['level_decodes'], 1)
+
+        # Nothing is written until the caller has time for it, visible tile first
+        self.assertFalse(os.path.exists(self.pyramid._tile_path(1, 3, 2)))
+        self.assertTrue(self.pyramid.persist_pending(limit=1))
+        self.assertEqual(os.listdir(os.path.join(self.cache_dir, os.listdir(self.cache_dir)[0], '1')), ['3_2.jpg'])
+
+        # Tiles not written yet come from the decoded level, not a second decode
+        self.pyramid.load_tiles(1, [(0, 0), (7, 5)])
+        self.assertEqual(self.pyramid.stats['level_decodes'], 1)
+        self.assertEqual(self.pyramid.stats['disk_tiles'], 0)
+
+        while self.pyramid.persist_pending(limit=16):
+            pass
+        self.assertIsNone(self.pyramid._level)
+        self.pyramid.load_tiles(1, [(0, 0), (7, 5)])
+        self.assertEqual(self.pyramid.stats['level_decodes'], 1)
+        self.assertEqual(self.pyramid.stats['disk_tiles'], 2)
+
+    def test_levels_over_the_size_limit_are_not_built(self):
+        with patch.object(TilePyramid, 'MAX_LEVEL_PIXELS', 1_000_000):
+            # 2000x1500 at 1/1 is 3 MP; 1000x750 at 1/2 fits
+            self.assertEqual(self.pyramid.finest_level, 2)
+            self.assertEqual(self.pyramid.level_for_scale(1.0), 2)
+            self.assertEqual(self.pyramid.level_for_scale(0.1), 8)
+            self.assertEqual(self.pyramid.load_tiles(1, [(0, 0)]), {})
+        self.assertEqual(self.pyramid.stats['level_decodes'], 0)
+
+    def test_missing_tile_of_a_complete_level_is_rebuilt(self):
+        self.pyramid.load_tiles(8, [(0, 0)])
+        while self.pyramid.persist_pending():
+            pass
+        self.assertTrue(self.pyramid._level_complete(8))
+        os.remove(self.pyramid._tile_path(8, 0, 0))
+
+        self.assertIn((0, 0), self.pyramid.load_tiles(8, [(0, 0)]))
+        self.assertEqual(self.pyramid.stats['level_decodes'], 2)
+        self.assertFalse(self.pyramid._level_complete(8))
+
+    def test_reduced_level_size(self):
+        tiles = self.pyramid.load_tiles(8, [(0, 0)])
+        self.assertEqual(tiles[(0, 0)].size, (250, 188))
+
+    def test_prune_keeps_most_recent(self):
+        for name in ('a', 'b', 'c'):
+            os.makedirs(os.path.join(self.cache_dir, name))
+        os.utime(os.path.join(self.cache_dir, 'a'), (1, 1))
+        prune_tile_cache(self.cache_dir, keep=2)
+        self.assertEqual(sorted(os.listdir(self.cache_dir)), ['b', 'c'])
+
+
+class TestTileCache(unittest.TestCase):
+    def test_lru_eviction(self):
+        cache = TileCache(max_tiles=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertEqual(len(cache), 2)
+
+
+class TestGalleryZoom(unittest.TestCase):
+    def setUp(self):
+        self.settings = {
+            "files": {"path": "test/path"},
+            "display": {"fontsize": 20}
+        }
+        self.gallery = Gallery(self.settings)
+        self.gallery._update_buffer = MagicMock()
+        self.gallery.files = ["a.jpg", "b.jpg"]
+        self.gallery.active = True
+        self.gallery._display_size = (800, 480)
+
+        self.pyramid = MagicMock()
+        self.pyramid.filepath = os.path.join("test/path", "a.jpg")
+        self.pyramid.size = (4000, 3000)
+        self.gallery._pyramid = self.pyramid
+
+        self.worker_patcher = patch('src.ui.gallery.threading.Thread')
+        self.mock_thread = self.worker_patcher.start()
+
+    def tearDown(self):
+        self.worker_patcher.stop()
+
+    def test_shutter_steps_through_zoom_levels(self):
+        # Fit scale is 0.16, so the first step is 25%
+        self.gallery.handle_event(None, action="shutter")
+        self.assertEqual(self.gallery.zoom_scale, 0.25)
+        self.assertEqual(self.gallery.zoom_center, (2000, 1500))
+        for expected in (0.5, 1.0, 2.0):
+            self.gallery.handle_event(None, action="shutter")
+            self.assertEqual(self.gallery.zoom_scale, expected)
+        # Past the last step wraps back to fit
+        self.gallery.handle_event(None, action="shutter")
+        self.assertIsNone(self.gallery.zoom_scale)
+
+    def test_arrows_pan_instead_of_navigating(self):
+        self.gallery.set_zoom(1.0)
+        self.gallery.handle_event(None, action="right")
+        self.assertEqual(self.gallery.current_index, 0)
+        self.assertEqual(self.gallery.zoom_center, (2200, 1500))
+        self.gallery.handle_event(None, action="up")
+        self.assertEqual(self.gallery.zoom_center, (2200, 1380))
+
+    def test_pan_is_clamped_to_image(self):
+        self.gallery.set_zoom(1.0)
+        for _ in range(50):
+            self.gallery.pan(-1, 1)
+        self.assertEqual(self.gallery.zoom_center, (400, 2760))
+
+    def test_back_resets_zoom_without_exiting(self):
+        self.gallery.set_zoom(1.0)
+        self.gallery.handle_event(None, action="back")
+        self.assertIsNone(self.gallery.zoom_scale)
+        self.assertTrue(self.gallery.active)
+
+    def test_render_requests_only_visible_tiles(self):
+        self.pyramid.level_for_scale.return_value = 1
+        self.pyramid.visible_tiles.return_value = [(7, 5), (8, 5)]
+        self.pyramid.tile_box.return_value = (0, 0, 256, 256)
+        self.gallery.set_zoom(1.0)
+
+        surface = MagicMock()
+        surface.get_size.return_value = (800, 480)
+        self.gallery.render(surface)
+
+        self.pyramid.visible_tiles.assert_called_with(1, (1600.0, 1260.0, 2400.0, 1740.0))
+        self.assertEqual(self.gallery._tile_request[2], [(7, 5), (8, 5)])
+        self.mock_thread.assert_called_once()
+
+    def test_cached_tiles_are_not_requested(self):
+        self.pyramid.level_for_scale.return_value = 1
+        self.pyramid.visible_tiles.return_value = [(7, 5)]
+        self.pyramid.tile_box.return_value = (0, 0, 256, 256)
+        self.gallery.set_zoom(1.0)
+        self.gallery.tile_cache.put((self.pyramid.filepath, 1, 7, 5), MagicMock())
+
+        surface = MagicMock()
+        surface.get_size.return_value = (800, 480)
+        self.gallery.render(surface)
+        self.assertIsNone(self.gallery._tile_request)
+
+    def test_tiles_that_fail_to_load_are_not_requested_every_frame(self):
+        self.pyramid.level_for_scale.return_value = 1
+        self.pyramid.visible_tiles.return_value = [(7, 5)]
+        self.pyramid.tile_box.return_value = (0, 0, 256, 256)
+        self.pyramid.persist_pending.return_value = False
+        self.gallery.set_zoom(1.0)
+        surface = MagicMock()
+        surface.get_size.return_value = (800, 480)
+        self.gallery.render(surface)
+
+        # The worker gets nothing back for the tile, then the gallery closes
+        def load_tiles(reduce, tiles, on_tile=None):
+            self.gallery.active = False
+            return {}
+        self.pyramid.load_tiles.side_effect = load_tiles
+        self.gallery._tile_worker_loop()
+        self.assertIsNone(self.gallery._tile_request_key)
+
+        self.gallery.active = True
+        self.gallery.render(surface)
+        self.assertIsNone(self.gallery._tile_request)
+        self.assertEqual(self.mock_thread.call_count, 1)
+
+    def test_tiles_are_cached_once_for_every_zoom(self):
+        self.pyramid.level_for_scale.return_value = 1
+        self.pyramid.visible_tiles.return_value = [(7, 5)]
+        self.pyramid.tile_box.return_value = (0, 0, 256, 256)
+        self.gallery.tile_cache.put((self.pyramid.filepath, 1, 7, 5), MagicMock())
+        surface = MagicMock()
+        surface.get_size.return_value = (800, 480)
+
+        with patch('src.ui.gallery.pygame.transform.scale') as scale:
+            scale.return_value.get_size.return_value = (384, 384)
+            self.gallery.set_zoom(1.5)
+            self.gallery.render(surface)
+            self.gallery.render(surface)
+            self.gallery.set_zoom(2.0)
+            self.gallery.render(surface)
+        self.assertIsNone(self.gallery._tile_request)
+        # Scaled once per zoom, not once per frame
+        self.assertEqual(scale.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
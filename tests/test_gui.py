@@ -28,6 +28,56 @@ class TestGUI(unittest.TestCase):
         
         self.gui = GUI(self.settings, self.menus)
 
+    def test_warm_icons_uses_the_given_layout(self):
+        import os
+        import tempfile
+        icon_dir = tempfile.mkdtemp()
+        for name in ("iso.png", "awb.png", "iso.svg"):
+            open(os.path.join(icon_dir, name), "w").close()
+        layout = MagicMock()
+        layout.get_icon_path.return_value = icon_dir
+        layout.get_icon_extension.return_value = ".png"
+        pygame.image.load = MagicMock(side_effect=lambda path: f"surface:{path}")
+
+        self.gui._icon_sources.clear()
+        self.assertEqual(self.gui.warm_icons(layout), 2)
+        self.assertEqual(self.gui._read_icon(f"{icon_dir}/iso.png"), f"surface:{icon_dir}/iso.png")
+        self.assertEqual(sorted(c.args[0] for c in pygame.image.load.call_args_list),
+                         [f"{icon_dir}/awb.png", f"{icon_dir}/iso.png"])
+        for name in os.listdir(icon_dir):
+            os.remove(os.path.join(icon_dir, name))
+        os.rmdir(icon_dir)
+
+    def _draw_column(self, items):
+        self.gui.damage.begin_frame()
+        self.gui._render_container("level_0", items, 0)
+        self.gui.damage.end_frame(self.gui.layer)
+        return self.gui.text_cache.render.call_count
+
+    def test_clean_menu_column_is_not_redrawn(self):
+        from types import SimpleNamespace
+        self.assertIsNotNone(self.gui.layout)
+        container = MagicMock(rect=(0, 0, 200, 480), item_height=40, padding=5, orientation="vertical")
+        self.gui._render_plan = MagicMock(return_value=SimpleNamespace(containers={"level_0": container}))
+        self.gui.layer = MagicMock()
+        self.gui.text_cache.render = MagicMock()
+        self.gui.text_cache.render.return_value.get_rect.return_value = SimpleNamespace(width=10, height=10)
+        items = [{"name": "first item"}, {"name": "second item"}]  # No icons
+
+        drawn = self._draw_column(items)
+        self.assertGreater(drawn, 0)
+        self.assertEqual(self._draw_column(items), drawn)  # Nothing changed, nothing drawn
+
+        self.gui.damage.mark("level_0")
+        self.assertGreater(self._draw_column(items), drawn)
+
+    def test_camera_state_change_marks_only_the_stats(self):
+        self.gui.damage.begin_frame()
+        for name in self.gui.UI_REGIONS:
+            self.gui.damage.begin_region(self.gui.layer, name, (0, 0, 10, 10))
+        self.gui._on_camera_state_change("iso", 100, 200)
+        self.assertEqual(self.gui.damage._marked, {"stats"})
+
     def test_parse_dimension_pixels(self):
         val = self.gui._parse_dimension("100", 1000)
         self.assertEqual(val, 100)
@@ -0,0 +1,125 @@
+"""
+Tests for idle detection and idle waiting in the GUI main loop.
+"""
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+
+# Mock pygame
+sys.modules['pygame'] = MagicMock()
+import pygame
+
+from src.ui.gui import GUI
+from src.ui.controls import MenuController
+
+
+class TestGUIIdle(unittest.TestCase):
+    def setUp(self):
+        self.settings = {
+            "display": {
+                "width": 800,
+                "height": 480,
+                "caption": "Test",
+                "fontsize": 20,
+                "showmenu": True,
+                "refreshrate": 30
+            },
+            "theme": {}
+        }
+        # Patch the module GUI was defined in; other tests may reload src.ui.gui
+        self.pg = MagicMock()
+        self.pygame_patcher = patch.dict(GUI.run.__globals__, {"pygame": self.pg})
+        self.pygame_patcher.start()
+        self.pg.time.get_ticks.return_value = 100000
+        self.pg.NOEVENT = 0
+
+        self.camera = MagicMock()
+        self.camera.preview_needs_redraw.return_value = False
+        self.gui = GUI(self.settings, {"menus": []}, self.camera)
+        self.gui._splash_active = False
+        self.gui.gallery.active = False
+        self.gui.transition_start = 0
+        self.gui.flash_start_time = 0
+        MenuController._pending_quick_change = {}
+
+    def tearDown(self):
+        self.pygame_patcher.stop()
+
+    def test_static_menu_is_idle(self):
+        self.assertTrue(self.gui._is_idle())
+
+    def test_activity_prevents_idle(self):
+        cases = [
+            ("_highlight_animations", {"level_0": {}}),
+            ("_stat_animations", {"iso": {}}),
+            ("_text_scrolling", True),
+            ("timer_active", True),
+            ("timelapse_active", True),
+            ("_splash_active", True),
+        ]
+        for attr, value in cases:
+            original = getattr(self.gui, attr)
+            setattr(self.gui, attr, value)
+            self.assertFalse(self.gui._is_idle(), attr)
+            setattr(self.gui, attr, original)
+
+    def test_transition_flash_and_preview_prevent_idle(self):
+        self.gui.transition_start = 100000 - 10
+        self.assertFalse(self.gui._is_idle())
+        self.gui.transition_start = 0
+
+        self.gui.flash_start_time = 100000 - 1
+        self.assertFalse(self.gui._is_idle())
+        self.gui.flash_start_time = 0
+
+        self.camera.preview_needs_redraw.return_value = True
+        self.assertFalse(self.gui._is_idle())
+
+    def test_pending_quick_change_prevents_idle(self):
+        MenuController._pending_quick_change = {"iso": {}}
+        self.assertFalse(self.gui._is_idle())
+        MenuController._pending_quick_change = {}
+
+    def test_hiding_the_menu_mid_scroll_lets_the_loop_idle(self):
+        self.gui._text_scrolling = True
+        self.gui._highlight_animations["level_1"] = {"start_time": 100000, "from_index": 0, "to_index": 1}
+        self.settings["display"]["showmenu"] = False
+        self.pg.event.get.return_value = []
+        self.gui._cleanup = MagicMock()
+        self.gui._render_camera_overlay = MagicMock()
+        # The first idle wait ends the run
+        self.gui._wait_while_idle = MagicMock(side_effect=lambda buttons: setattr(self.gui, "running", False))
+
+        self.gui.run(MagicMock(), MagicMock())
+
+        self.gui._wait_while_idle.assert_called_once()
+        self.assertFalse(self.gui._text_scrolling)
+        self.assertEqual(self.gui._highlight_animations, {})
+
+    def test_wait_returns_on_input(self):
+        key_event = MagicMock(type=2)
+        self.pg.event.wait.return_value = key_event
+        buttons = MagicMock(buttons={})
+
+        self.gui._wait_while_idle(buttons)
+
+        self.pg.event.wait.assert_called_once()
+        self.assertLessEqual(self.pg.event.wait.call_args[0][0], self.gui.idle_refresh_ms)
+        self.assertIs(self.gui._held_event, key_event)
+        self.assertTrue(self.gui.telemetry["idle"])
+
+    def test_wait_polls_hardware_buttons(self):
+        self.gui.idle_refresh_ms = 100
+        self.pg.event.wait.return_value = MagicMock(type=0)
+        self.pg.event.peek.side_effect = [False, True]
+        buttons = MagicMock(buttons={"shutter": {}})
+
+        self.gui._wait_while_idle(buttons)
+
+        self.assertEqual(buttons.listen.call_count, 2)
+        self.assertLessEqual(self.pg.event.wait.call_args[0][0], self.gui.idle_poll_ms)
+        self.assertIsNone(self.gui._held_event)
+
+
+if __name__ == '__main__':
+    unittest.main()
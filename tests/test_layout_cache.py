@@ -0,0 +1,86 @@
+"""
+Tests for the serialized layout cache used for fast cold starts.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.ui.layout_parser import LayoutParser
+
+
+class TestLayoutCache(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_file = os.path.join(self.test_dir, "cache", "layout.cache")
+        self.theme = {"theme": {"colors": {"bg": "#102030"}}}
+        self._write_layout("Camera")
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _write_layout(self, displayname):
+        with open(os.path.join(self.test_dir, "main.xml"), "w") as f:
+            f.write(f"""
+            <layout>
+                <menus>
+                    <menu name="camera" displayname="{displayname}">
+                        <item name="iso" type="range" min="0" max="800" step="100" value="0" />
+                    </menu>
+                </menus>
+                <mode name="camera">
+                    <container id="level_0" x="0" y="0" bg_color="@bg" font_size="18" />
+                </mode>
+            </layout>
+            """)
+
+    def _parser(self, theme=None):
+        return LayoutParser(theme or self.theme, self.test_dir, cache_file=self.cache_file)
+
+    def test_second_start_loads_from_cache(self):
+        first = self._parser()
+        self.assertFalse(first.loaded_from_cache)
+        self.assertTrue(os.path.exists(self.cache_file))
+
+        second = self._parser()
+        self.assertTrue(second.loaded_from_cache)
+        for name in LayoutParser.CACHED_STATE:
+            self.assertEqual(getattr(second, name), getattr(first, name), name)
+
+        second.load_layout("camera")
+        self.assertEqual(second.current_mode_name, "camera")
+        self.assertEqual(second.get_element_by_id("level_0")["bg_color"], "#102030")
+        # The XML tree itself is only parsed if something asks for it
+        self.assertIsNone(second._main_layout)
+        self.assertEqual(second.main_layout.tag, "layout")
+
+    def test_changed_sources_reparse(self):
+        self._parser()
+        self._write_layout("Photo")
+        parser = self._parser()
+        self.assertFalse(parser.loaded_from_cache)
+        self.assertEqual(parser.get_menu("camera")["displayname"], "Photo")
+
+        # Theme values are baked into the parse, so a new theme misses too
+        themed = self._parser({"theme": {"colors": {"bg": "#FFFFFF"}}})
+        self.assertFalse(themed.loaded_from_cache)
+        themed.load_layout("camera")
+        self.assertEqual(themed.get_element_by_id("level_0")["bg_color"], "#FFFFFF")
+
+    def test_unreadable_cache_is_ignored(self):
+        os.makedirs(os.path.dirname(self.cache_file))
+        with open(self.cache_file, "wb") as f:
+            f.write(b"not a cache")
+        parser = self._parser()
+        self.assertFalse(parser.loaded_from_cache)
+        self.assertEqual(parser.get_menu("camera")["displayname"], "Camera")
+        self.assertTrue(self._parser().loaded_from_cache)
+
+    def test_no_cache_file_by_default(self):
+        parser = LayoutParser(self.theme, self.test_dir)
+        self.assertFalse(parser.loaded_from_cache)
+        self.assertFalse(os.path.exists(self.cache_file))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+"""
+Tests for the process-wide shared layout registry.
+"""
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from src.ui.layout_registry import LayoutRegistry, get_layout_registry
+
+
+class TestLayoutRegistry(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.main_file = os.path.join(self.test_dir, "main.xml")
+        self._write_layout("Camera", "#FF0000")
+        self.settings = {"theme": {}}
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _write_layout(self, displayname, color, mtime=None):
+        with open(self.main_file, "w") as f:
+            f.write(f"""
+            <layout>
+                <config>
+                    <mode_colors><color mode="auto" value="{color}" /></mode_colors>
+                </config>
+                <menus>
+                    <menu name="camera" displayname="{displayname}">
+                        <item name="iso" type="list" value="0">
+                            <option value="0" displayname="Auto" />
+                            <option value="100" />
+                        </item>
+                    </menu>
+                </menus>
+                <mode name="camera"><container id="level_0" x="0" y="0" /></mode>
+            </layout>
+            """)
+        if mtime is not None:
+            os.utime(self.main_file, (mtime, mtime))
+
+    def test_same_settings_share_one_parse(self):
+        registry = get_layout_registry(self.settings, self.test_dir)
+        self.assertIs(get_layout_registry(self.settings, self.test_dir), registry)
+        self.assertIs(get_layout_registry(None, self.test_dir), registry)
+        self.assertIs(registry.parser, registry.parser)
+        self.assertEqual(registry.stats["parses"], 1)
+
+        # Different settings resolve theme values differently, so they get their own parse
+        other = get_layout_registry({"theme": {}}, self.test_dir)
+        self.assertIsNot(other, registry)
+
+    def test_menus_are_private_copies(self):
+        registry = LayoutRegistry(self.settings, self.test_dir)
+        menus = registry.menus()
+        menus[0]["options"][0]["value"] = 100
+        self.assertEqual(registry.menus()[0]["options"][0]["value"], 0)
+        self.assertEqual(registry.parser.get_menu_value("iso"), 0)
+        self.assertEqual(registry.stats["parses"], 1)
+
+    def test_reload_swaps_in_a_complete_parse(self):
+        registry = LayoutRegistry(self.settings, self.test_dir)
+        old = registry.parser
+        old.load_layout("camera")
+        self.assertFalse(registry.check_for_updates())
+
+        self._write_layout("Photo", "#00FF00", mtime=old.file_timestamp + 10)
+        self.assertTrue(registry.check_for_updates())
+
+        new = registry.parser
+        self.assertIsNot(new, old)
+        self.assertEqual(new.get_menu("camera")["displayname"], "Photo")
+        self.assertEqual(new.current_mode_name, "camera")
+        # Anyone still holding the old parse sees a consistent old layout
+        self.assertEqual(old.get_menu("camera")["displayname"], "Camera")
+        self.assertEqual(old.get_mode_color("auto"), "#FF0000")
+        self.assertEqual(registry.stats, {"parses": 2, "swaps": 1, "rejected": 0})
+        self.assertEqual(registry.version, 1)
+
+    def test_broken_edit_keeps_the_current_layout(self):
+        registry = LayoutRegistry(self.settings, self.test_dir)
+        old = registry.parser
+        with open(self.main_file, "w") as f:
+            f.write("<layout><menus>")  # Saved halfway through an edit
+
+        self.assertIs(registry.reload(), old)
+        self.assertIs(registry.parser, old)
+        self.assertEqual(registry.version, 0)
+        self.assertEqual(registry.stats["rejected"], 1)
+
+    def test_warmup_runs_before_the_swap(self):
+        registry = LayoutRegistry(self.settings, self.test_dir)
+        registry.parser.load_layout("camera")
+        seen = []
+
+        def warmup(parser):
+            seen.append((parser is registry.parser, parser.current_mode_name))
+
+        registry.add_warmup(warmup)
+        registry.add_warmup(warmup)
+        registry.reload()
+        self.assertEqual(seen, [(False, "camera")])
+
+        registry.remove_warmup(warmup)
+        registry.reload()
+        self.assertEqual(len(seen), 1)
+
+    def _wait_for_version(self, registry, version, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while registry.version < version and time.monotonic() < deadline:
+            time.sleep(0.02)
+        return registry.version
+
+    def _check_watcher_reloads(self, registry):
+        old = registry.parser
+        try:
+            self._write_layout("Photo", "#00FF00", mtime=old.file_timestamp + 10)
+            self.assertEqual(self._wait_for_version(registry, 1), 1)
+        finally:
+            registry.stop_watching()
+        self.assertEqual(registry.parser.get_menu("camera")["displayname"], "Photo")
+        self.assertFalse(registry.watcher.running)
+
+    def test_watcher_reloads_in_the_background(self):
+        registry = LayoutRegistry(self.settings, self.test_dir)
+        watcher = registry.start_watching()
+        self.assertTrue(watcher.running)
+        self._check_watcher_reloads(registry)
+
+    def test_watcher_polls_without_inotify(self):
+        registry = LayoutRegistry(self.settings, self.test_dir)
+        with patch('src.ui.layout_watcher._Inotify', side_effect=OSError("unavailable")):
+            watcher = registry.start_watching(poll_interval=0.05)
+        self.assertEqual(watcher.mode, "polling")
+        self._check_watcher_reloads(registry)
+
+    def test_settings_manager_and_gui_share_the_parse(self):
+        from src.core.settings import SettingsManager
+
+        self.settings["files"] = {"cache_path": self.test_dir}
+        with patch('src.core.settings.get_layout_registry',
+                   side_effect=lambda settings, cache_file=None: get_layout_registry(settings, self.test_dir, cache_file)), \
+                patch('src.core.settings.DatabaseManager'):
+            manager = SettingsManager(os.path.join(self.test_dir, "settings.json"))
+            with patch.object(manager, '_open_settings', return_value=self.settings), \
+                    patch.object(manager, '_ensure_dcim_folder'):
+                settings, menus = manager.load()
+            menus["menus"][0]["options"][0]["value"] = 100
+            manager.reset()
+
+        registry = get_layout_registry(settings, self.test_dir)
+        self.assertIs(manager.layouts, registry)
+        self.assertIs(manager.layout_parser, registry.parser)
+        self.assertEqual(manager.menus["menus"][0]["options"][0]["value"], 0)
+        self.assertEqual(registry.stats["parses"], 1)
+        self.assertEqual(registry.cache_file, os.path.join(self.test_dir, "layout.cache"))
+
+
+if __name__ == '__main__':
+    unittest.main()
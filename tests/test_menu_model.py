@@ -0,0 +1,97 @@
+"""
+Tests for the name-indexed menu model.
+"""
+import copy
+import unittest
+
+from src.core.menu_model import MenuModel, find_option
+
+
+def sample_menus():
+    return [
+        {"name": "camera", "options": [
+            {"name": "iso", "type": "list", "value": 0, "options": [{"value": 0, "displayname": "Auto"}, {"value": 100}]},
+            {"name": "exposure_group", "type": "group", "options": [
+                {"name": "shutter", "type": "range", "value": 0, "options": {"min": 0, "max": 10, "step": 1}},
+                {"name": "exposurecomp", "type": "range", "value": 0, "options": {"min": -2, "max": 2, "step": 1}},
+            ]},
+        ]},
+        {"name": "settings", "options": [
+            {"name": "grid", "type": "list", "value": "off", "options": ["off", "on"]},
+            {"name": "iso", "type": "list", "value": 999},  # Shadowed by the first iso
+        ]},
+        {"name": "gallery"},
+    ]
+
+
+class TestMenuModel(unittest.TestCase):
+    def test_find_and_path(self):
+        model = MenuModel(sample_menus())
+        self.assertIs(model.find("iso"), model["menus"][0]["options"][0])
+        self.assertEqual(model.path_of("iso"), (0, 0))
+        self.assertIs(model.find("exposurecomp"), model["menus"][0]["options"][1]["options"][1])
+        self.assertEqual(model.path_of("exposurecomp"), (0, 1, 1))
+        self.assertEqual(model.path_of("grid"), (1, 0))
+        self.assertIsNone(model.find("missing"))
+        self.assertIsNone(model.path_of("missing"))
+        # List choices are not options
+        self.assertNotIn("Auto", model.names())
+
+    def test_is_still_the_menus_dict(self):
+        model = MenuModel(sample_menus())
+        self.assertIsInstance(model, dict)
+        self.assertEqual(model["menus"][2]["name"], "gallery")
+        self.assertEqual(dict(model), {"menus": model["menus"]})
+
+    def test_replacing_menus_reindexes(self):
+        model = MenuModel(sample_menus())
+        old_iso = model.find("iso")
+        model["menus"] = sample_menus()
+        self.assertIsNot(model.find("iso"), old_iso)
+        self.assertIs(model.find("iso"), model["menus"][0]["options"][0])
+
+    def test_rebuild_after_in_place_change(self):
+        model = MenuModel(sample_menus())
+        model["menus"][1]["options"].append({"name": "hdr", "value": "off"})
+        self.assertIsNone(model.find("hdr"))
+        model.rebuild()
+        self.assertEqual(model.path_of("hdr"), (1, 2))
+
+    def test_dict_mutators_reindex(self):
+        model = MenuModel(sample_menus())
+        model.update(menus=[{"name": "video", "options": [{"name": "fps", "value": 24}]}])
+        self.assertEqual(model.path_of("fps"), (0, 0))
+        self.assertIsNone(model.find("iso"))
+
+        model.pop("menus")
+        self.assertIsNone(model.find("fps"))
+        model.setdefault("menus", sample_menus())
+        self.assertEqual(model.path_of("grid"), (1, 0))
+        model.clear()
+        self.assertEqual(model.names(), [])
+
+    def test_wrap_shares_the_pages(self):
+        menus = {"menus": sample_menus(), "version": 2}
+        model = MenuModel.wrap(menus)
+        self.assertIs(model["menus"], menus["menus"])
+        self.assertEqual(model["version"], 2)
+        self.assertIs(model.find("shutter"), menus["menus"][0]["options"][1]["options"][0])
+        self.assertIs(MenuModel.wrap(model), model)
+
+    def test_deepcopy_keeps_index_consistent(self):
+        model = MenuModel(sample_menus())
+        clone = copy.deepcopy(model)
+        self.assertIs(clone.find("shutter"), clone["menus"][0]["options"][1]["options"][0])
+
+    def test_find_option_on_plain_dict(self):
+        menus = {"menus": sample_menus()}
+        self.assertIs(find_option(menus, "shutter"), menus["menus"][0]["options"][1]["options"][0])
+        self.assertIsNone(find_option({}, "iso"))
+        # Same first-match rule as the index
+        plain = {"menus": sample_menus()}
+        for name in MenuModel(sample_menus()).names():
+            self.assertEqual(find_option(plain, name), MenuModel(plain["menus"]).find(name))
+
+
+if __name__ == "__main__":
+    unittest.main()
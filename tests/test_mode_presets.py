@@ -0,0 +1,134 @@
+"""
+Tests for in-memory per-mode presets and diff-only camera application.
+"""
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.core.database import DatabaseManager
+from src.hardware.camera import MockCamera
+
+
+class TestApplySettings(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        settings = {"files": {"path": self.test_dir, "cache_path": self.test_dir, "template": "img_{}_{}"},
+                    "display": {"width": 100, "height": 100, "fullscreen": False}}
+        self.camera = MockCamera({}, settings)
+        self.camera.directory()
+
+    def tearDown(self):
+        self.camera.commands.close()
+        shutil.rmtree(self.test_dir)
+
+    def _spy(self, key):
+        spy = MagicMock(wraps=self.camera._raw_accessors[key])
+        self.camera._raw_accessors[key] = spy
+        return spy
+
+    def test_only_changed_settings_reach_the_camera(self):
+        iso, awb = self._spy("iso"), self._spy("awb")
+        current_awb = self.camera.directory()["awb"]()
+
+        applied = self.camera.apply_settings({"iso": 400, "awb": current_awb, "unknown": 1})
+        self.assertEqual(applied, {"iso": 400})
+        self.assertEqual(self.camera.state.get("iso"), 400)  # Shown before the worker applied it
+        self.assertTrue(self.camera.wait_for_settings())
+        iso.assert_called_once_with(value=400)
+        awb.assert_not_called()
+        self.assertEqual(self.camera.state.get("iso"), 400)
+
+        iso.reset_mock()
+        self.assertEqual(self.camera.apply_settings({"iso": 400}), {})
+        iso.assert_not_called()
+
+    def test_unchanged_values_in_another_type_are_skipped(self):
+        width, height = self.camera.directory()["resolution"]()
+        self.camera.directory()["iso"](value=400)
+        resolution, iso = self._spy("resolution"), self._spy("iso")
+
+        # Menu and database values are strings; the camera reports a tuple and an int
+        self.assertEqual(self.camera.apply_settings({"resolution": f"{width},{height}", "iso": "400"}), {})
+        self.assertFalse(self.camera.commands.is_pending("resolution"))
+        resolution.assert_not_called()
+        iso.assert_not_called()
+
+        self.assertEqual(self.camera.apply_settings({"resolution": "640,480"}), {"resolution": "640,480"})
+
+    def test_dependent_values_are_reread_once(self):
+        applied = self.camera.apply_settings({"timer": 5, "timelapse_interval": 3})
+        self.assertEqual(set(applied), {"timer", "timelapse_interval"})
+        self.assertTrue(self.camera.wait_for_settings())
+        # Setting the interval turns the timer off; the cached state must agree with the camera
+        self.assertEqual(self.camera.state.get("timer"), 0)
+        self.assertEqual(self.camera.state.get("timelapse_interval"), 3)
+
+
+class TestModePresets(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.test_dir, "settings.db")
+        self.settings_file = os.path.join(self.test_dir, "camerasettings.json")
+        with open(self.settings_file, "w") as f:
+            json.dump({"files": {"path": self.test_dir, "cache_path": self.test_dir}}, f)
+        db = DatabaseManager(self.db_path)
+        db.save_mode_settings("manual", {"iso": 800, "shutter": 4000, "awb": "sunlight", "exposurecomp": "1.5"})
+        db.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _manager(self):
+        from src.core.settings import SettingsManager
+
+        self.db = DatabaseManager(self.db_path)
+        self.addCleanup(self.db.close)
+        with patch("src.core.settings.DatabaseManager", return_value=self.db):
+            manager = SettingsManager(self.settings_file)
+        manager.load()
+        return manager
+
+    def test_presets_are_loaded_once_and_typed(self):
+        manager = self._manager()
+        self.assertEqual(manager.mode_presets["manual"],
+                         {"iso": 800, "shutter": 4000, "awb": "sunlight", "exposurecomp": 1.5})
+        self.assertEqual(manager.mode_presets["auto"], manager.AUTO_MODE_DEFAULTS)
+
+        with patch.object(self.db, "get_all_mode_settings") as per_mode_query:
+            manager.load_mode_settings("manual", manager.menus)
+        per_mode_query.assert_not_called()
+        self.assertEqual(manager.menus.find("iso")["value"], 800)
+
+    def test_switch_applies_only_the_difference(self):
+        manager = self._manager()
+        camera = MagicMock()
+        camera.apply_settings.side_effect = lambda values: {k: v for k, v in values.items() if k == "iso"}
+
+        manager.load_mode_settings("manual", manager.menus, camera)
+        sent = camera.apply_settings.call_args[0][0]
+        self.assertEqual(sent["iso"], 800)
+        self.assertEqual(manager.mode_switch_stats["switches"], 1)
+        self.assertEqual(manager.mode_switch_stats["applied"], 1)
+        self.assertEqual(manager.mode_switch_stats["skipped"], len(sent) - 1)
+        self.assertGreaterEqual(manager.mode_switch_stats["max_ms"], manager.mode_switch_stats["last_ms"])
+
+    def test_save_writes_only_changed_values(self):
+        manager = self._manager()
+        manager.load_mode_settings("manual", manager.menus)
+        manager.save_mode_settings("manual", manager.menus)  # Adds the settings the preset didn't have yet
+        with patch.object(self.db, "save_mode_settings", wraps=self.db.save_mode_settings) as save:
+            manager.save_mode_settings("manual", manager.menus)
+            save.assert_not_called()
+
+            manager.menus.find("iso")["value"] = 1600
+            manager.save_mode_settings("manual", manager.menus)
+            save.assert_called_once_with("manual", {"iso": 1600})
+        self.assertEqual(manager.mode_presets["manual"]["iso"], 1600)
+        self.assertEqual(self.db.get_all_mode_settings("manual")["iso"], "1600")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+"""
+Tests for change-gated hardware overlay uploads in RealCamera.render.
+"""
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+
+# Mock dependencies
+sys.modules['picamera'] = MagicMock()
+sys.modules['pygame'] = MagicMock()
+sys.modules['pygame.camera'] = MagicMock()
+
+from src.hardware.camera import RealCamera
+
+
+class FakeOverlay:
+    """Stands in for a picamera PiOverlayRenderer and counts uploaded bytes."""
+
+    def __init__(self, source, **kwargs):
+        self.kwargs = kwargs
+        self.uploads = []
+        self.update(source)
+
+    def update(self, source):
+        self.uploads.append(len(memoryview(source).cast('B')))
+
+    @property
+    def bytes_uploaded(self):
+        return sum(self.uploads)
+
+
+class FakeSurface:
+    """32-bit BGRA surface backed by a bytearray, like a pygame SRCALPHA layer."""
+
+    def __init__(self, width, height, pitch=None):
+        self.size = (width, height)
+        self.pitch = pitch or width * 4
+        self.pixels = bytearray(self.pitch * height)
+
+    def get_size(self):
+        return self.size
+
+    def get_masks(self):
+        return (0xFF0000, 0xFF00, 0xFF, 0xFF000000)
+
+    def get_pitch(self):
+        return self.pitch
+
+    def get_buffer(self):
+        return memoryview(self.pixels)
+
+
+class TestOverlayUpload(unittest.TestCase):
+    def setUp(self):
+        self.settings = {
+            "files": {"path": "/tmp", "template": "img_{}_{}"},
+            "display": {"width": 64, "height": 32, "fullscreen": False}
+        }
+        self.picamera_patcher = patch('src.hardware.camera.picamera')
+        self.picamera = self.picamera_patcher.start()
+        self.picamera.PiCamera.return_value.add_overlay.side_effect = FakeOverlay
+        self.camera = RealCamera({}, self.settings)
+        self.surface = FakeSurface(64, 32)
+        self.frame_bytes = 64 * 32 * 4
+
+    def tearDown(self):
+        self.picamera_patcher.stop()
+
+    def test_first_frame_creates_overlay_from_buffer(self):
+        self.camera.render(self.surface, None, None)
+        overlay = self.camera.overlay
+        self.assertEqual(overlay.uploads, [self.frame_bytes])
+        self.assertEqual(overlay.kwargs["format"], "bgra")
+        self.assertEqual(overlay.kwargs["size"], (64, 32))
+
+    def test_unchanged_frames_upload_nothing(self):
+        # One second at 30 fps with a static menu: only the first frame is uploaded
+        self.camera.render(self.surface, None, None)
+        for _ in range(29):
+            self.camera.render(self.surface, None, [])
+
+        self.assertEqual(self.camera.overlay.bytes_uploaded, self.frame_bytes)
+        self.assertEqual(self.camera.overlay_stats, {"uploads": 1, "skipped": 29, "bytes": self.frame_bytes})
+
+    def test_changed_frames_upload(self):
+        self.camera.render(self.surface, None, None)
+        self.surface.pixels[0] = 255
+        self.camera.render(self.surface, None, [(0, 0, 16, 16)])
+        self.assertEqual(len(self.camera.overlay.uploads), 2)
+
+    def test_full_frames_gated_on_checksum(self):
+        self.camera.render(self.surface, None, None)
+        self.camera.render(self.surface, None, None)
+        self.assertEqual(len(self.camera.overlay.uploads), 1)
+
+        self.surface.pixels[100] = 1
+        self.camera.render(self.surface, None, None)
+        self.assertEqual(len(self.camera.overlay.uploads), 2)
+
+    def test_padded_surface_falls_back_to_copy(self):
+        surface = FakeSurface(64, 32, pitch=64 * 4 + 16)
+        with patch('src.hardware.camera.pygame.image.tostring', return_value=bytes(self.frame_bytes)) as tostring:
+            self.camera.render(surface, None, None)
+        tostring.assert_called_once_with(surface, 'RGBA')
+        self.assertEqual(self.camera.overlay.kwargs["format"], "rgba")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Tests for cached-geometry preview scaling into a reused surface in MockCamera.
+"""
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+
+# Mock dependencies
+sys.modules['picamera'] = MagicMock()
+sys.modules['pygame'] = MagicMock()
+sys.modules['pygame.camera'] = MagicMock()
+
+from src.hardware.camera import MockCamera
+
+
+class TestPreviewScaling(unittest.TestCase):
+    def setUp(self):
+        self.settings = {
+            "files": {"path": "/tmp", "template": "img_{}_{}"},
+            "display": {"width": 800, "height": 480, "fullscreen": False}
+        }
+        self.camera = MockCamera({}, self.settings)
+        self.camera.is_previewing = True
+        self.camera.grabber = MagicMock()
+        self.seq = 0
+        self.display = MagicMock()
+        self.display.get_size.return_value = (800, 480)
+        self.overlay = MagicMock()
+
+        self.surface_patcher = patch('src.hardware.camera.pygame.Surface')
+        self.Surface = self.surface_patcher.start()
+        self.Surface.side_effect = lambda size, flags, frame: MagicMock(name=f"dest{size}")
+        self.scale_patcher = patch('src.hardware.camera.pygame.transform.scale')
+        self.scale = self.scale_patcher.start()
+        self.smooth_patcher = patch('src.hardware.camera.pygame.transform.smoothscale')
+        self.smoothscale = self.smooth_patcher.start()
+
+    def tearDown(self):
+        self.surface_patcher.stop()
+        self.scale_patcher.stop()
+        self.smooth_patcher.stop()
+
+    def _render(self, size=(640, 480), bits=24, dirty=None):
+        self.seq += 1
+        frame = MagicMock()
+        frame.get_size.return_value = size
+        frame.get_bitsize.return_value = bits
+        self.camera.grabber.latest.return_value = (self.seq, frame)
+        return self.camera.render(self.overlay, self.display, [] if dirty is None else dirty), frame
+
+    def test_geometry_and_destination_reused(self):
+        self._render()
+        dest = self.camera._preview_frame
+        for _ in range(5):
+            _, frame = self._render()
+            self.scale.assert_called_with(frame, (640, 480), dest)
+
+        self.assertEqual(self.Surface.call_count, 1)
+        self.assertEqual(self.camera._preview_rect, (80, 0, 640, 480))
+
+    def test_bars_painted_only_when_geometry_changes(self):
+        self.assertIsNone(self._render()[0])
+        self.display.fill.assert_called_once_with((0, 0, 0))
+
+        self.display.reset_mock()
+        rects, _ = self._render()
+        self.assertEqual(rects, [(80, 0, 640, 480)])
+        self.display.fill.assert_not_called()
+        self.display.blit.assert_any_call(self.overlay, (80, 0, 640, 480), (80, 0, 640, 480))
+
+        # A different source size means new geometry and a full repaint
+        self.display.reset_mock()
+        self.assertIsNone(self._render(size=(1280, 720))[0])
+        self.display.fill.assert_called_once_with((0, 0, 0))
+        self.assertEqual(self.camera._preview_rect, (0, 15, 800, 450))
+        self.assertEqual(self.Surface.call_count, 2)
+
+    def test_dirty_overlay_areas_added_to_preview_rect(self):
+        self._render()
+        rects, _ = self._render(dirty=[(0, 0, 50, 50)])
+        self.assertEqual(rects, [(0, 0, 50, 50), (80, 0, 640, 480)])
+        self.display.set_clip.assert_any_call((0, 0, 50, 50))
+
+    def test_smooth_scaling_option(self):
+        self.camera.preview_scaling = "smooth"
+        _, frame = self._render()
+        self.smoothscale.assert_called_once_with(frame, (640, 480), self.camera._preview_frame)
+
+        # smoothscale only handles 24/32-bit surfaces
+        _, frame = self._render(bits=8)
+        self.scale.assert_called_once_with(frame, (640, 480), self.camera._preview_frame)
+
+    def test_scaling_setting(self):
+        self.settings["display"]["preview_scaling"] = "smooth"
+        self.assertEqual(MockCamera({}, self.settings).preview_scaling, "smooth")
+        self.assertEqual(self.camera.preview_scaling, "nearest")
+
+
+if __name__ == '__main__':
+    unittest.main()
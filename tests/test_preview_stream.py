@@ -0,0 +1,107 @@
+"""
+Tests for the separate preview and capture resolutions of MockCamera.
+"""
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+
+# Mock dependencies
+sys.modules['picamera'] = MagicMock()
+sys.modules['pygame'] = MagicMock()
+sys.modules['pygame.camera'] = MagicMock()
+
+from src.hardware.camera import MockCamera
+
+
+class FakeWebcam:
+    def __init__(self, device, size):
+        self.device = device
+        self.size = size
+        self.started = False
+        self.frame = MagicMock(name=f"frame{size}")
+        self.frame.get_size.return_value = size
+
+    def start(self):
+        self.started = True
+
+    def stop(self):
+        self.started = False
+
+    def get_size(self):
+        return self.size
+
+    def get_image(self, surface=None):
+        return self.frame
+
+
+class TestPreviewStream(unittest.TestCase):
+    def setUp(self):
+        self.settings = {
+            "files": {"path": "/tmp", "template": "img_{}_{}"},
+            "display": {"width": 800, "height": 480, "fullscreen": False}
+        }
+        self.opened = []
+
+        def open_camera(device, size):
+            cam = FakeWebcam(device, size)
+            self.opened.append(cam)
+            return cam
+
+        self.camera_patcher = patch('src.hardware.camera.pygame.camera')
+        pgcamera = self.camera_patcher.start()
+        pgcamera.list_cameras.return_value = ["/dev/video0"]
+        pgcamera.Camera.side_effect = open_camera
+        self.grabber_patcher = patch('src.hardware.camera.FrameGrabber')
+        self.FrameGrabber = self.grabber_patcher.start()
+        self.FrameGrabber.side_effect = lambda webcam: MagicMock(latest=MagicMock(return_value=(1, webcam.frame)))
+
+        self.camera = MockCamera({}, self.settings)
+        self.camera.queue_manager = MagicMock()
+        self.camera.resolution_get_set("4000,3000")
+        self.camera.startPreview()
+
+    def tearDown(self):
+        self.camera_patcher.stop()
+        self.grabber_patcher.stop()
+
+    def test_preview_opens_at_display_size(self):
+        self.assertEqual([cam.size for cam in self.opened], [(800, 480)])
+        self.assertIs(self.camera.webcam, self.opened[0])
+
+    def test_preview_resolution_setting(self):
+        self.settings["display"]["preview_resolution"] = "640,480"
+        self.assertEqual(MockCamera({}, self.settings).preview_resolution, (640, 480))
+        self.settings["display"]["preview_resolution"] = [1280, 720]
+        self.assertEqual(MockCamera({}, self.settings).preview_resolution, (1280, 720))
+
+    def test_capture_resolution_change_keeps_preview_running(self):
+        webcam = self.camera.webcam
+        self.camera.resolution_get_set("1920,1080")
+        self.assertEqual(self.camera.resolution, (1920, 1080))
+        self.assertIs(self.camera.webcam, webcam)
+        self.assertTrue(webcam.started)
+        self.assertEqual(len(self.opened), 1)
+        self.assertTrue(self.camera.preview_needs_redraw())
+
+    def test_capture_switches_to_full_resolution_and_back(self):
+        self.camera.captureImage()
+
+        self.assertEqual([cam.size for cam in self.opened], [(800, 480), (4000, 3000), (800, 480)])
+        self.assertFalse(self.opened[0].started)
+        self.assertFalse(self.opened[1].started)
+        self.assertTrue(self.opened[2].started)
+        self.assertIs(self.camera.webcam, self.opened[2])
+
+        args = self.camera.queue_manager.add_encoding_job.call_args[0]
+        self.assertEqual(args[2], (4000, 3000))
+
+    def test_capture_at_preview_size_uses_stream(self):
+        self.camera.resolution_get_set("800,480")
+        self.camera.captureImage()
+        self.assertEqual(len(self.opened), 1)
+        args = self.camera.queue_manager.add_encoding_job.call_args[0]
+        self.assertEqual(args[2], (800, 480))
+
+
+if __name__ == '__main__':
+    unittest.main()
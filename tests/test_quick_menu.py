@@ -1,5 +1,6 @@
 import unittest
 from unittest.mock import MagicMock
+from src.core.menu_model import MenuModel
 from src.ui.controls import MenuController
 
 class TestQuickMenu(unittest.TestCase):
@@ -26,6 +27,10 @@ class TestQuickMenu(unittest.TestCase):
             "awb": MagicMock(),
             "exposure": MagicMock()
         }
+        # Like CameraBase, minus the worker thread: queued settings go straight to the setters
+        self.camera.submit_settings.side_effect = lambda values: [
+            self.camera.directory.return_value[key](value=value)
+            for key, value in values.items() if key in self.camera.directory.return_value]
 
     def test_quick_menu_cycling(self):
         # Initial position 0
@@ -73,5 +78,17 @@ class TestQuickMenu(unittest.TestCase):
         # Verify 'iso' was changed
         self.camera.directory.return_value["iso"].assert_called()
 
+    def test_focus_quick_stat_moves_menu_to_its_option(self):
+        menus = MenuModel(self.menus["menus"])
+        menu_pos = [0, 0, 0, 0]
+
+        # Position 2 is shutter: page 0, option 2
+        self.assertTrue(MenuController.focus_quick_stat([2], menu_pos, menus, self.camera))
+        self.assertEqual(menu_pos, [0, 2, 0, 1])
+
+        # cameramode has no menu option; the menu stays where it was
+        self.assertFalse(MenuController.focus_quick_stat([0], menu_pos, menus, self.camera))
+        self.assertEqual(menu_pos, [0, 2, 0, 1])
+
 if __name__ == '__main__':
     unittest.main()
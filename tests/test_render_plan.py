@@ -0,0 +1,89 @@
+"""
+Tests for the compiled per-mode render plan.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from src.ui.layout_parser import LayoutParser
+from src.ui.render_plan import parse_color, parse_dimension
+
+
+class TestRenderPlan(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.layout_file = os.path.join(self.test_dir, "default.xml")
+        self._write_layout("#FF000080")
+        self.theme = {"theme": {"colors": {"bg": "#102030", "selected": "#00FF00"}}}
+        self.parser = LayoutParser(self.theme, self.test_dir)
+        self.font_for = MagicMock(side_effect=lambda size: f"font-{size}")
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _write_layout(self, selection_bg):
+        with open(self.layout_file, "w") as f:
+            f.write(f"""
+            <layout>
+                <container id="level_0" x="0" y="0" width="25%" height="100%" bg_color="@bg"
+                           selection_bg_color="{selection_bg}" font_size="18" item_height="40" />
+                <container id="stats" x="0" y="88%" width="100%" height="12%" font_size="14"
+                           padding="10" />
+            </layout>
+            """)
+
+    def test_containers_are_resolved(self):
+        plan = self.parser.get_render_plan((800, 480), self.font_for)
+
+        level_0 = plan.containers["level_0"]
+        self.assertEqual(level_0.rect, (0, 0, 200, 480))
+        self.assertEqual(level_0.bg_color, (0x10, 0x20, 0x30))
+        self.assertEqual(level_0.selection_bg_color, (255, 0, 0, 128))
+        self.assertEqual(level_0.unselected_color, (0xAA, 0xAA, 0xAA))
+        self.assertEqual(level_0.item_height, 40)
+        self.assertEqual(level_0.font, "font-18")
+
+        stats = plan.containers["stats"]
+        self.assertEqual(stats.rect, (0, 422, 800, 57))
+        self.assertEqual(stats.padding_right, 10)
+        self.assertEqual(stats.icon_size, 20)
+        self.assertEqual(plan.selected_color, (0, 255, 0))
+
+    def test_plan_is_immutable(self):
+        plan = self.parser.get_render_plan((800, 480), self.font_for)
+        with self.assertRaises(TypeError):
+            plan.containers["level_0"] = None
+        with self.assertRaises(AttributeError):
+            plan.containers["level_0"].item_height = 10
+
+    def test_compiled_once_per_mode_and_size(self):
+        first = self.parser.get_render_plan((800, 480), self.font_for)
+        self.assertIs(self.parser.get_render_plan((800, 480), self.font_for), first)
+        self.assertEqual(self.font_for.call_count, 2)
+
+        resized = self.parser.get_render_plan((1024, 600), self.font_for)
+        self.assertEqual(resized.containers["level_0"].rect, (0, 0, 256, 600))
+        self.assertEqual(self.parser.plan_stats, {"compiled": 2, "hits": 1})
+
+    def test_reload_rebuilds_plan(self):
+        first = self.parser.get_render_plan((800, 480), self.font_for)
+        self._write_layout("#00000000")
+        self.parser._load_layout("default")
+
+        plan = self.parser.get_render_plan((800, 480), self.font_for)
+        self.assertIsNot(plan, first)
+        self.assertEqual(plan.containers["level_0"].selection_bg_color, (0, 0, 0, 0))
+
+    def test_helpers(self):
+        self.assertEqual(parse_color("#0A0B0C"), (10, 11, 12))
+        self.assertEqual(parse_color((1, 2, 3)), (1, 2, 3))
+        self.assertEqual(parse_color("bad"), (255, 255, 255))
+        self.assertEqual(parse_dimension("50%", 480), 240)
+        self.assertEqual(parse_dimension("center", 480), 240)
+        self.assertEqual(parse_dimension(12, 480), 12)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -44,6 +44,14 @@ class TestResolutionLoop(unittest.TestCase):
             "exposure": Mock(return_value="auto"),
             "exposurecomp": Mock(return_value=0),
         })
+        # Like CameraBase.apply_settings, minus the state diff and the worker thread
+        def apply_settings(values):
+            directory = self.mock_camera.directory()
+            applied = {key: value for key, value in values.items() if key in directory}
+            for key, value in applied.items():
+                directory[key](value=value)
+            return applied
+        self.mock_camera.apply_settings = apply_settings
         
         # Load real menus
         self.settings_manager = SettingsManager()
@@ -206,9 +214,10 @@ class TestMockCameraResolution(unittest.TestCase):
         print(f"\nstopPreview calls: {len(stop_calls)}")
         print(f"startPreview calls: {len(start_calls)}")
         
-        # Should be exactly 1 stop and 1 start
-        self.assertEqual(len(stop_calls), 1, "Should stop preview exactly once")
-        self.assertEqual(len(start_calls), 1, "Should start preview exactly once")
+        # Capture resolution no longer affects the preview stream
+        self.assertEqual(camera.resolution, (1920, 1080))
+        self.assertEqual(len(stop_calls), 0, "Should not stop preview")
+        self.assertEqual(len(start_calls), 0, "Should not restart preview")
 
 
 if __name__ == '__main__':
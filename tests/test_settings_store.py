@@ -0,0 +1,148 @@
+"""
+Tests for the in-memory settings store with write-behind persistence.
+"""
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from src.core.database import DatabaseManager
+from src.core.settings_store import SettingsStore
+
+
+class TestSettingsStore(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.test_dir, "settings.db")
+        self.db = DatabaseManager(self.db_path)
+        self.statements = []
+        self.db.conn.set_trace_callback(self.statements.append)
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.test_dir)
+
+    def _reopen(self):
+        db = DatabaseManager(self.db_path)
+        self.addCleanup(db.close)
+        return db.get_all_settings()
+
+    def test_wal_journal(self):
+        mode = self.db.conn.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+
+    def test_load_is_one_query(self):
+        self.db.set_settings([("iso", 100), ("awb", "auto"), ("grid", True)])
+        store = SettingsStore(self.db)
+        self.statements.clear()
+        self.assertEqual(store.load(), 3)
+        self.assertEqual(len([s for s in self.statements if s.startswith("SELECT")]), 1)
+        self.assertEqual(store.get("iso"), "100")
+        self.assertEqual(store.get("grid"), "True")
+        self.assertIsNone(store.get("missing"))
+
+    def test_only_changed_values_are_dirty(self):
+        self.db.set_settings([("iso", 100)])
+        store = SettingsStore(self.db, flush_delay=60)
+        store.load()
+        self.assertFalse(store.set("iso", 100))
+        self.assertEqual(store.update([("iso", 200), ("awb", "sun"), ("awb", "sun")]), 2)
+        self.assertEqual(store.dirty, 2)
+        self.assertEqual(store.get("iso"), "200")
+        # Nothing is written until the flush
+        self.assertEqual(self._reopen(), {"iso": "100"})
+        store.close()
+
+    def test_flush_is_one_transaction(self):
+        store = SettingsStore(self.db, flush_delay=60)
+        store.update((f"key_{i}", i) for i in range(50))
+        self.statements.clear()
+        self.assertEqual(store.flush(), 50)
+        self.assertEqual(len([s for s in self.statements if s == "COMMIT"]), 1)
+        self.assertEqual(store.flush(), 0)
+        self.assertEqual(store.stats["flushes"], 1)
+        self.assertEqual(len(self._reopen()), 50)
+        store.close()
+
+    def test_background_flush_after_debounce(self):
+        store = SettingsStore(self.db, flush_delay=0.05)
+        store.set("iso", 400)
+        store.set("iso", 800)
+        deadline = time.monotonic() + 5
+        while store.stats["flushes"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(store.stats["flushes"], 1)
+        self.assertEqual(store.stats["rows"], 1)
+        self.assertEqual(self._reopen(), {"iso": "800"})
+        store.close()
+
+    def test_failed_flush_keeps_changes(self):
+        store = SettingsStore(self.db, flush_delay=60)
+        store.set("iso", 100)
+        with patch.object(self.db, "set_settings", return_value=False):
+            self.assertEqual(store.flush(), 0)
+        self.assertEqual(store.dirty, 1)
+        store.close()
+        self.assertEqual(self._reopen(), {"iso": "100"})
+
+    def test_reset_clears_memory_and_database(self):
+        store = SettingsStore(self.db, flush_delay=60)
+        store.set("iso", 100)
+        store.flush()
+        store.set("awb", "sun")
+        store.reset()
+        self.assertEqual((store.dirty, store.get("iso")), (0, None))
+        store.close()
+        self.assertEqual(self._reopen(), {})
+
+
+class TestSettingsManagerPersistence(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.test_dir, "settings.db")
+        self.settings_file = os.path.join(self.test_dir, "camerasettings.json")
+        with open(self.settings_file, "w") as f:
+            json.dump({"files": {"path": self.test_dir, "cache_path": self.test_dir,
+                                 "settings_flush_delay": 60}}, f)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _manager(self):
+        from src.core.settings import SettingsManager
+
+        with patch("src.core.settings.DatabaseManager", side_effect=lambda: DatabaseManager(self.db_path)):
+            manager = SettingsManager(self.settings_file)
+        manager.load()
+        self.addCleanup(manager.db.close)
+        return manager
+
+    def _first_option(self, manager):
+        return next(o for o in manager.menus["menus"][0]["options"] if isinstance(o.get("value"), int))
+
+    def test_changes_survive_without_save(self):
+        manager = self._manager()
+        self.assertEqual(manager.store.flush_delay, 60)
+        option = self._first_option(manager)
+        option["value"] += 1
+        self.assertGreater(manager.sync(), 0)
+        self.assertEqual(manager.sync(), 0)
+        manager.store.flush()  # What the flusher does once the delay passes
+
+        # A crash now: reopen without save() or close()
+        reloaded = self._manager()
+        self.assertEqual(self._first_option(reloaded)["value"], option["value"])
+
+    def test_close_writes_pending_changes(self):
+        manager = self._manager()
+        option = self._first_option(manager)
+        option["value"] += 2
+        manager.close()
+        self.assertEqual(self._first_option(self._manager())["value"], option["value"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+"""
+Tests for the concurrent startup orchestrator and the split settings load.
+"""
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from src.core.startup import StartupOrchestrator
+
+
+class TestStartupOrchestrator(unittest.TestCase):
+    def test_independent_steps_run_concurrently(self):
+        startup = StartupOrchestrator()
+        a_started, b_started = threading.Event(), threading.Event()
+
+        def step_a():
+            a_started.set()
+            return b_started.wait(5)  # Only true if b runs at the same time
+
+        def step_b():
+            b_started.set()
+            return a_started.wait(5)
+
+        startup.add("a", step_a)
+        startup.add("b", step_b)
+        startup.add("c", lambda: (startup.result("a"), startup.result("b")), requires=("a", "b"))
+        self.assertTrue(startup.wait(timeout=5))
+        self.assertEqual(startup.result("c"), (True, True))
+
+        rows = {row["name"]: row for row in startup.timeline()}
+        self.assertGreaterEqual(rows["c"]["start_ms"], max(rows["a"]["end_ms"], rows["b"]["end_ms"]))
+        self.assertTrue(rows["a"]["thread"].startswith("startup-"))
+
+    def test_handoff_does_not_wait_for_background_steps(self):
+        startup = StartupOrchestrator()
+        release = threading.Event()
+        startup.add("camera", lambda: "camera")
+        startup.add("gallery", lambda: release.wait(5), critical=False)
+        polls = []
+
+        out = io.StringIO()
+        with redirect_stdout(out):
+            self.assertTrue(startup.wait(poll=lambda: polls.append(1), interval=0.01, timeout=5))
+            self.assertEqual(startup.steps["gallery"].state, "running")
+            startup.handoff()
+            self.assertNotIn("Startup timeline", out.getvalue())  # Printed once everything is done
+
+            release.set()
+            self.assertTrue(startup.wait(["gallery"], timeout=5))
+            for _ in range(100):  # The gallery's worker prints it right after finishing
+                if "Startup timeline" in out.getvalue():
+                    break
+                threading.Event().wait(0.01)
+        self.assertIn("Startup timeline (main loop at", out.getvalue())
+        self.assertIn("(background)", out.getvalue())
+
+    def test_failed_critical_step_is_raised_and_dependents_skipped(self):
+        startup = StartupOrchestrator()
+
+        def broken():
+            raise RuntimeError("no camera")
+
+        startup.add("camera", broken)
+        startup.add("options", lambda: None, requires=("camera",))
+        with redirect_stdout(io.StringIO()):
+            with self.assertRaises(RuntimeError):
+                startup.wait(timeout=5)
+        self.assertEqual(startup.steps["options"].state, "skipped")
+
+    def test_unknown_requirement(self):
+        startup = StartupOrchestrator()
+        with self.assertRaises(ValueError):
+            startup.add("options", lambda: None, requires=("camera",))
+
+    def test_measure_records_main_thread_work(self):
+        startup = StartupOrchestrator()
+        with startup.measure("splash"):
+            pass
+        row = startup.timeline()[0]
+        self.assertEqual((row["name"], row["state"], row["thread"]), ("splash", "done", "MainThread"))
+
+
+class TestSplitSettingsLoad(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.settings_file = os.path.join(self.test_dir, "camerasettings.json")
+        with open(self.settings_file, "w") as f:
+            json.dump({"files": {"path": self.test_dir, "cache_path": self.test_dir}}, f)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_steps_fill_the_same_menus_object(self):
+        from src.core.database import DatabaseManager
+        from src.core.settings import SettingsManager
+
+        db = DatabaseManager(os.path.join(self.test_dir, "settings.db"))
+        db.set_setting("quality", "90")
+        self.addCleanup(db.close)
+        with patch("src.core.settings.DatabaseManager", return_value=db):
+            manager = SettingsManager(self.settings_file)
+        menus = manager.menus
+
+        startup = StartupOrchestrator()
+        with startup.measure("settings"):
+            manager.load_settings()
+        startup.add("layout", manager.load_layout)
+        startup.add("database", manager.load_database)
+        startup.add("menus", manager.apply_saved_values, requires=("layout", "database"))
+        with redirect_stdout(io.StringIO()):
+            startup.wait(timeout=10)
+
+        self.assertIs(manager.menus, menus)
+        self.assertEqual(menus.find("quality")["value"], 90)
+        manager.store.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+Tests for the font registry and the text-surface LRU cache.
+"""
+import unittest
+from unittest.mock import MagicMock
+
+from src.ui.text_cache import FontRegistry, TextCache
+
+
+class TestFontRegistry(unittest.TestCase):
+    def test_font_loaded_once_per_face_and_size(self):
+        factory = MagicMock(side_effect=lambda face, size: MagicMock(name=f"{face}-{size}"))
+        fonts = FontRegistry(factory)
+
+        a = fonts.get(20)
+        self.assertIs(fonts.get(20), a)
+        self.assertIsNot(fonts.get(24), a)
+        self.assertEqual(factory.call_count, 2)
+        self.assertEqual(fonts.stats, {"loaded": 2, "hits": 1})
+
+    def test_falls_back_to_default_font(self):
+        fallback = MagicMock()
+
+        def factory(face, size):
+            if face is not None:
+                raise FileNotFoundError(face)
+            return fallback
+
+        fonts = FontRegistry(factory)
+        self.assertIs(fonts.get(12, face="missing.ttf"), fallback)
+
+
+class TestTextCache(unittest.TestCase):
+    def setUp(self):
+        self.font = MagicMock()
+        self.font.render.side_effect = lambda *args: MagicMock()
+
+    def test_reuses_surfaces(self):
+        cache = TextCache()
+        first = cache.render(self.font, "ISO 100", True, (255, 255, 255))
+        second = cache.render(self.font, "ISO 100", True, [255, 255, 255])
+        self.assertIs(first, second)
+        self.font.render.assert_called_once_with("ISO 100", True, (255, 255, 255))
+        self.assertEqual(cache.stats, {"hits": 1, "misses": 1})
+
+    def test_key_includes_color_antialias_and_background(self):
+        cache = TextCache()
+        cache.render(self.font, "A", True, (255, 255, 255))
+        cache.render(self.font, "A", True, (0, 0, 0))
+        cache.render(self.font, "A", False, (0, 0, 0))
+        cache.render(self.font, "A", False, (0, 0, 0), (10, 10, 10))
+        self.assertEqual(self.font.render.call_count, 4)
+        self.font.render.assert_called_with("A", False, (0, 0, 0), (10, 10, 10))
+
+    def test_lru_eviction(self):
+        cache = TextCache(max_entries=2)
+        a = cache.render(self.font, "a", True, (0, 0, 0))
+        cache.render(self.font, "b", True, (0, 0, 0))
+        cache.render(self.font, "a", True, (0, 0, 0))
+        cache.render(self.font, "c", True, (0, 0, 0))
+        self.assertEqual(len(cache), 2)
+        self.assertIs(cache.render(self.font, "a", True, (0, 0, 0)), a)
+        cache.render(self.font, "b", True, (0, 0, 0))
+        self.assertEqual(self.font.render.call_count, 4)
+
+    def test_disabled(self):
+        cache = TextCache(max_entries=0)
+        cache.render(self.font, "a", True, (0, 0, 0))
+        cache.render(self.font, "a", True, (0, 0, 0))
+        self.assertEqual(self.font.render.call_count, 2)
+        self.assertEqual(len(cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
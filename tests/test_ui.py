@@ -40,6 +40,10 @@ class TestMenuController(unittest.TestCase):
         self.menu_pos = [0, 0, 0, 0]
         self.camera = MagicMock()
         self.camera.directory.return_value = {"opt1": MagicMock(), "opt2": MagicMock()}
+        # Like CameraBase, minus the worker thread: queued settings go straight to the setters
+        self.camera.submit_settings.side_effect = lambda values: [
+            self.camera.directory.return_value[key](value=value)
+            for key, value in values.items() if key in self.camera.directory.return_value]
 
     def test_navigation_down(self):
         # Level 0: Main Menu (only 1 item in this test structure, so down shouldn't move if limit is 1)
@@ -0,0 +1,128 @@
+"""
+Tests for the Motion-JPEG AVI writer and the timelapse assembler.
+"""
+import unittest
+import os
+import io
+import struct
+import shutil
+import tempfile
+
+from PIL import Image
+from src.core.video import MjpegAviWriter, TimelapseAssembler
+
+
+def read_chunks(data, start, end):
+    """Yield (fourcc, payload offset, size) for the chunks between start and end."""
+    pos = start
+    while pos < end:
+        fourcc = data[pos:pos + 4]
+        size = struct.unpack('<I', data[pos + 4:pos + 8])[0]
+        yield fourcc, pos + 8, size
+        pos += 8 + size + (size % 2)
+
+
+class TestMjpegAviWriter(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.test_dir, 'out.avi')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_structure_and_index(self):
+        frames = [b'\xff\xd8' + b'a' * 99 + b'\xff\xd9', b'\xff\xd8' + b'b' * 10 + b'\xff\xd9']
+        with MjpegAviWriter(self.path, 64, 48, fps=10) as writer:
+            for frame in frames:
+                writer.add_frame(frame)
+
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        self.assertFalse(os.path.exists(self.path + '.part'))
+        self.assertEqual(data[:4], b'RIFF')
+        self.assertEqual(struct.unpack('<I', data[4:8])[0], len(data) - 8)
+        self.assertEqual(data[8:12], b'AVI ')
+
+        chunks = list(read_chunks(data, 12, len(data)))
+        self.assertEqual([c[0] for c in chunks], [b'LIST', b'LIST', b'idx1'])
+        hdrl_pos = chunks[0][1]
+        self.assertEqual(data[hdrl_pos:hdrl_pos + 4], b'hdrl')
+        # avih: microseconds per frame and total frames
+        avih = data[hdrl_pos + 12:hdrl_pos + 12 + 56]
+        self.assertEqual(struct.unpack('<I', avih[0:4])[0], 100000)
+        self.assertEqual(struct.unpack('<I', avih[16:20])[0], 2)
+        self.assertEqual(struct.unpack('<II', avih[32:40]), (64, 48))
+
+        # Frames are stored byte for byte, odd sizes padded
+        movi_pos, movi_size = chunks[1][1], chunks[1][2]
+        self.assertEqual(data[movi_pos:movi_pos + 4], b'movi')
+        stored = [data[pos:pos + size] for fourcc, pos, size in read_chunks(data, movi_pos + 4, movi_pos + movi_size)]
+        self.assertEqual(stored, frames)
+
+        _, idx_pos, idx_size = chunks[2]
+        self.assertEqual(idx_size, 32)
+        ckid, flags, offset, size = struct.unpack('<4sIII', data[idx_pos + 16:idx_pos + 32])
+        self.assertEqual((ckid, size), (b'00dc', len(frames[1])))
+        self.assertEqual(data[movi_pos + offset:movi_pos + offset + 4], b'00dc')
+
+    def test_abort_removes_partial_file(self):
+        writer = MjpegAviWriter(self.path, 64, 48)
+        writer.add_frame(b'\xff\xd8\xff\xd9')
+        writer.abort()
+        self.assertEqual(os.listdir(self.test_dir), [])
+
+
+class TestTimelapseAssembler(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.frames = []
+        for i in range(3):
+            path = os.path.join(self.test_dir, f'frame-{i}.jpg')
+            Image.new('RGB', (1600, 1200), (i * 80, 0, 0)).save(path, 'JPEG')
+            self.frames.append(path)
+        self.output = os.path.join(self.test_dir, 'video.avi')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_frames_copied_without_reencoding(self):
+        job = TimelapseAssembler(self.frames, self.output, fps=5)
+        job.run()
+        self.assertEqual(job.state, 'done')
+        self.assertEqual(job.progress, 1.0)
+
+        with open(self.output, 'rb') as f:
+            data = f.read()
+        for frame in self.frames:
+            with open(frame, 'rb') as f:
+                self.assertIn(f.read(), data)
+
+    def test_proxy_is_downscaled(self):
+        proxy = os.path.join(self.test_dir, 'proxy.avi')
+        job = TimelapseAssembler(self.frames, self.output, proxy_path=proxy, proxy_size=(320, 240))
+        job.run()
+        self.assertEqual(job.state, 'done')
+
+        with open(proxy, 'rb') as f:
+            data = f.read()
+        movi = data.index(b'movi')
+        size = struct.unpack('<I', data[movi + 8:movi + 12])[0]
+        frame = Image.open(io.BytesIO(data[movi + 12:movi + 12 + size]))
+        self.assertEqual(frame.size, (320, 240))
+
+    def test_cancel(self):
+        job = TimelapseAssembler(self.frames, self.output)
+        job.cancel()
+        job.run()
+        self.assertEqual(job.state, 'cancelled')
+        self.assertFalse(os.path.exists(self.output))
+        self.assertFalse(os.path.exists(self.output + '.part'))
+
+    def test_no_frames(self):
+        job = TimelapseAssembler([], self.output)
+        job.run()
+        self.assertEqual(job.state, 'error')
+
+
+if __name__ == '__main__':
+    unittest.main()
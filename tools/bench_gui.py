@@ -0,0 +1,391 @@
+"""
+Headless benchmark of the real render loop: runs GUI.run with the SDL dummy
+video driver and MockCamera fed by a synthetic webcam, replays scripted input
+and reports frame-time percentiles (from the frame profiler), CPU time and
+peak RSS as JSON. Each scenario runs in its own process so RSS and caches
+don't carry over.
+
+Usage:
+    python tools/bench_gui.py [--scenario NAME ...] [--script FILE] [--output FILE]
+                              [--compare BASELINE.json] [--tolerance 0.15] [--trace DIR]
+    python tools/bench_gui.py --record FILE   # Play normally (with a window) and save the input
+
+Scenarios: menu, quickstats, gallery, timelapse, idle. A script file has the
+same shape as a recording: {"name": ..., "duration_ms": ..., "steps": [...]},
+where each step happens ``at`` ms after the loop starts and is one of
+{"action": "down"} (the key bound to that control), {"call": "open_gallery"}
+or {"set": {"timelapse_interval": 1}} (camera setting).
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FPS = 30
+PREVIEW_SIZE = (800, 480)
+GALLERY_IMAGES = 12
+PERCENTILES = (50, 95, 99, 100)
+
+
+def _every(start, interval, actions):
+    return [{"at": start + i * interval, "action": action} for i, action in enumerate(actions)]
+
+
+SCENARIOS = {
+    "menu": {
+        "duration_ms": 6000,
+        "steps": [{"at": 300, "action": "enter"}]
+        + _every(600, 200, ["down"] * 6 + ["right"] + ["down"] * 4 + ["left"] + ["up"] * 6 + ["back"]),
+    },
+    "quickstats": {
+        "duration_ms": 6000,
+        "steps": _every(300, 150, (["right"] + ["up"] * 4 + ["down"] * 4) * 4),
+    },
+    "gallery": {
+        "duration_ms": 6000,
+        "steps": [{"at": 300, "call": "open_gallery"}]
+        + _every(800, 300, ["left"] * 8 + ["right"] * 6 + ["shutter", "back"]),
+    },
+    "timelapse": {
+        "duration_ms": 6000,
+        "steps": [{"at": 200, "set": {"timer": 0, "timelapse_interval": 1, "timelapse_duration": 0}},
+                  {"at": 300, "action": "shutter"},
+                  {"at": 5000, "action": "shutter"}],
+    },
+    "idle": {"duration_ms": 5000, "steps": []},
+}
+
+
+class SyntheticWebcam:
+    """Stands in for pygame.camera.Camera: a moving test pattern at a fixed frame rate."""
+
+    def __init__(self, size, fps=FPS):
+        import pygame
+        self.size = tuple(size)
+        self.interval = 1.0 / fps
+        self._next = 0.0
+        self._frame = 0
+        self._pygame = pygame
+
+    def start(self):
+        self._next = time.perf_counter()
+
+    def stop(self):
+        pass
+
+    def get_size(self):
+        return self.size
+
+    def get_image(self, surface=None):
+        delay = self._next - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        self._next = max(self._next + self.interval, time.perf_counter())
+        if surface is None or surface.get_size() != self.size:
+            surface = self._pygame.Surface(self.size)
+        w, h = self.size
+        self._frame += 1
+        surface.fill((20, 40 + self._frame % 60, 80))
+        bar = w // 8
+        surface.fill((230, 230, 230), ((self._frame * 7) % (w + bar) - bar, 0, bar, h))
+        return surface
+
+
+class ScriptedInput:
+    """Used as GUI.run's buttons class: replays the script's steps from listen(),
+    which the loop calls every frame and every 20 ms while idle, and stops the
+    loop once the script's duration has passed."""
+
+    def __init__(self, gui, script, callbacks):
+        import pygame
+        self.gui = gui
+        self.steps = sorted(script.get("steps", []), key=lambda step: step["at"])
+        self.duration_ms = script.get("duration_ms", 5000)
+        self.callbacks = callbacks
+        self.buttons = {"script": None}  # Non-empty so the idle wait keeps calling listen()
+        self.start = None
+        self.replayed = 0
+        self.preview_stats = {}
+        self._pygame = pygame
+        controls = gui.settings.get("controls", {})
+        self._keys = {action: getattr(pygame, config["key"]) if isinstance(config["key"], str) else config["key"]
+                      for action, config in controls.items() if config.get("key") is not None}
+
+    def __call__(self, settings):
+        return self
+
+    def listen(self, pygame_mod):
+        now = time.perf_counter()
+        if self.start is None:
+            self.start = now
+        elapsed_ms = (now - self.start) * 1000
+        while self.replayed < len(self.steps) and self.steps[self.replayed]["at"] <= elapsed_ms:
+            self._replay(self.steps[self.replayed])
+            self.replayed += 1
+        if elapsed_ms >= self.duration_ms and self.gui.running:
+            # Read before the loop's cleanup stops the preview
+            self.preview_stats = dict(self.gui.camera.preview_stats() or {})
+            self.gui.running = False
+            pygame_mod.event.post(pygame_mod.event.Event(pygame_mod.USEREVENT))
+
+    def _replay(self, step):
+        pygame = self._pygame
+        if "action" in step:
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=self._keys[step["action"]], mod=0, unicode=""))
+        elif "call" in step:
+            self.callbacks[step["call"]]()
+        elif "set" in step:
+            directory = self.gui.camera.directory()
+            for key, value in step["set"].items():
+                directory[key](value=value)
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _percentiles(values):
+    return {f"p{p}": round(v, 3) for p, v in values.items()}
+
+
+def _load_app(workdir):
+    """Settings, menus, camera and GUI as run.py builds them, with files going to ``workdir``."""
+    import pygame
+    import pygame.camera
+    import run as app
+    from src.core.settings import SettingsManager
+    from src.hardware.camera import get_camera
+    from src.ui.gui import GUI
+
+    pygame.camera.list_cameras = lambda: ["synthetic"]
+    pygame.camera.Camera = lambda device, size: SyntheticWebcam(size)
+
+    # Photos, caches and the settings database go to the work dir before anything is loaded
+    with open(os.path.join("home", "config", "camerasettings.json")) as f:
+        settings = json.load(f)
+    dcim = os.path.join(workdir, "dcim")
+    os.makedirs(dcim, exist_ok=True)
+    settings.setdefault("files", {})
+    settings["files"]["path"] = dcim
+    settings["files"]["cache_path"] = os.path.join(workdir, "cache")
+    settings_file = os.path.join(workdir, "camerasettings.json")
+    with open(settings_file, "w") as f:
+        json.dump(settings, f)
+    settings, menus = SettingsManager(settings_file, db_path=os.path.join(workdir, "settings.db")).load()
+    settings["display"].update({"width": PREVIEW_SIZE[0], "height": PREVIEW_SIZE[1], "refreshrate": FPS,
+                                "profiler_history": 4 * FPS * 60, "render_stats": False})
+
+    pygame.init()
+    for i in range(GALLERY_IMAGES):
+        image = pygame.Surface((1920, 1080))
+        image.fill((30 + i * 15, 60, 200 - i * 10))
+        pygame.image.save(image, os.path.join(dcim, f"bench_{i:03d}.jpg"))
+
+    camera = get_camera(menus, settings)
+    app.populate_menu_options(menus, camera)
+    app.apply_settings_to_camera(menus, camera)
+    return settings, menus, camera, GUI(settings, menus, camera)
+
+
+def run_scenario(script, trace_dir=None):
+    """Run one script through GUI.run in this process and return its measurements."""
+    from src.ui.controls import MenuController
+
+    workdir = tempfile.mkdtemp(prefix="bench_gui_")
+    try:
+        settings, menus, camera, gui = _load_app(workdir)
+        gui._splash_duration, gui._splash_fade = 0, 1
+        gui.profiler_dir = trace_dir or os.path.join(workdir, "profiles")
+        callbacks = {
+            "open_gallery": gui.gallery.enter,
+            "close_menu": lambda: settings["display"].update({"showmenu": False}),
+        }
+
+        def controls_handler(pygame_mod, event, menu_pos, menus, camera=None, menu_active=True,
+                             quick_menu_pos=None, action=None):
+            # No settings manager: nothing the script changes is saved
+            MenuController.handle_event(pygame_mod, event, menu_pos, menus, camera, menu_active,
+                                        quick_menu_pos, callbacks, action, settings, None, gui.layout)
+
+        driver = ScriptedInput(gui, script, callbacks)
+        gui.profiler.set_enabled(True)
+        gui.profiler.show_graph = False  # Measure the loop, not the graph
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        gui.run(controls_handler, driver)
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+
+        profiler = gui.profiler
+        preview = driver.preview_stats
+        return {
+            "frames": profiler.frames,
+            "duration_s": round(wall, 3),
+            "fps": round(profiler.frames / wall, 2) if wall else 0.0,
+            "frame_ms": _percentiles(profiler.percentiles(points=PERCENTILES)),
+            "busy_ms": _percentiles(profiler.percentiles(points=PERCENTILES, exclude=("wait",))),
+            "stages_ms": {stage: _percentiles(profiler.percentiles(stage, PERCENTILES)) for stage in profiler.stages},
+            "cpu_s": round(cpu, 3),
+            "cpu_percent": round(100.0 * cpu / wall, 1) if wall else 0.0,
+            "peak_rss_mb": round(_peak_rss_mb(), 1),
+            "preview_fps": round(preview.get("fps", 0.0), 1) if preview else 0.0,
+            "steps_replayed": driver.replayed,
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def record(path):
+    """Run the app normally and save every control the user pressed as a replayable script."""
+    from src.ui.controls import MenuController
+
+    workdir = tempfile.mkdtemp(prefix="bench_gui_")
+    settings, menus, camera, gui = _load_app(workdir)
+    steps = []
+    start = time.perf_counter()
+    resolve = gui._get_action_from_event
+
+    def recording_resolve(event):
+        action = resolve(event)
+        if action:
+            steps.append({"at": round((time.perf_counter() - start) * 1000), "action": action})
+        return action
+
+    gui._get_action_from_event = recording_resolve
+    callbacks = {"open_gallery": gui.gallery.enter,
+                 "close_menu": lambda: settings["display"].update({"showmenu": False})}
+
+    def controls_handler(pygame_mod, event, menu_pos, menus, camera=None, menu_active=True,
+                         quick_menu_pos=None, action=None):
+        MenuController.handle_event(pygame_mod, event, menu_pos, menus, camera, menu_active,
+                                    quick_menu_pos, callbacks, action, settings, None, gui.layout)
+
+    from src.hardware.buttons import Buttons
+    try:
+        gui.run(controls_handler, Buttons)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    # The quit key itself isn't worth replaying
+    steps = [step for step in steps if step["action"] != "quit"]
+    duration = round((time.perf_counter() - start) * 1000)
+    with open(path, "w") as f:
+        json.dump({"name": os.path.splitext(os.path.basename(path))[0], "duration_ms": duration, "steps": steps},
+                  f, indent=2)
+    print(f"Recorded {len(steps)} inputs over {duration / 1000:.1f} s to {path}")
+
+
+def _run_child(name, script, trace_dir):
+    """Run a scenario in a fresh interpreter and return its result."""
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+        json.dump(script, f)
+        script_path = f.name
+    out_path = script_path + ".out"
+    cmd = [sys.executable, os.path.abspath(__file__), "--child", script_path, "--child-output", out_path]
+    if trace_dir:
+        cmd += ["--trace", os.path.join(trace_dir, name)]
+    try:
+        proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        if proc.returncode != 0 or not os.path.exists(out_path):
+            print(proc.stdout[-2000:], file=sys.stderr)
+            raise RuntimeError(f"Scenario {name} failed (exit {proc.returncode})")
+        with open(out_path) as f:
+            return json.load(f)
+    finally:
+        for path in (script_path, out_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def compare(results, baseline, tolerance):
+    """Regressions in p95 busy time and CPU use against a previous run, as printable lines."""
+    regressions = []
+    for name, result in results["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if not base:
+            continue
+        for label, new, old in (("busy p95 ms", result["busy_ms"]["p95"], base["busy_ms"]["p95"]),
+                                ("cpu %", result["cpu_percent"], base["cpu_percent"])):
+            if old > 0 and new > old * (1 + tolerance):
+                regressions.append(f"{name}: {label} {old} -> {new} (+{100 * (new / old - 1):.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="Scenario(s) to run (default: all)")
+    parser.add_argument("--script", action="append", default=[], help="Script or recording to replay")
+    parser.add_argument("--output", help="Write the JSON results here instead of stdout")
+    parser.add_argument("--compare", help="Previous results to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed slowdown before --compare fails")
+    parser.add_argument("--trace", help="Also write each scenario's Chrome trace and CSV under this directory")
+    parser.add_argument("--record", help="Run with a window and record the input to this file")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--child-output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    os.environ["MOCK_CAMERA"] = "true"
+    if args.record:
+        record(args.record)
+        return 0
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    if args.child:
+        with open(args.child) as f:
+            script = json.load(f)
+        result = run_scenario(script, args.trace)
+        with open(args.child_output, "w") as f:
+            json.dump(result, f)
+        return 0
+
+    scripts = {}
+    for name in args.scenario or ([] if args.script else sorted(SCENARIOS)):
+        scripts[name] = SCENARIOS[name]
+    for path in args.script:
+        with open(path) as f:
+            script = json.load(f)
+        scripts[script.get("name") or os.path.splitext(os.path.basename(path))[0]] = script
+
+    import pygame
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "machine": platform.machine(),
+            "display": list(PREVIEW_SIZE),
+            "refreshrate": FPS,
+        },
+        "scenarios": {},
+    }
+    for name, script in scripts.items():
+        print(f"Running {name}...", file=sys.stderr)
+        results["scenarios"][name] = _run_child(name, script, args.trace)
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""
+Cold-start benchmark of loading the layout: parsing main.xml from scratch
+against restoring the serialized parse from the layout cache.
+
+Each sample runs in a fresh interpreter so nothing is warm except the OS
+file cache; the time covers importing the parser and constructing it.
+
+Usage: python tools/bench_layout.py [runs]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r"""
+import contextlib, io, json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+from src.core.settings import SettingsManager
+from src.ui.layout_parser import LayoutParser
+settings = SettingsManager()._open_settings(SettingsManager().settings_file)
+imported = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    parser = LayoutParser(theme_config=settings, cache_file={cache_file!r})
+done = time.perf_counter()
+print(json.dumps({{"load_ms": (done - imported) * 1000, "total_ms": (done - start) * 1000,
+                  "cached": parser.loaded_from_cache}}))
+"""
+
+
+def sample(cache_file):
+    code = CHILD.format(root=ROOT, cache_file=cache_file)
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, stdout=subprocess.PIPE, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_file = os.path.join(tmp, "layout.cache")
+        results = {
+            "parse (no cache)": [sample(None) for _ in range(runs)],
+            "first start (parse + write)": [],
+            "cache hit": [],
+        }
+        for _ in range(runs):
+            if os.path.exists(cache_file):
+                os.remove(cache_file)
+            results["first start (parse + write)"].append(sample(cache_file))
+        results["cache hit"] = [sample(cache_file) for _ in range(runs)]
+        size = os.path.getsize(cache_file)
+
+    print(f"Runs: {runs} fresh interpreters each, cache file {size / 1024:.1f} KiB")
+    for name, samples in results.items():
+        assert all(s["cached"] == (name == "cache hit") for s in samples)
+        load = statistics.median(s["load_ms"] for s in samples)
+        total = statistics.median(s["total_ms"] for s in samples)
+        print(f"  {name:28} LayoutParser() {load:6.2f} ms   incl. imports {total:7.2f} ms (median)")
+
+
+if __name__ == "__main__":
+    main()
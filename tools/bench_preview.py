@@ -0,0 +1,97 @@
+"""
+Headless benchmark of per-frame preview scaling in MockCamera.render: the old
+path (new scaled surface + full-screen fill every frame) against scaling into
+the reused preview surface.
+
+Usage: python tools/bench_preview.py [frames]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from src.hardware.camera import MockCamera
+
+DISPLAY = (800, 480)
+SOURCES = [(640, 480), (1280, 720)]
+
+
+class ReplayGrabber:
+    """Hands out a fresh sequence number every call, like a grabber at full rate."""
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.seq = 0
+        self.stats = {}
+
+    def latest(self):
+        self.seq += 1
+        return self.seq, self.frames[self.seq % len(self.frames)]
+
+    def stop(self):
+        pass
+
+
+def old_render(frame, overlay, display):
+    """The previous per-frame path: fit, allocate, fill everything, blit."""
+    frame_rect = frame.get_rect()
+    display_rect = display.get_rect()
+    scale = min(display_rect.width / frame_rect.width, display_rect.height / frame_rect.height)
+    scaled = pygame.transform.scale(frame, (int(frame_rect.width * scale), int(frame_rect.height * scale)))
+    display.fill((0, 0, 0))
+    display.blit(scaled, scaled.get_rect(center=display_rect.center))
+    display.blit(overlay, (0, 0))
+    return scaled
+
+
+def measure(step, frames):
+    """Mean ms per frame and how many new scaled surfaces were allocated."""
+    last, allocations = step(), 0  # First frame sets up the geometry on both paths
+    start = time.perf_counter()
+    for _ in range(frames):
+        surface = step()
+        if surface is not last:
+            allocations += 1
+            last = surface
+    elapsed = time.perf_counter() - start
+    return elapsed / frames * 1000, allocations
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    pygame.init()
+    display = pygame.display.set_mode(DISPLAY)
+    overlay = pygame.Surface(DISPLAY, pygame.SRCALPHA)
+    settings = {"files": {"path": "home/dcim", "template": "img_{}_{}"}, "display": {}}
+
+    print(f"Frames: {frames}, display {DISPLAY[0]}x{DISPLAY[1]}")
+    for size in SOURCES:
+        source = [pygame.Surface(size) for _ in range(2)]
+        for i, s in enumerate(source):
+            s.fill((40 * i, 80, 120))
+
+        results = {"old (nearest)": measure(lambda: old_render(source[0], overlay, display), frames)}
+        for scaling in ("nearest", "smooth"):
+            camera = MockCamera({}, dict(settings, display={"preview_scaling": scaling}))
+            camera.is_previewing = True
+            camera.grabber = ReplayGrabber(source)
+
+            def step():
+                camera.render(overlay, display, [])
+                return camera._preview_frame
+
+            results[f"reused ({scaling})"] = measure(step, frames)
+
+        print(f"Source {size[0]}x{size[1]}:")
+        for name, (ms, allocations) in results.items():
+            print(f"  {name:16} {ms:6.2f} ms/frame, {allocations / frames:.2f} surface allocations/frame")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
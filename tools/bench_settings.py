@@ -0,0 +1,88 @@
+"""
+Benchmark of loading and saving the menu settings database.
+
+Compares the old access pattern (one SELECT per menu option at startup, one
+committed INSERT per option on save) with SettingsStore (one query at
+startup, dirty keys written in one transaction). Uses the menu options from
+main.xml and a temporary database.
+
+Usage: python tools/bench_settings.py [runs]
+"""
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from src.core.database import DatabaseManager  # noqa: E402
+from src.core.settings_store import SettingsStore  # noqa: E402
+from src.ui.layout_parser import LayoutParser  # noqa: E402
+
+
+def menu_values():
+    with contextlib.redirect_stdout(io.StringIO()):
+        menus = LayoutParser().get_menus_list()
+    return {option['name']: option.get('value', 0)
+            for page in menus for option in page.get('options', []) if option.get('name')}
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    values = menu_values()
+    changed = dict(list(values.items())[:3])  # A typical session touches a few settings
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, "settings.db"))
+        db.set_settings(values.items())
+
+        def old_load():
+            for key in values:
+                db.get_setting(key)
+
+        def old_save():
+            for key, value in values.items():
+                db.set_setting(key, value)
+
+        def store_load():
+            SettingsStore(db).load()
+
+        store = SettingsStore(db, flush_delay=3600)
+        store.load()
+
+        def store_flush():
+            # Alternate so every flush has real changes to write
+            store.update((key, f"{value}-{time.perf_counter_ns()}") for key, value in changed.items())
+            store.flush()
+
+        results = {
+            "load: SELECT per option": [timed(old_load) for _ in range(runs)],
+            "load: SettingsStore.load": [timed(store_load) for _ in range(runs)],
+            "save: commit per option": [timed(old_save) for _ in range(runs)],
+            f"save: flush {len(changed)} dirty keys": [timed(store_flush) for _ in range(runs)],
+            f"save: flush all {len(values)} keys": [],
+        }
+        for _ in range(runs):
+            store.update((key, f"{value}-{time.perf_counter_ns()}") for key, value in values.items())
+            results[f"save: flush all {len(values)} keys"].append(timed(store.flush))
+        store.close()
+        db.close()
+
+    print(f"{len(values)} menu options, {runs} runs each, WAL journal")
+    for name, samples in results.items():
+        print(f"  {name:32} median {statistics.median(samples):7.2f} ms   max {max(samples):7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Headless benchmark of menu + camera overlay frame time with and without the
+font registry / text-surface cache.
+
+Usage: python tools/bench_text.py [frames]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("MOCK_CAMERA", "true")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from src.core.settings import SettingsManager
+from src.hardware.camera import get_camera
+from src.ui.gui import GUI
+from src.ui.text_cache import FontRegistry, TextCache
+
+
+class UncachedFonts(FontRegistry):
+    """Opens the font file on every request, like the render loop used to."""
+
+    def get(self, size, face="freesansbold.ttf"):
+        try:
+            return self._factory(face, int(size))
+        except Exception:
+            return self._factory(None, int(size))
+
+
+def measure(gui, frames):
+    menu_name = gui.menus["menus"][0]["name"]
+    times = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        gui.layer.fill((0, 0, 0, 0))
+        gui.layout.load_layout(menu_name)
+        gui._render_menu()
+        gui._render_camera_overlay()
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return sum(times) / len(times) * 1000, times[len(times) // 2] * 1000
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    settings, menus = SettingsManager().load()
+    camera = get_camera(menus, settings)
+    gui = GUI(settings, menus, camera)
+    gui._splash_active = False
+    gui.settings["display"]["showmenu"] = True
+
+    cached_fonts, cached_text = gui.fonts, gui.text_cache
+
+    gui.fonts, gui.text_cache = UncachedFonts(pygame.font.Font), TextCache(0)
+    gui.font = gui.fonts.get(settings["display"]["fontsize"])
+    before = measure(gui, frames)
+
+    gui.fonts, gui.text_cache = cached_fonts, cached_text
+    gui.font = gui.fonts.get(settings["display"]["fontsize"])
+    measure(gui, 10)  # Warm the caches
+    after = measure(gui, frames)
+
+    print(f"Frames: {frames}")
+    print(f"Before (font per frame, no text cache): mean {before[0]:.2f} ms, median {before[1]:.2f} ms")
+    print(f"After  (font registry + text cache):    mean {after[0]:.2f} ms, median {after[1]:.2f} ms")
+    print(f"Fonts loaded: {cached_fonts.stats['loaded']}, text cache: {len(cached_text)} surfaces, "
+          f"{cached_text.stats['hits']} hits / {cached_text.stats['misses']} misses")
+
+    camera.stopPreview()
+    camera.closeCamera()
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()